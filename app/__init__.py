@@ -3,15 +3,39 @@ from flask_migrate import Migrate
 from config import config
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from app.services.answer_uploads import AnswerUploads
+from app.services.audio_cache import AudioCache
+from app.services.audio_encoding import AudioEncoder
+from app.services.audio_delivery import AudioDelivery
+from app.services.clients import GeminiClients
+from app.services.matching import JobMatcher
+from app.services.search import JobSearch
+from app.services.candidates import CandidateMatcher
+from app.services.semantic import SemanticMatcher
+from app.services.sessions import ServerSessions
+from app.services.uploads import SpoolingRequest
+from app.services.user_cache import UserCache
 
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
 login_manager = LoginManager()
 login_manager.login_view = 'auth.login'
+audio_encoder = AudioEncoder()
+audio_cache = AudioCache()
+audio_delivery = AudioDelivery()
+gemini_clients = GeminiClients()
+job_matcher = JobMatcher()
+job_search = JobSearch()
+candidate_matcher = CandidateMatcher()
+semantic_matcher = SemanticMatcher()
+server_sessions = ServerSessions()
+user_cache = UserCache()
+answer_uploads = AnswerUploads()
 
 def create_app(config_name='default'):
     app = Flask(__name__)
+    app.request_class = SpoolingRequest
     
     # Load config
     config_class = config[config_name]
@@ -21,6 +45,17 @@ def create_app(config_name='default'):
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    audio_encoder.init_app(app)  # Before the audio cache, which encodes what it stores
+    audio_cache.init_app(app)
+    audio_delivery.init_app(app)
+    gemini_clients.init_app(app)
+    job_matcher.init_app(app)
+    job_search.init_app(app)
+    candidate_matcher.init_app(app)
+    semantic_matcher.init_app(app)
+    server_sessions.init_app(app)
+    user_cache.init_app(app)
+    answer_uploads.init_app(app)
 
     # Import models
     from app import models
@@ -28,7 +63,7 @@ def create_app(config_name='default'):
 
     @login_manager.user_loader
     def load_user(user_id):
-        return User.query.get(int(user_id))
+        return user_cache.get(user_id=int(user_id))
 
     # Register blueprints
     from app.main import bp as main_bp
@@ -40,4 +75,8 @@ def create_app(config_name='default'):
     from app.api import bp as api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
 
+    # CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+
     return app
@@ -1,20 +1,26 @@
-import google.generativeai as genai
-from google import genai as genai_new  # For TTS functionality
 from google.genai import types
-from flask import request, jsonify, current_app, send_file
+from flask import request, jsonify, current_app, send_file, Response, stream_with_context, url_for
 from app.api import bp
 from app.auth.decorators import requires_auth
+import io
+import json
 import wave
 import tempfile
 import os
+import re
+from app.services.tts import synthesize_speech, CHEERFUL_PROMPT, TTS_MODEL
+from app.services.audio_cache import AudioCache, get_audio_cache
+from app.services.audio_encoding import get_audio_encoder
+from app.services.audio_delivery import get_audio_delivery
+from app.services.clients import get_gemini_clients
+from app.services import question_cache
 
 def configure_gemini():
-    genai.configure(api_key=current_app.config['GEMINI_API_KEY'])
-    return genai.GenerativeModel('gemini-2.0-flash')
+    return get_gemini_clients().text_model('gemini-2.0-flash')
 
 def configure_gemini_tts():
-    """Configure Gemini client for TTS functionality"""
-    return genai_new.Client(api_key=current_app.config['GEMINI_API_KEY'])
+    """Shared Gemini client for TTS functionality"""
+    return get_gemini_clients().tts_client()
 
 def wave_file(filename, pcm, channels=1, rate=24000, sample_width=2):
     """Helper function to save wave file"""
@@ -24,6 +30,47 @@ def wave_file(filename, pcm, channels=1, rate=24000, sample_width=2):
         wf.setframerate(rate)
         wf.writeframes(pcm)
 
+def wants_stream(data):
+    """True if the client asked for a streamed response (JSON `stream` flag or ?stream=1)"""
+    return bool(data.get('stream')) or request.args.get('stream', '').lower() in ('1', 'true')
+
+def stream_generation(model, prompt):
+    """
+    Stream model output as it is generated
+    
+    Sends newline-delimited JSON by default, or Server-Sent Events when the
+    client accepts text/event-stream. Each message is one of
+    {"type": "chunk", "text": ...}, {"type": "done", "status": "success"} or
+    {"type": "error", "error": ..., "status": "error"}.
+    """
+    use_sse = 'text/event-stream' in request.headers.get('Accept', '')
+    
+    def encode(payload):
+        line = json.dumps(payload)
+        return f"data: {line}\n\n" if use_sse else line + "\n"
+    
+    def generate_chunks():
+        try:
+            for chunk in model.generate_content(prompt, stream=True):
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk carries no text parts (e.g. only finish metadata)
+                    continue
+                if text:
+                    yield encode({'type': 'chunk', 'text': text})
+            yield encode({'type': 'done', 'status': 'success'})
+        except Exception as e:
+            current_app.logger.error(f"Streaming error: {str(e)}")
+            yield encode({'type': 'error', 'error': str(e), 'status': 'error'})
+    
+    return Response(
+        stream_with_context(generate_chunks()),
+        mimetype='text/event-stream' if use_sse else 'application/x-ndjson',
+        # Stop reverse proxies from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @bp.route('/chat', methods=['POST'])
 @requires_auth
 def chat():
@@ -35,6 +82,9 @@ def chat():
             return jsonify({'error': 'Message is required'}), 400
         
         model = configure_gemini()
+        if wants_stream(data):
+            return stream_generation(model, message)
+        
         response = model.generate_content(message)
         
         return jsonify({
@@ -59,6 +109,9 @@ def generate():
             return jsonify({'error': 'Prompt is required'}), 400
         
         model = configure_gemini()
+        if wants_stream(data):
+            return stream_generation(model, prompt)
+        
         response = model.generate_content(prompt)
         
         return jsonify({
@@ -84,34 +137,32 @@ def generate_speech():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        # Initialize Gemini TTS client
-        client = configure_gemini_tts()
-        
-        # Generate speech
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-preview-tts",
-            contents=f"Say cheerfully: {text}",
-            config=types.GenerateContentConfig(
-                response_modalities=["AUDIO"],
-                speech_config=types.SpeechConfig(
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name=voice_name,
-                        )
-                    )
-                ),
-            )
-        )
-        
-        # Get audio data
-        audio_data = response.candidates[0].content.parts[0].inline_data.data
+        # Serve repeated text straight from the audio cache
+        cache = get_audio_cache()
+        cache_key = AudioCache.make_key(text, voice_name, CHEERFUL_PROMPT, TTS_MODEL)
+        cached_audio = cache.get(cache_key) if cache else None
         
-        # Create temporary wav file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav', dir=tempfile.gettempdir())
-        wave_file(temp_file.name, audio_data)
+        if cached_audio:
+            audio_path = io.BytesIO(cached_audio)
+        else:
+            # Initialize Gemini TTS client
+            client = configure_gemini_tts()
+            
+            # Generate speech
+            audio_data = synthesize_speech(client, text, voice_name, prompt=CHEERFUL_PROMPT)
+            if not audio_data:
+                raise ValueError("No audio data received")
+            
+            if cache:
+                audio_path = cache.put(cache_key, audio_data)
+            else:
+                # Create temporary wav file
+                temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav', dir=tempfile.gettempdir())
+                wave_file(temp_file.name, audio_data)
+                audio_path = temp_file.name
         
         return send_file(
-            temp_file.name, 
+            audio_path, 
             as_attachment=True, 
             download_name='speech.wav',
             mimetype='audio/wav'
@@ -124,6 +175,30 @@ def generate_speech():
             'status': 'error'
         }), 500
 
+@bp.route('/tts-audio/<key>', methods=['GET'])
+@requires_auth
+def tts_audio(key):
+    """Synthesized speech from the audio cache by key, compressed when asked for (?format=opus or Accept)"""
+    cache = get_audio_cache()
+    # Serving isn't a cache hit: no synthesis is avoided, and refetches would skew the stats
+    path = cache.peek(key) if cache and re.fullmatch(r'[0-9a-f]{64}', key) else None
+    if path is None:
+        return jsonify({'error': 'Audio not found', 'status': 'error'}), 404
+    
+    # Cacheable for good when ?v= matches the content (chat_with_speech links include it)
+    encoder = get_audio_encoder()
+    served_path, mimetype = encoder.choose(path, request.args.get('format'), request.accept_mimetypes) \
+        if encoder else (path, 'audio/wav')
+    delivery = get_audio_delivery()
+    if delivery:
+        response = delivery.send(served_path, mimetype, version=request.args.get('v'), versioned_path=path)
+    else:
+        response = send_file(served_path, mimetype=mimetype, conditional=True) if os.path.isfile(served_path) else None
+    if response is None:
+        return jsonify({'error': 'Audio not found', 'status': 'error'}), 404
+    response.vary.add('Accept')
+    return response
+
 @bp.route('/voices', methods=['GET'])
 @requires_auth
 def get_available_voices():
@@ -147,6 +222,44 @@ def get_available_voices():
             'status': 'error'
         }), 500
 
+@bp.route('/tts-cache/stats', methods=['GET'])
+@requires_auth
+def tts_cache_stats():
+    """Get hit/miss counters for the shared TTS audio cache"""
+    cache = get_audio_cache()
+    if not cache:
+        return jsonify({'error': 'Audio cache is not configured', 'status': 'error'}), 404
+    
+    return jsonify({
+        'stats': cache.stats(),
+        'status': 'success'
+    })
+
+@bp.route('/gemini-clients/stats', methods=['GET'])
+@requires_auth
+def gemini_client_stats():
+    """Get client and connection reuse counters for this worker"""
+    return jsonify({
+        'stats': get_gemini_clients().stats(),
+        'status': 'success'
+    })
+
+@bp.route('/question-cache/stats', methods=['GET'])
+@requires_auth
+def question_cache_stats():
+    """Get hit/miss counters for memoized question generation"""
+    try:
+        return jsonify({
+            'stats': question_cache.stats(),
+            'status': 'success'
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
 @bp.route('/chat-with-speech', methods=['POST'])
 @requires_auth
 def chat_with_speech():
@@ -169,33 +282,24 @@ def chat_with_speech():
             'status': 'success'
         }
         
-        # Optionally generate speech
+        # Optionally generate speech, stored in the audio cache and returned as a URL
+        # (inline base64 WAV was ~64 KB per second of speech in the JSON)
         if generate_audio:
             try:
-                client = configure_gemini_tts()
-                
-                speech_response = client.models.generate_content(
-                    model="gemini-2.5-flash-preview-tts",
-                    contents=f"Say cheerfully: {response.text}",
-                    config=types.GenerateContentConfig(
-                        response_modalities=["AUDIO"],
-                        speech_config=types.SpeechConfig(
-                            voice_config=types.VoiceConfig(
-                                prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                    voice_name=voice_name,
-                                )
-                            )
-                        ),
-                    )
-                )
-                
-                # Get audio data and encode as base64 for JSON response
-                import base64
-                audio_data = speech_response.candidates[0].content.parts[0].inline_data.data
-                audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+                cache = get_audio_cache()
+                cache_key = AudioCache.make_key(response.text, voice_name, CHEERFUL_PROMPT, TTS_MODEL)
+                audio_path = cache.get_path(cache_key)
+                if audio_path is None:
+                    audio_data = synthesize_speech(configure_gemini_tts(), response.text, voice_name,
+                                                   prompt=CHEERFUL_PROMPT)
+                    if not audio_data:
+                        raise ValueError("No audio data received")
+                    audio_path = cache.put(cache_key, audio_data)
                 
-                result['audio'] = audio_base64
-                result['audio_format'] = 'wav'
+                delivery = get_audio_delivery()
+                result['audio_url'] = url_for('api.tts_audio', key=cache_key,
+                                              v=delivery.version(audio_path) if delivery else None)
+                result['audio_format'] = 'wav'  # ?format=opus on the URL for the compressed variant
                 
             except Exception as audio_error:
                 current_app.logger.warning(f"Audio generation failed: {str(audio_error)}")
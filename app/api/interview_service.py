@@ -2,26 +2,20 @@ import os
 import json
 import wave
 from typing import List, Dict, Tuple
-from google import genai
-from google.genai import types
-import google.generativeai as genai_text
-from models import db, InterviewSession
+from app import db
+from app.models import InterviewSession
+from app.services.tts import synthesize_speech, TTS_MODEL, DEFAULT_VOICE
+from app.services.audio_cache import AudioCache, get_audio_cache
+from app.services.clients import get_gemini_clients
+from app.services.question_cache import get_or_generate_questions
+from app.services.resume_parser import resume_prompt_text
+
+QUESTION_AUDIO_PROMPT = "Say this interview question in a professional, friendly tone: {text}"
 
-# Global configuration - initialize once
 def initialize_gemini_clients():
-    """Initialize and return Gemini clients"""
-    api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable is required")
-    
-    # For text generation
-    genai_text.configure(api_key=api_key)
-    text_model = genai_text.GenerativeModel('gemini-1.5-flash')
-    
-    # For audio generation
-    audio_client = genai.Client()
-    
-    return text_model, audio_client
+    """Return the shared Gemini text model and audio client"""
+    clients = get_gemini_clients()
+    return clients.text_model('gemini-1.5-flash'), clients.tts_client()
 
 def ensure_audio_directory():
     """Ensure audio directory exists"""
@@ -29,9 +23,27 @@ def ensure_audio_directory():
     os.makedirs(audio_dir, exist_ok=True)
     return audio_dir
 
-def generate_questions(text_model, resume_text: str, job_title: str, difficulty_level: str) -> List[str]:
+# Bump when the prompt below changes so cached questions are regenerated
+QUESTION_PROMPT_VERSION = 'service-5q-v2'
+
+def generate_questions(text_model, resume_text: str, job_title: str, difficulty_level: str,
+                       force_fresh: bool = False) -> List[str]:
     """
-    Generate 5 interview questions based on resume, job title, and difficulty level.
+    Generate 5 interview questions, reusing cached questions for identical inputs.
+    """
+    return get_or_generate_questions(
+        lambda: request_questions(text_model, resume_text, job_title, difficulty_level),
+        resume_text,
+        job_title,
+        difficulty_level,
+        model=getattr(text_model, 'model_name', ''),
+        prompt_version=QUESTION_PROMPT_VERSION,
+        force_fresh=force_fresh
+    )
+
+def request_questions(text_model, resume_text: str, job_title: str, difficulty_level: str) -> List[str]:
+    """
+    Ask Gemini for 5 interview questions based on resume, job title, and difficulty level.
     """
     
     # Define difficulty-specific instructions
@@ -97,33 +109,27 @@ def generate_audio_for_question(audio_client, audio_dir: str, question_text: str
     Returns the filename of the generated audio file
     """
     try:
-        # Prepare the audio prompt
-        audio_prompt = f"Say this interview question in a professional, friendly tone: {question_text}"
-        
-        response = audio_client.models.generate_content(
-            model="gemini-2.5-flash-preview-tts",
-            contents=audio_prompt,
-            config=types.GenerateContentConfig(
-                response_modalities=["AUDIO"],
-                speech_config=types.SpeechConfig(
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name='Kore',
-                        )
-                    )
-                ),
-            )
-        )
-        
-        # Extract audio data
-        audio_data = response.candidates[0].content.parts[0].inline_data.data
-        
         # Create filename
         filename = f"session_{session_id}_question_{question_number}.wav"
         filepath = os.path.join(audio_dir, filename)
         
+        # Reuse cached audio for identical question text
+        cache = get_audio_cache()
+        cache_key = AudioCache.make_key(question_text, DEFAULT_VOICE, QUESTION_AUDIO_PROMPT, TTS_MODEL)
+        if cache and cache.get_path(cache_key):
+            cache.link_into(cache_key, filepath)
+            return filename
+        
+        audio_data = synthesize_speech(audio_client, question_text, DEFAULT_VOICE, prompt=QUESTION_AUDIO_PROMPT)
+        if not audio_data:
+            raise ValueError("No audio data received")
+        
         # Save audio file
-        create_audio_file(filepath, audio_data)
+        if cache:
+            cache.put(cache_key, audio_data)
+            cache.link_into(cache_key, filepath)
+        else:
+            create_audio_file(filepath, audio_data)
         
         return filename
         
@@ -160,7 +166,7 @@ def generate_and_store_questions_with_audio(session_id: int) -> bool:
         print(f"Generating questions for session {session_id}...")
         generated_questions = generate_questions(
             text_model,
-            resume_text=session.resume_text_data,
+            resume_text=resume_prompt_text(session.resume),
             job_title=session.job_title,
             difficulty_level=session.difficulty_level
         )
@@ -215,7 +221,7 @@ def get_audio_file_path(session_id: int, question_number: int) -> str:
 def get_all_audio_files(session_id: int) -> List[Dict[str, str]]:
     """Get all audio files for a session"""
     audio_dir = ensure_audio_directory()
-    session = InterviewSession.query.get(session_id)
+    session = InterviewSession.get_with_content(session_id)
     if not session:
         return []
     
@@ -237,22 +243,10 @@ def get_all_audio_files(session_id: int) -> List[Dict[str, str]]:
     
     return audio_files
 
-# Optional: If you want to maintain some state between calls, you can use module-level variables
-_text_model = None
-_audio_client = None
-_audio_dir = None
-
 def get_or_initialize_clients():
-    """Get cached clients or initialize them if not already done"""
-    global _text_model, _audio_client, _audio_dir
-    
-    if _text_model is None or _audio_client is None:
-        _text_model, _audio_client = initialize_gemini_clients()
-    
-    if _audio_dir is None:
-        _audio_dir = ensure_audio_directory()
-    
-    return _text_model, _audio_client, _audio_dir
+    """Get the shared clients from the app's client registry"""
+    text_model, audio_client = initialize_gemini_clients()
+    return text_model, audio_client, ensure_audio_directory()
 
 def generate_and_store_questions_with_audio_cached(session_id: int) -> bool:
     """
@@ -277,7 +271,7 @@ def generate_and_store_questions_with_audio_cached(session_id: int) -> bool:
         print(f"Generating questions for session {session_id}...")
         generated_questions = generate_questions(
             text_model,
-            resume_text=session.resume_text_data,
+            resume_text=resume_prompt_text(session.resume),
             job_title=session.job_title,
             difficulty_level=session.difficulty_level
         )
@@ -0,0 +1,231 @@
+from flask import request, jsonify, current_app, session
+from app.api import bp
+from app.auth.decorators import requires_auth
+from app import db
+from app.models import JobPosting, Resume, User
+import time
+from app.services.candidates import decode_cursor, encode_cursor, get_candidate_matcher
+from app.services.matching import get_job_matcher, normalize_skill, posting_skills
+from app.services.resume_parser import resume_prompt_text
+from app.services.search import FILTER_FIELDS, get_job_search
+from app.services.semantic import get_semantic_matcher
+
+@bp.route('/jobs/match', methods=['POST'])
+@requires_auth
+def match_jobs():
+    """
+    Rank active job postings against a candidate's skills
+
+    The candidate is described by an explicit `skills` list, by
+    `resume_text`, or (when neither is given) by the user's latest resume.
+    `mode` is "skills" (default: weighted overlap of exact skills) or
+    "semantic" (similarity of hashed text embeddings, which also catches
+    related wording such as "postgres" / "postgresql").
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        max_results = current_app.config.get('JOB_MATCH_MAX_RESULTS', 100)
+        try:
+            k = min(max(int(data.get('k', 10)), 1), max_results)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'k must be an integer', 'status': 'error'}), 400
+
+        mode = data.get('mode', 'skills')
+        if mode not in ('skills', 'semantic'):
+            return jsonify({'error': 'mode must be "skills" or "semantic"', 'status': 'error'}), 400
+        matcher = get_job_matcher() if mode == 'skills' else get_semantic_matcher()
+        skills = data.get('skills')
+
+        if skills is not None:
+            if not isinstance(skills, list):
+                return jsonify({'error': 'skills must be a list', 'status': 'error'}), 400
+            skills = [str(skill) for skill in skills]
+            if mode == 'skills':
+                matches = matcher.match(skills, k)
+            else:
+                matches = matcher.match_text(', '.join(skills), k)
+        elif data.get('resume_text'):
+            if mode == 'skills':
+                skills, matches = matcher.match_text(data['resume_text'], k)
+            else:
+                matches = matcher.match_text(data['resume_text'], k)
+        else:
+            resume = Resume.query.filter_by(user_id=session.get('user_id')) \
+                .order_by(Resume.created_at.desc()).first()
+            if not resume:
+                return jsonify({'error': 'Provide skills or resume_text, or upload a resume first',
+                                'status': 'error'}), 400
+            # Use what was extracted at upload rather than re-scanning the text
+            if mode == 'skills' and resume.skills_extracted_at is not None:
+                skills = resume.skills or []
+                matches = matcher.match(skills, k)
+            elif mode == 'skills':
+                skills, matches = matcher.match_text(resume.text, k)
+            else:
+                matches = matcher.match_text(resume_prompt_text(resume), k)
+
+        # Attach posting details for the top k only
+        postings = {posting.id: posting for posting in
+                    JobPosting.query.filter(JobPosting.id.in_([m['job_id'] for m in matches])).all()}
+        for match in matches:
+            posting = postings.get(match['job_id'])
+            if posting:
+                match.update(title=posting.title, company=posting.company, location=posting.location,
+                             experience_level=posting.experience_level,
+                             employment_type=posting.employment_type)
+
+        return jsonify({
+            'mode': mode,
+            'skills': skills,
+            'matches': matches,
+            'postings_considered': len(matcher.index()),
+            'status': 'success'
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"Error matching jobs: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/jobs/search', methods=['GET'])
+@requires_auth
+def search_jobs():
+    """
+    Full-text search over active job postings, ranked by BM25
+
+    Query parameters: q, page, per_page, and optional location,
+    experience_level and employment_type filters (repeat a parameter or
+    separate values with commas to accept several).
+    """
+    try:
+        started = time.perf_counter()
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'q is required', 'status': 'error'}), 400
+
+        max_per_page = current_app.config.get('SEARCH_MAX_PER_PAGE', 50)
+        page = request.args.get('page', 1, type=int)
+        per_page = request.args.get('per_page', 20, type=int)
+        if not page or page < 1 or not per_page or per_page < 1:
+            return jsonify({'error': 'page and per_page must be positive integers', 'status': 'error'}), 400
+        per_page = min(per_page, max_per_page)
+
+        filters = {}
+        for field in FILTER_FIELDS:
+            values = [value for arg in request.args.getlist(field) for value in arg.split(',') if value.strip()]
+            if values:
+                filters[field] = values
+
+        total, hits = get_job_search().search(query, filters, offset=(page - 1) * per_page, limit=per_page)
+
+        postings = {posting.id: posting for posting in
+                    JobPosting.query.filter(JobPosting.id.in_([job_id for job_id, _ in hits])).all()}
+        results = []
+        for job_id, score in hits:
+            posting = postings.get(job_id)
+            if posting is None or not posting.is_active:
+                continue
+            results.append({
+                'job_id': job_id,
+                'score': score,
+                'title': posting.title,
+                'company': posting.company,
+                'location': posting.location,
+                'experience_level': posting.experience_level,
+                'employment_type': posting.employment_type,
+                'created_at': posting.created_at.isoformat() if posting.created_at else None,
+            })
+
+        return jsonify({
+            'query': query,
+            'filters': filters,
+            'results': results,
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total + per_page - 1) // per_page,
+            'took_ms': round((time.perf_counter() - started) * 1000, 1),
+            'status': 'success'
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"Error searching jobs: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
+
+@bp.route('/jobs/<int:job_id>/candidates', methods=['GET'])
+@requires_auth
+def match_candidates(job_id):
+    """
+    Rank candidates for one of the current user's postings
+
+    Scores each user's latest resume by the share of the posting's skills
+    it covers. Pages are fetched with `limit` and the `next_cursor` of the
+    previous response as `cursor`.
+    """
+    try:
+        posting = JobPosting.query.get(job_id)
+        if not posting:
+            return jsonify({'error': 'Job posting not found', 'status': 'error'}), 404
+        if posting.posted_by != session.get('user_id'):
+            return jsonify({'error': 'Only the poster can view candidates', 'status': 'error'}), 403
+
+        max_results = current_app.config.get('JOB_MATCH_MAX_RESULTS', 100)
+        limit = request.args.get('limit', 20, type=int)
+        if not limit or limit < 1:
+            return jsonify({'error': 'limit must be a positive integer', 'status': 'error'}), 400
+        limit = min(limit, max_results)
+
+        after = None
+        if request.args.get('cursor'):
+            try:
+                after = decode_cursor(request.args['cursor'])
+            except ValueError as e:
+                return jsonify({'error': str(e), 'status': 'error'}), 400
+
+        skills = list(dict.fromkeys(filter(None, map(normalize_skill, posting_skills(
+            posting.skills_required, posting.requirements, get_job_matcher().index().matcher())))))
+        ranked = get_candidate_matcher().rank(skills, limit, after)
+
+        # Names and emails for this page only; resume text is never loaded
+        people = {row.id: row for row in db.session.query(Resume.id, Resume.user_id, User.name, User.email)
+                  .join(User, Resume.user_id == User.id)
+                  .filter(Resume.id.in_([match['id'] for match in ranked])).all()}
+        wanted = set(skills)
+        candidates = []
+        for match in ranked:
+            person = people.get(match['id'])
+            if person is None:
+                continue
+            candidates.append({
+                'resume_id': match['id'],
+                'user_id': person.user_id,
+                'name': person.name,
+                'email': person.email,
+                'score': match['score'],
+                'matched_skills': match['matched_skills'],
+                'missing_skills': sorted(wanted.difference(match['matched_skills'])),
+            })
+
+        next_cursor = None
+        if len(ranked) == limit:
+            next_cursor = encode_cursor(ranked[-1]['score'], ranked[-1]['id'])
+
+        return jsonify({
+            'job_id': job_id,
+            'skills': skills,
+            'candidates': candidates,
+            'next_cursor': next_cursor,
+            'status': 'success'
+        })
+
+    except Exception as e:
+        current_app.logger.error(f"Error matching candidates for job {job_id}: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'status': 'error'
+        }), 500
@@ -1,6 +1,6 @@
 import json
 from urllib.parse import quote_plus, urlencode
-from flask import redirect, render_template, session, url_for, current_app
+from flask import redirect, render_template, session, url_for, current_app, flash
 from authlib.integrations.flask_client import OAuth
 from app.auth import bp
 from app.models import User
@@ -48,11 +48,20 @@ def callback():
     print(f"Auth0 user info: {auth0_user_info}")
     
     # Automatically create or update user in database
-    user = User.get_or_create_user(auth0_user_info)
+    try:
+        user = User.get_or_create_user(auth0_user_info)
+    except ValueError as e:
+        current_app.logger.warning(f"Login refused: {str(e)}")
+        flash('This email address is already linked to another account.', 'error')
+        return redirect(url_for('main.index'))
     print(f"Database user created/updated: {user}")
     
-    # Store token and enhanced user info in session
-    session["user"] = token  # Keep the full token
+    # Keep only the profile fields pages read; the tokens themselves are not needed after login
+    session.clear()
+    if hasattr(session, 'regenerate'):
+        session.regenerate()  # New session ID on login
+    session["user"] = {key: auth0_user_info.get(key)
+                       for key in ('sub', 'name', 'email', 'picture', 'updated_at')}
     session["user_id"] = user.id  # Store database user ID for easy access
     session["user_email"] = user.email
     session["auth0_id"] = auth0_user_info.get('sub')  # Store Auth0 ID separately
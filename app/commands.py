@@ -0,0 +1,110 @@
+# app/commands.py - Flask CLI commands
+import time
+import click
+from flask import current_app
+
+
+def register_commands(app):
+    """Attach the app's CLI commands (run with `flask <command>`)"""
+
+    @app.cli.command('interview-worker')
+    @click.option('--poll-interval', default=2.0, show_default=True, help='Seconds to wait when the queue is empty.')
+    @click.option('--once', is_flag=True, help='Exit once the queue is empty.')
+    def interview_worker(poll_interval, once):
+        """Process queued interview preparation jobs"""
+        from app.services.jobs import run_worker
+
+        current_app.logger.setLevel('INFO')
+        click.echo('Interview worker started')
+        try:
+            processed = run_worker(poll_interval=poll_interval, once=once)
+            click.echo(f'Processed {processed} jobs')
+        except KeyboardInterrupt:
+            click.echo('Interview worker stopped')
+
+    @app.cli.command('sweep-sessions')
+    def sweep_sessions():
+        """Delete expired server-side sessions"""
+        from app import server_sessions
+
+        click.echo(f'Deleted {server_sessions.sweep()} expired sessions')
+
+    @app.cli.command('build-index')
+    @click.option('--skip-matching', is_flag=True, help='Do not write the skill index snapshot.')
+    @click.option('--skip-search', is_flag=True, help='Do not write the search segment.')
+    @click.option('--skip-semantic', is_flag=True, help='Do not write the semantic index snapshot.')
+    def build_index(skip_matching, skip_search, skip_semantic):
+        """Snapshot the job matching and search indexes for workers to open"""
+        from app.services.matching import get_job_matcher
+        from app.services.search import get_job_search
+        from app.services.semantic import get_semantic_matcher
+
+        if not skip_matching:
+            started = time.perf_counter()
+            path = get_job_matcher().write_snapshot()
+            click.echo(f'Skill index snapshot: {path} ({time.perf_counter() - started:.1f}s)')
+        if not skip_search:
+            started = time.perf_counter()
+            segment = get_job_search().build()
+            click.echo(f"Search segment: {segment.meta['doc_count']} postings "
+                       f"({time.perf_counter() - started:.1f}s)")
+        if not skip_semantic:
+            started = time.perf_counter()
+            path = get_semantic_matcher().write_snapshot()
+            click.echo(f'Semantic index snapshot: {path} ({time.perf_counter() - started:.1f}s)')
+
+    @app.cli.command('extract-resume-skills')
+    @click.option('--all', 'recompute_all', is_flag=True, help='Recompute resumes that already have skills.')
+    @click.option('--batch-size', default=200, show_default=True, help='Resumes committed per batch.')
+    def extract_resume_skills(recompute_all, batch_size):
+        """Store skills and parsed profiles for resumes uploaded before extraction (or after the vocabulary grew)"""
+        from app import db
+        from app.models import Resume
+        from app.services.candidates import ensure_resume_skills
+        from app.services.resume_parser import ensure_resume_parsed
+
+        query = Resume.query.order_by(Resume.id)
+        if not recompute_all:
+            query = query.filter(db.or_(Resume.skills_extracted_at.is_(None), Resume.parsed_at.is_(None)))
+
+        updated = 0
+        last_id = 0
+        while True:
+            # Keyset batches, so committed rows don't shift the window
+            batch = query.filter(Resume.id > last_id).limit(batch_size).all()
+            if not batch:
+                break
+            for resume in batch:
+                skills_changed = ensure_resume_skills(resume, force=recompute_all)
+                updated += ensure_resume_parsed(resume, force=skills_changed) or skills_changed
+            last_id = batch[-1].id
+            db.session.commit()
+        click.echo(f'Extracted skills and profiles for {updated} resumes')
+
+    @app.cli.command('encode-audio')
+    def encode_audio():
+        """Write compressed variants for cached and session WAV files that don't have one yet"""
+        import os
+        from app.main.routes import AUDIO_FOLDER
+        from app.services.audio_cache import get_audio_cache
+        from app.services.audio_encoding import get_audio_encoder
+
+        encoder = get_audio_encoder()
+        if not encoder or not encoder.enabled:
+            raise click.ClickException('Audio variants are disabled (AUDIO_VARIANT_FORMAT) or ffmpeg is missing')
+
+        cache = get_audio_cache()
+        roots = [cache.root] if cache else []
+        roots.append(os.path.join(os.getcwd(), AUDIO_FOLDER))
+        encoded = failed = 0
+        for root in roots:
+            for dirpath, _, filenames in os.walk(root):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if not filename.endswith('.wav') or os.path.exists(encoder.variant_path(path)):
+                        continue
+                    if encoder.encode(path):
+                        encoded += 1
+                    else:
+                        failed += 1
+        click.echo(f'Encoded {encoded} audio files ({failed} failed)')
@@ -1,23 +1,33 @@
 from flask import render_template, request, redirect, url_for, flash, session, jsonify, current_app, send_file
 from app.main import bp
 from app.auth.decorators import requires_auth
-from app.models import User, InterviewSession
+from app.models import User, InterviewSession, InterviewAnswer
 from app import db
-from werkzeug.utils import secure_filename
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge, RequestedRangeNotSatisfiable
+from werkzeug.security import safe_join
 import os
-import PyPDF2
-import pdfplumber
 import json
-import time
+import base64
+from datetime import datetime
 import wave
-from typing import List, Dict, Tuple
-import google.generativeai as genai
-from google import genai as genai_client
+from typing import Callable, List, Dict, Optional, Tuple
 from google.genai import types
 import tempfile
+from app.services.tts import synthesize_many, wave_file, DEFAULT_VOICE, INTERVIEWER_PROMPT, TTS_MODEL
+from app.services.audio_cache import AudioCache, get_audio_cache
+from app.services.audio_encoding import get_audio_encoder
+from app.services.audio_delivery import get_audio_delivery
+from app.services.jobs import enqueue_preparation
+from app.services.clients import get_gemini_clients
+from app.services.question_cache import get_or_generate_questions
+from app.services.pdf_extract import extract_pdf_text
+from app.services.uploads import read_upload
+from app.services.answer_uploads import UploadConflict, get_answer_uploads
+from app.services.resumes import get_or_create_resume
+from app.services.resume_parser import resume_prompt_text
+from app.services.user_cache import get_user_cache
 
 # Configure upload settings
-UPLOAD_FOLDER = 'uploads'
 AUDIO_FOLDER = 'audio_files'
 ALLOWED_EXTENSIONS = {'pdf'}
 
@@ -60,44 +70,23 @@ def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
-    text = ""
-    
+def extract_text_from_pdf(source):
+    """Extract text from a PDF path or bytes (in the extraction process pool, within the PDF_* page and time budgets)"""
     try:
-        # Try pdfplumber first
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        # If no text found, try PyPDF2
-        if len(text.strip()) < 50:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                    
+        return extract_pdf_text(source)
     except Exception as e:
         current_app.logger.error(f"PDF extraction error: {str(e)}")
         return None
-        
-    return text.strip()
-
-def parse_resume_data(resume_text):
-    """Parse resume text (currently just returns the text)"""
-    return resume_text
 
 def get_current_user():
-    """Get current user from session and database"""
+    """Get current user from session and database (cached per request and briefly per process)"""
     auth0_id = None
     user = None
     
     # Method 1: Check if user_id is stored (easier approach)
     if 'user_id' in session:
         user_id = session['user_id']
-        user = User.query.get(user_id)
+        user = get_user_cache().get(user_id=user_id)
         if user:
             return user
     
@@ -116,7 +105,7 @@ def get_current_user():
             auth0_id = auth0_user_info['userinfo']['sub']
     
     if auth0_id:
-        user = User.query.filter_by(auth0_id=auth0_id).first()
+        user = get_user_cache().get(auth0_id=auth0_id)
     
     return user
 
@@ -131,6 +120,13 @@ def interview_setup():
 @requires_auth
 def upload_resume():
     """Handle resume upload and process it"""
+    max_upload_bytes = current_app.config.get('RESUME_MAX_UPLOAD_BYTES', 5 * 1024 * 1024)
+    
+    # Reject oversized uploads before the body is read
+    if request.content_length and request.content_length > max_upload_bytes:
+        return jsonify({'success': False, 'error': f'File is too large (max {max_upload_bytes / (1024 * 1024):.1f} MB)'}), 413
+    request.max_content_length = max_upload_bytes
+    
     try:
         # Validate file upload
         if 'resume' not in request.files:
@@ -155,37 +151,24 @@ def upload_resume():
         if not user:
             return jsonify({'success': False, 'error': 'User not authenticated - please log in again'})
         
-        # Create temp directory
-        upload_dir = os.path.join(os.getcwd(), UPLOAD_FOLDER)
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Save file temporarily
-        filename = secure_filename(file.filename)
-        timestamp = str(int(time.time()))
-        unique_filename = f"{user.id}_{timestamp}_{filename}"
-        file_path = os.path.join(upload_dir, unique_filename)
-        file.save(file_path)
+        # Parse straight from the upload buffer (closed by read_upload)
+        pdf_bytes = read_upload(file, max_upload_bytes)
         
-        # Extract text from PDF
-        resume_text = extract_text_from_pdf(file_path)
+        # Reuse the stored resume for a file this user already uploaded, otherwise extract
+        # and parse it (the structured profile is stored on the resume for prompts)
+        resume = get_or_create_resume(user.id, pdf_bytes, extract_text_from_pdf)
         
-        if not resume_text or len(resume_text.strip()) < 50:
-            # Clean up temp file
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        if not resume:
             return jsonify({'success': False, 'error': 'Could not extract readable text from PDF. Please try a different file.'})
         
-        # Parse resume data
-        resume_text_data = parse_resume_data(resume_text)
+        resume_text_data = resume.text
         
         # Create new interview session in database
         interview_session = InterviewSession(
             user_id=user.id,
             job_title=job_title,
             difficulty_level=difficulty_level,
-            resume_text_data=resume_text_data,
+            resume=resume,
             status='setup'
         )
         
@@ -199,11 +182,8 @@ def upload_resume():
         # Store session ID for easy access
         session['current_interview_session_id'] = interview_session.id
         
-        # Clean up temp file
-        try:
-            os.remove(file_path)
-        except:
-            pass
+        # Questions and audio are generated by the background worker
+        enqueue_preparation(interview_session)
         
         return jsonify({
             'success': True, 
@@ -212,47 +192,42 @@ def upload_resume():
             'redirect_url': url_for('main.start_interview')
         })
         
+    except RequestEntityTooLarge:
+        return jsonify({'success': False, 'error': f'File is too large (max {max_upload_bytes / (1024 * 1024):.1f} MB)'}), 413
+    except BadRequest:
+        # Truncated (client disconnected) or malformed body
+        return jsonify({'success': False, 'error': 'The upload was incomplete, please try again'}), 400
     except Exception as e:
         current_app.logger.error(f"Error in upload_resume: {str(e)}")
         return jsonify({'success': False, 'error': f'Error processing resume: {str(e)}'})
+    finally:
+        # Release the spooled upload even if processing failed
+        for uploaded in request.files.values():
+            uploaded.close()
 
 def initialize_gemini_client():
-    """Initialize and return Gemini client"""
-    api_key = current_app.config.get('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable is required")
-    
-    # Configure Gemini
-    genai.configure(api_key=api_key)
-    text_model = genai.GenerativeModel('gemini-2.0-flash')
-    
-    return text_model
+    """Return the shared Gemini text model"""
+    return get_gemini_clients().text_model('gemini-2.0-flash')
 
 def initialize_gemini_tts_client():
-    """Initialize and return Gemini TTS client"""
-    api_key = current_app.config.get('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable is required")
-    
-    # Initialize the Gemini client for TTS
-    client = genai_client.Client(api_key=api_key)
-    return client
-
-def wave_file(filename, pcm, channels=1, rate=24000, sample_width=2):
-    """Save PCM data as a wave file"""
-    with wave.open(filename, "wb") as wf:
-        wf.setnchannels(channels)
-        wf.setsampwidth(sample_width)
-        wf.setframerate(rate)
-        wf.writeframes(pcm)
+    """Return the shared Gemini TTS client"""
+    return get_gemini_clients().tts_client()
 
-def generate_audio_for_questions(session_id: int, questions: List[str]) -> Dict[str, str]:
+def generate_audio_for_questions(session_id: int, questions: List[str], client=None,
+                                 on_audio_ready: Optional[Callable[[str, str], None]] = None) -> Dict[str, str]:
     """
     Generate audio files for all interview questions using Gemini TTS
     
+    Questions already in the audio cache are linked from it; the rest are
+    synthesized concurrently (bounded by TTS_MAX_WORKERS, each call limited
+    to TTS_CALL_TIMEOUT seconds). A failed question is simply missing from
+    the result.
+    
     Args:
         session_id: Interview session ID
         questions: List of questions to convert to audio
+        client: Optional TTS client, defaults to a new Gemini client
+        on_audio_ready: Optional callback receiving (question index, path) as each file is saved
         
     Returns:
         Dict mapping question index to audio file path
@@ -266,58 +241,59 @@ def generate_audio_for_questions(session_id: int, questions: List[str]) -> Dict[
         session_audio_dir = os.path.join(audio_dir, f'session_{session_id}')
         os.makedirs(session_audio_dir, exist_ok=True)
         
-        # Initialize Gemini TTS client
-        client = initialize_gemini_tts_client()
-        
         audio_files = {}
         
-        for i, question in enumerate(questions):
+        # Reuse previously synthesized audio for identical questions
+        cache = get_audio_cache()
+        keys = [AudioCache.make_key(q, DEFAULT_VOICE, INTERVIEWER_PROMPT, TTS_MODEL) for q in questions]
+        
+        def save_audio(i, audio_data=None):
             try:
-                current_app.logger.info(f"Generating audio for question {i+1}: {question[:50]}...")
-                
-                # Generate audio using Gemini TTS
-                response = client.models.generate_content(
-                    model="gemini-2.5-flash-preview-tts",
-                    contents=f"Say in a professional, friendly interviewer tone: {question}",
-                    config=types.GenerateContentConfig(
-                        response_modalities=["AUDIO"],
-                        speech_config=types.SpeechConfig(
-                            voice_config=types.VoiceConfig(
-                                prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                    voice_name='Kore',  # Professional female voice
-                                )
-                            )
-                        ),
-                    )
-                )
-                
-                # Extract audio data
-                if (response.candidates and 
-                    len(response.candidates) > 0 and 
-                    response.candidates[0].content and 
-                    response.candidates[0].content.parts and
-                    len(response.candidates[0].content.parts) > 0 and
-                    response.candidates[0].content.parts[0].inline_data):
-                    
-                    audio_data = response.candidates[0].content.parts[0].inline_data.data
-                    
-                    # Save audio file
-                    filename = f'question_{i+1}.wav'
-                    file_path = os.path.join(session_audio_dir, filename)
+                # Save audio file
+                filename = f'question_{i+1}.wav'
+                file_path = os.path.join(session_audio_dir, filename)
+                if cache is None:
                     wave_file(file_path, audio_data)
-                    
-                    # Store relative path for serving
-                    relative_path = f'{AUDIO_FOLDER}/session_{session_id}/{filename}'
-                    audio_files[str(i)] = relative_path
-                    
-                    current_app.logger.info(f"Successfully generated audio for question {i+1}")
+                    encoder = get_audio_encoder()
+                    if encoder:
+                        encoder.encode(file_path)
                 else:
-                    current_app.logger.error(f"No audio data received for question {i+1}")
-                    
+                    if audio_data is not None:
+                        cache.put(keys[i], audio_data)
+                    if not cache.link_into(keys[i], file_path):
+                        return
+                
+                # Store relative path for serving
+                relative_path = f'{AUDIO_FOLDER}/session_{session_id}/{filename}'
+                audio_files[str(i)] = relative_path
+                
+                if on_audio_ready:
+                    on_audio_ready(str(i), relative_path)
+                
             except Exception as e:
-                current_app.logger.error(f"Error generating audio for question {i+1}: {str(e)}")
                 # Continue with other questions even if one fails
-                continue
+                current_app.logger.error(f"Error saving audio for question {i+1}: {str(e)}")
+        
+        missing = []
+        for i, key in enumerate(keys):
+            if cache is not None and cache.get_path(key) is not None:
+                save_audio(i)
+            else:
+                missing.append(i)
+        
+        if missing:
+            # Initialize Gemini TTS client
+            if client is None:
+                client = initialize_gemini_tts_client()
+            
+            current_app.logger.info(f"Generating audio for {len(missing)} of {len(questions)} questions...")
+            synthesize_many(
+                client,
+                [questions[i] for i in missing],
+                max_workers=current_app.config.get('TTS_MAX_WORKERS', 1),
+                timeout=current_app.config.get('TTS_CALL_TIMEOUT'),
+                on_result=lambda j, audio_data: save_audio(missing[j], audio_data),
+            )
         
         current_app.logger.info(f"Generated {len(audio_files)} audio files out of {len(questions)} questions")
         return audio_files
@@ -326,8 +302,24 @@ def generate_audio_for_questions(session_id: int, questions: List[str]) -> Dict[
         current_app.logger.error(f"Error in generate_audio_for_questions: {str(e)}")
         return {}
 
-def generate_questions(text_model, resume_text: str, job_title: str, difficulty_level: str) -> List[str]:
-    """Generate 4 interview questions based on resume, job title, and difficulty level"""
+# Bump when the prompt below changes so cached questions are regenerated
+QUESTION_PROMPT_VERSION = 'interview-4q-v2'
+
+def generate_questions(text_model, resume_text: str, job_title: str, difficulty_level: str,
+                       force_fresh: bool = False) -> List[str]:
+    """Generate 4 interview questions, reusing cached questions for identical inputs"""
+    return get_or_generate_questions(
+        lambda: request_questions(text_model, resume_text, job_title, difficulty_level),
+        resume_text,
+        job_title,
+        difficulty_level,
+        model=getattr(text_model, 'model_name', ''),
+        prompt_version=QUESTION_PROMPT_VERSION,
+        force_fresh=force_fresh
+    )
+
+def request_questions(text_model, resume_text: str, job_title: str, difficulty_level: str) -> List[str]:
+    """Ask Gemini for 4 interview questions based on resume, job title, and difficulty level"""
     
     # Define difficulty-specific instructions
     difficulty_prompts = {
@@ -340,7 +332,7 @@ def generate_questions(text_model, resume_text: str, job_title: str, difficulty_
     You are an expert interviewer tasked with creating interview questions for a {job_title} position.
     
     Candidate's Resume/Background:
-    {resume_text[:2000]}  # Limit text to avoid token limits
+    {resume_text}
     
     Job Title: {job_title}
     Difficulty Level: {difficulty_level}
@@ -389,10 +381,51 @@ def generate_questions(text_model, resume_text: str, job_title: str, difficulty_
         current_app.logger.error(f"Error generating questions with Gemini: {e}")
         raise ValueError(f"Error generating questions: {str(e)}")
 
+DEFAULT_OPENING_QUESTION = "Tell me about yourself and your professional background."
+
+def prepare_questions(interview_session: InterviewSession, force_fresh: bool = False) -> List[str]:
+    """Generate and store the session's questions, falling back to generic ones if Gemini fails"""
+    try:
+        # Initialize Gemini client
+        text_model = initialize_gemini_client()
+        
+        # Generate questions (4 questions + "Tell me about yourself")
+        generated_questions = generate_questions(
+            text_model, 
+            resume_prompt_text(interview_session.resume),
+            interview_session.job_title, 
+            interview_session.difficulty_level,
+            force_fresh=force_fresh
+        )
+        
+        # Add the standard opening question
+        all_questions = [DEFAULT_OPENING_QUESTION] + generated_questions
+        current_app.logger.info(f"Generated questions: {all_questions}")
+        
+    except Exception as question_error:
+        current_app.logger.error(f"Error generating questions: {str(question_error)}")
+        # Provide fallback questions if AI generation fails
+        all_questions = [
+            DEFAULT_OPENING_QUESTION,
+            f"What interests you most about this {interview_session.job_title} position?",
+            "Describe a challenging project you've worked on and how you overcame obstacles.",
+            "What are your greatest strengths and how do they apply to this role?",
+            "Where do you see yourself in 5 years, and how does this position fit into your career goals?"
+        ]
+        current_app.logger.info("Using fallback questions due to AI generation error")
+    
+    # Store generated questions in the session
+    interview_session.questions = all_questions
+    interview_session.questions_ready = True
+    interview_session.status = 'in_progress'
+    db.session.commit()
+    
+    return all_questions
+
 @bp.route('/start-interview')
 @requires_auth
 def start_interview():
-    """Start the interview session and generate audio files"""
+    """Render the interview page; questions and audio are prepared by the background worker"""
     try:
         session_id = session.get('current_interview_session_id')
         
@@ -401,7 +434,7 @@ def start_interview():
             return redirect(url_for('main.interview_setup'))
         
         # Get interview session from database
-        interview_session = InterviewSession.query.get(session_id)
+        interview_session = InterviewSession.get_with_content(session_id)
         
         if not interview_session:
             flash('Interview session not found.', 'error')
@@ -409,79 +442,186 @@ def start_interview():
         
         user = session.get('user')
         
-        # Check if questions are already generated and valid
-        current_app.logger.info(f"Current questions: {interview_session.questions}")
-        current_app.logger.info(f"Questions type: {type(interview_session.questions)}")
-        
-        if not interview_session.questions or len(interview_session.questions) != 5:
-            current_app.logger.info("Generating new questions...")
-            try:
-                # Initialize Gemini client
-                text_model = initialize_gemini_client()
-                
-                # Generate questions (4 questions + "Tell me about yourself")
-                generated_questions = generate_questions(
-                    text_model, 
-                    interview_session.resume_text_data, 
-                    interview_session.job_title, 
-                    interview_session.difficulty_level
-                )
-                
-                # Add the standard opening question
-                all_questions = ["Tell me about yourself and your professional background."] + generated_questions
-                
-                current_app.logger.info(f"Generated questions: {all_questions}")
-                
-                # Store generated questions in the session
-                interview_session.questions = all_questions
-                interview_session.status = 'in_progress'
-                db.session.commit()
-                
-                current_app.logger.info("Questions saved to database")
-                
-            except Exception as question_error:
-                current_app.logger.error(f"Error generating questions: {str(question_error)}")
-                # Provide fallback questions if AI generation fails
-                fallback_questions = [
-                    "Tell me about yourself and your professional background.",
-                    f"What interests you most about this {interview_session.job_title} position?",
-                    "Describe a challenging project you've worked on and how you overcame obstacles.",
-                    "What are your greatest strengths and how do they apply to this role?",
-                    "Where do you see yourself in 5 years, and how does this position fit into your career goals?"
-                ]
-                interview_session.questions = fallback_questions
-                interview_session.status = 'in_progress'
-                db.session.commit()
-                current_app.logger.info("Using fallback questions due to AI generation error")
-        
-        # Refresh the session from database to ensure we have the latest data
-        db.session.refresh(interview_session)
-        current_app.logger.info(f"Final questions before audio generation: {interview_session.questions}")
-        
-        # Generate audio files for all questions
-        current_app.logger.info("Starting audio generation...")
-        audio_files = generate_audio_for_questions(interview_session.id, interview_session.questions)
-        
-        # Store audio file paths in the session (you might want to add an audio_files column to your model)
-        if hasattr(interview_session, 'audio_files'):
-            interview_session.audio_files = audio_files
-            db.session.commit()
-        else:
-            # For now, store in Flask session
-            session[f'audio_files_{interview_session.id}'] = audio_files
-        
-        current_app.logger.info(f"Audio generation completed. Generated {len(audio_files)} files.")
+        # Sessions created before background preparation, or whose job failed, get queued again
+        if not interview_session.questions_ready and interview_session.preparation_status != 'running':
+            enqueue_preparation(interview_session)
         
         return render_template('interview_placeholder.html', 
                              user=user, 
                              interview_session=interview_session,
-                             audio_files=audio_files)
+                             audio_files=interview_session.audio_files or {},
+                             audio_urls=question_audio_urls(interview_session.id, interview_session.audio_files))
     
     except Exception as e:
         current_app.logger.error(f"Error starting interview: {str(e)}")
         flash(f'Error starting interview: {str(e)}', 'error')
         return redirect(url_for('main.interview_setup'))
 
+@bp.route('/interview-status/<int:session_id>')
+@requires_auth
+def interview_status(session_id):
+    """Poll background preparation progress for an interview session"""
+    user = get_current_user()
+    interview_session = InterviewSession.get_with_content(session_id)
+    
+    if not interview_session or not user or interview_session.user_id != user.id:
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'preparation_status': interview_session.preparation_status,
+        'questions_ready': interview_session.questions_ready,
+        'questions': interview_session.questions if interview_session.questions_ready else [],
+        'audio_files': interview_session.audio_files or {},
+        'audio_urls': question_audio_urls(interview_session.id, interview_session.audio_files)
+    })
+
+def encode_history_cursor(created_at, session_id):
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{session_id}'.encode()).decode().rstrip('=')
+
+def decode_history_cursor(cursor):
+    """Inverse of encode_history_cursor; raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, session_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(session_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+@bp.route('/interview-history')
+@requires_auth
+def interview_history():
+    """
+    The current user's interview sessions, newest first
+
+    Keyset pagination: pass the previous page's `next_cursor` as `cursor`
+    (pages cost the same however deep they are). Optional `status`
+    filter and `limit`. Served by the (user_id, [status,] created_at)
+    indexes; questions and audio are not loaded.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify({'success': False, 'error': 'User not authenticated - please log in again'}), 401
+    
+    limit = request.args.get('limit', 20, type=int)
+    if not limit or limit < 1:
+        return jsonify({'success': False, 'error': 'limit must be a positive integer'}), 400
+    limit = min(limit, current_app.config.get('INTERVIEW_HISTORY_MAX_PER_PAGE', 50))
+    
+    query = InterviewSession.query.filter(InterviewSession.user_id == user.id)
+    status = request.args.get('status')
+    if status:
+        if status not in InterviewSession.status.type.enums:
+            return jsonify({'success': False, 'error': f'Unknown status {status}'}), 400
+        query = query.filter(InterviewSession.status == status)
+    if request.args.get('cursor'):
+        try:
+            created_at, session_id = decode_history_cursor(request.args['cursor'])
+        except ValueError as e:
+            return jsonify({'success': False, 'error': str(e)}), 400
+        # (created_at, id) < cursor, with a plain bound on created_at so the index range starts at the cursor
+        query = query.filter(InterviewSession.created_at <= created_at,
+                             db.or_(InterviewSession.created_at < created_at, InterviewSession.id < session_id))
+    
+    page = query.order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc()).limit(limit + 1).all()
+    has_more = len(page) > limit
+    page = page[:limit]
+    
+    # Answer counts for this page only, from the (session_id, question_index) index
+    answered = dict(db.session.query(InterviewAnswer.session_id, db.func.count())
+                    .filter(InterviewAnswer.session_id.in_([s.id for s in page]))
+                    .group_by(InterviewAnswer.session_id).all()) if page else {}
+    
+    return jsonify({
+        'success': True,
+        'sessions': [{
+            'id': s.id,
+            'job_title': s.job_title,
+            'difficulty_level': s.difficulty_level,
+            'status': s.status,
+            'preparation_status': s.preparation_status,
+            'questions_ready': s.questions_ready,
+            'answered': answered.get(s.id, 0),
+            'created_at': s.created_at.isoformat() if s.created_at else None,
+            'completed_at': s.completed_at.isoformat() if s.completed_at else None,
+        } for s in page],
+        'next_cursor': encode_history_cursor(page[-1].created_at, page[-1].id) if has_more else None
+    })
+
+@bp.route('/interview/<int:session_id>/answers/<int:question_index>/upload', methods=['POST'])
+@requires_auth
+def start_answer_upload(session_id, question_index):
+    """
+    Start a chunked upload of a recorded answer
+
+    JSON body: size (bytes) and content_type of the recording. The
+    response gives the upload_id and chunk_size; send the recording with
+    PUT /answer-upload/<upload_id> one chunk at a time.
+    """
+    user = get_current_user()
+    interview_session = InterviewSession.get_with_content(session_id)
+    
+    if not interview_session or not user or interview_session.user_id != user.id:
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    if question_index >= interview_session.get_question_count():
+        return jsonify({'success': False, 'error': 'No such question'}), 404
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        upload = get_answer_uploads().create(user.id, session_id, question_index,
+                                             data.get('size'), data.get('content_type'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify(dict(upload, success=True)), 201
+
+@bp.route('/answer-upload/<upload_id>', methods=['GET', 'PUT'])
+@requires_auth
+def answer_upload(upload_id):
+    """
+    GET: the offset to resume from. PUT: the chunk starting at the
+    Upload-Offset header, whose hex SHA-256 is in the Upload-Checksum
+    header; every chunk is chunk_size bytes except the last. A wrong
+    offset answers 409 with the expected one, and a bad length or
+    checksum 400 (resend that chunk).
+    """
+    uploads = get_answer_uploads()
+    user_id = session.get('user_id')
+    
+    try:
+        if request.method == 'GET':
+            return jsonify(dict(uploads.status(upload_id, user_id), success=True))
+        
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+        except ValueError:
+            return jsonify({'success': False, 'error': 'Upload-Offset header is required'}), 400
+        
+        def link_answer(meta, path):
+            interview_session = InterviewSession.query.get(meta['session_id'])
+            previous = interview_session.answers.filter_by(question_index=meta['question_index']).first()
+            previous_path = previous.audio_path if previous else None
+            interview_session.set_answer_audio(meta['question_index'], path, meta['content_type'], meta['size'])
+            # A re-recording in another format leaves the earlier file behind
+            if previous_path and previous_path != path and os.path.exists(previous_path):
+                os.remove(previous_path)
+        
+        # The body is streamed to disk, not parsed or buffered
+        upload = uploads.write_chunk(upload_id, user_id, offset, request.stream,
+                                     request.headers.get('Upload-Checksum'), on_complete=link_answer)
+        upload.pop('path', None)
+        return jsonify(dict(upload, success=True))
+    
+    except LookupError:
+        return jsonify({'success': False, 'error': 'Upload not found'}), 404
+    except UploadConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'offset': e.offset}), 409
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error storing answer upload: {str(e)}")
+        return jsonify({'success': False, 'error': 'Could not store the chunk, please retry'}), 500
+
 @bp.route('/regenerate-questions', methods=['POST'])
 @requires_auth
 def regenerate_questions():
@@ -489,34 +629,42 @@ def regenerate_questions():
         data = request.get_json()
         session_id = data.get('session_id')
         
-        interview_session = InterviewSession.query.get(session_id)
-        if not interview_session:
-            return jsonify({'success': False, 'error': 'Session not found'})
-        
-        # Regenerate questions
-        text_model = initialize_gemini_client()
-        generated_questions = generate_questions(
-            text_model,
-            interview_session.resume_text_data,
-            interview_session.job_title,
-            interview_session.difficulty_level
-        )
-        
-        # Add the standard opening question
-        all_questions = ["Tell me about yourself and your professional background."] + generated_questions
+        # Only the owner may regenerate a session; others get the same 404 as a missing one
+        user = get_current_user()
+        if not user or InterviewSession.owner_id(session_id) != user.id:
+            return jsonify({'success': False, 'error': 'Session not found'}), 404
         
-        interview_session.questions = all_questions
-        db.session.commit()
+        interview_session = InterviewSession.get_with_content(session_id)
         
-        # Regenerate audio files
-        audio_files = generate_audio_for_questions(interview_session.id, all_questions)
-        session[f'audio_files_{interview_session.id}'] = audio_files
+        # Questions and audio are regenerated by the background worker, bypassing the question
+        # cache so the user gets new questions; progress is polled from interview_status
+        interview_session.questions_ready = False
+        job = enqueue_preparation(interview_session, 'regenerate_questions')
         
-        return jsonify({'success': True, 'questions': all_questions, 'audio_files': audio_files})
+        return jsonify({
+            'success': True,
+            'job_id': job.id,
+            'preparation_status': interview_session.preparation_status,
+            'status_url': url_for('main.interview_status', session_id=interview_session.id)
+        })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+def question_audio_path(session_id: int, filename: str) -> Optional[str]:
+    """Where a session's question audio file lives; None for names outside its directory"""
+    return safe_join(os.path.join(os.getcwd(), AUDIO_FOLDER, f'session_{session_id}'), filename)
+
+def question_audio_urls(session_id: int, audio_files: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """serve_audio URLs for a session's question audio, each carrying its content hash when known"""
+    delivery = get_audio_delivery()
+    urls = {}
+    for index, relative_path in (audio_files or {}).items():
+        filename = os.path.basename(relative_path)
+        version = delivery.version(question_audio_path(session_id, filename)) if delivery else None
+        urls[index] = url_for('main.serve_audio', session_id=session_id, filename=filename, v=version)
+    return urls
+
 @bp.route('/serve-audio/<int:session_id>/<filename>')
 @requires_auth
 def serve_audio(session_id, filename):
@@ -524,21 +672,32 @@ def serve_audio(session_id, filename):
     try:
         # Security check: ensure user owns this session
         user = get_current_user()
-        interview_session = InterviewSession.query.get(session_id)
         
-        if not interview_session or interview_session.user_id != user.id:
+        if not user or InterviewSession.owner_id(session_id) != user.id:
             return "Unauthorized", 403
         
-        # Construct file path
-        audio_dir = os.path.join(os.getcwd(), AUDIO_FOLDER, f'session_{session_id}')
-        file_path = os.path.join(audio_dir, filename)
-        
-        # Security check: ensure file exists and is within the expected directory
-        if not os.path.exists(file_path) or not os.path.commonpath([audio_dir, file_path]) == audio_dir:
+        # Security check: the file must be within the session's directory
+        wav_path = question_audio_path(session_id, filename)
+        if wav_path is None:
             return "File not found", 404
         
-        return send_file(file_path, mimetype='audio/wav')
+        # The compressed variant when the client asked for it (?format=opus or Accept);
+        # cacheable for good when ?v= matches the content (see question_audio_urls)
+        encoder = get_audio_encoder()
+        file_path, mimetype = encoder.choose(wav_path, request.args.get('format'), request.accept_mimetypes) \
+            if encoder else (wav_path, 'audio/wav')
+        delivery = get_audio_delivery()
+        if delivery:
+            response = delivery.send(file_path, mimetype, version=request.args.get('v'), versioned_path=wav_path)
+        else:
+            response = send_file(file_path, mimetype=mimetype, conditional=True) if os.path.isfile(file_path) else None
+        if response is None:
+            return "File not found", 404
+        response.vary.add('Accept')
+        return response
         
+    except RequestedRangeNotSatisfiable:
+        raise
     except Exception as e:
         current_app.logger.error(f"Error serving audio file: {str(e)}")
         return "Internal server error", 500
\ No newline at end of file
@@ -1,4 +1,4 @@
-from app.models.user import User, InterviewSession
+from app.models.user import User, Resume, ResumeFile, InterviewSession, InterviewAnswer, InterviewJob, QuestionCacheEntry, JobPosting, ServerSession
 
 def register_blueprints(app):
     from api.interview_routes import interview_bp
@@ -1,6 +1,10 @@
 # app/models.py - Simplified models for interview system
 from app import db
-from datetime import datetime
+from datetime import datetime, timedelta
+from sqlalchemy import case, func
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import deferred, undefer_group
 from sqlalchemy.dialects.mysql import JSON
 
 class User(db.Model):
@@ -16,28 +20,64 @@ class User(db.Model):
     last_login = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     
+    # Profile fields refreshed from Auth0 on every login (username is only set when the user is created)
+    PROFILE_FIELDS = ('email', 'name', 'picture')
+
     @staticmethod
     def get_or_create_user(auth0_user_info):
-        """Get existing user or create new one from Auth0 user info"""
-        user = User.query.filter_by(auth0_id=auth0_user_info['sub']).first()
-        
-        if not user:
-            user = User(
-                auth0_id=auth0_user_info['sub'],
-                email=auth0_user_info.get('email'),
-                name=auth0_user_info.get('name'),
-                username=auth0_user_info.get('nickname'),
-                picture=auth0_user_info.get('picture')
-            )
-            db.session.add(user)
-            db.session.commit()
-        else:
-            # Update user info on login
-            user.email = auth0_user_info.get('email', user.email)
-            user.name = auth0_user_info.get('name', user.name)
-            user.picture = auth0_user_info.get('picture', user.picture)
-            user.last_login = datetime.utcnow()
+        """
+        Get existing user or create new one from Auth0 user info
+
+        Nothing is written when the profile fields are unchanged and the
+        stored last_login is within LAST_LOGIN_GRANULARITY_SECONDS. Otherwise
+        a single upsert inserts the user or updates only what changed, so
+        concurrent first logins don't fail on the unique auth0_id; databases
+        without an upsert get a plain insert or update.
+
+        Raises:
+            ValueError: A new user's email or username belongs to another user
+        """
+        from flask import current_app
+        auth0_id = auth0_user_info['sub']
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=current_app.config.get('LAST_LOGIN_GRANULARITY_SECONDS', 3600))
+        profile = {field: auth0_user_info[field] for field in User.PROFILE_FIELDS if field in auth0_user_info}
+
+        user = User.query.filter_by(auth0_id=auth0_id).first()
+        if user is not None:
+            changed = any(getattr(user, field) != value for field, value in profile.items())
+            if not changed and user.last_login is not None and user.last_login >= cutoff:
+                return user
+
+        values = dict(profile, auth0_id=auth0_id, last_login=now, username=auth0_user_info.get('nickname'))
+        upsert = _login_upsert(values, list(profile), cutoff)
+        try:
+            if upsert is not None:
+                db.session.execute(upsert)
+            elif user is None:
+                db.session.add(User(**values))
+            else:
+                for field, value in profile.items():
+                    setattr(user, field, value)
+                if user.last_login is None or user.last_login < cutoff:
+                    user.last_login = now
             db.session.commit()
+        except IntegrityError as e:
+            # Another unique key collided (an email taken by another user), or a
+            # concurrent first login inserted the user first; the re-read tells which
+            db.session.rollback()
+            current_app.logger.warning(f"Login of {auth0_id} not stored: {str(e.orig)}")
+
+        user = User.query.filter_by(auth0_id=auth0_id).populate_existing().first()
+        if user is None:
+            # MySQL applies ON DUPLICATE KEY to any unique key; the guarded update left the other row alone
+            raise ValueError(f"Email or username of {auth0_id} already belongs to another user")
+        
+        # Cached copies (or a cached miss) of this user are stale now
+        from app.services.user_cache import get_user_cache
+        cache = get_user_cache()
+        if cache is not None:
+            cache.invalidate(user.id, user.auth0_id)
             
         return user
     
@@ -45,19 +85,106 @@ class User(db.Model):
         return f'<User {self.email}>'
 
 
+def _upsert(table, values, conflict_columns, update):
+    """
+    Single INSERT of values that, when a row with the same conflict_columns
+    exists, applies update(new) instead; new names the proposed row's columns
+
+    Returns None on databases without an upsert (callers insert or update themselves).
+    """
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        stmt = mysql.insert(table).values(**values)
+        return stmt.on_duplicate_key_update(**update(stmt.inserted))
+    if dialect in ('sqlite', 'postgresql'):
+        stmt = (sqlite if dialect == 'sqlite' else postgresql).insert(table).values(**values)
+        return stmt.on_conflict_do_update(index_elements=[table.c[name] for name in conflict_columns],
+                                          set_=update(stmt.excluded))
+    return None
+
+
+def _login_upsert(values, profile_fields, cutoff):
+    """
+    INSERT of a user that, when auth0_id exists, updates the given profile
+    fields and moves last_login only if it is older than cutoff (None
+    where the database has no upsert)
+    """
+    table = User.__table__
+
+    def update(new):
+        # Only the row with this auth0_id may change, whichever unique key collided
+        same_user = table.c.auth0_id == new.auth0_id
+        fields = {field: case((same_user, new[field]), else_=table.c[field]) for field in profile_fields}
+        fields['last_login'] = case(
+            (same_user & (table.c.last_login.is_(None) | (table.c.last_login < cutoff)), new.last_login),
+            else_=table.c.last_login)
+        return fields
+
+    return _upsert(table, values, ['auth0_id'], update)
+
+
+class Resume(db.Model):
+    """Extracted resume text, stored once per user and content hash and shared by their sessions"""
+    __tablename__ = 'resumes'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'file_hash', name='uq_resumes_user_file_hash'),
+        db.Index('ix_resumes_user_text_hash', 'user_id', 'text_hash'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    file_hash = db.Column(db.String(64))  # sha256 of the uploaded PDF bytes
+    text_hash = db.Column(db.String(64), nullable=False)  # sha256 of the normalized text
+    text = db.Column(db.Text, nullable=False)
+    skills = db.Column(JSON)  # Normalized skills found in the text, computed once at upload
+    skills_extracted_at = db.Column(db.DateTime)
+    parsed = db.Column(JSON)  # Structured profile (see services.resume_parser), computed once at upload
+    parsed_at = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    user = db.relationship('User', backref='resumes')
+    files = db.relationship('ResumeFile', backref='resume', cascade='all, delete-orphan')
+    
+    def __repr__(self):
+        return f'<Resume {self.id}: {self.text_hash[:12]}>'
+
+
+class ResumeFile(db.Model):
+    """Another file (e.g. an export from a different PDF tool) known to hold a resume's text"""
+    __tablename__ = 'resume_files'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'file_hash', name='uq_resume_files_user_file_hash'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    file_hash = db.Column(db.String(64), nullable=False)  # sha256 of the uploaded PDF bytes
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ResumeFile {self.resume_id}: {self.file_hash[:12]}>'
+
+
 class InterviewSession(db.Model):
     __tablename__ = 'interview_sessions'
+    __table_args__ = (
+        # A user's history, newest first, with and without a status filter
+        db.Index('ix_interview_sessions_user_status_created', 'user_id', 'status', 'created_at'),
+        db.Index('ix_interview_sessions_user_created', 'user_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     job_title = db.Column(db.String(200), nullable=False)
     difficulty_level = db.Column(db.Enum('easy', 'medium', 'hard', name='difficulty_levels'), 
                                 default='medium', nullable=False)
-    resume_text_data = db.Column(db.Text, nullable=False)
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), nullable=False, index=True)
     
-    # Questions and Answers - JSON arrays to store questions and answers
-    questions = db.Column(JSON)  # Array of questions
-    answers = db.Column(JSON)    # Array of corresponding answers
+    # Questions as a JSON array; answers are InterviewAnswer rows keyed by question index.
+    # The JSON columns are deferred (group "content"): ownership and status checks don't read them
+    questions = deferred(db.Column(JSON), group='content')  # Array of questions
     
     # Session metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -65,14 +192,32 @@ class InterviewSession(db.Model):
     status = db.Column(db.Enum('setup', 'in_progress', 'completed', name='session_status'), 
                       default='setup', nullable=False)
     
+    # Background preparation progress (see InterviewJob)
+    preparation_status = db.Column(db.Enum('queued', 'running', 'ready', 'failed', name='preparation_status'),
+                                   default='queued', nullable=False)
+    questions_ready = db.Column(db.Boolean, default=False, nullable=False)
+    audio_files = deferred(db.Column(JSON), group='content')  # {question index: audio path}, present once that question's audio is ready
+    
     # Relationships
     user = db.relationship('User', backref='interview_sessions')
+    resume = db.relationship('Resume', backref='interview_sessions')
+    answers = db.relationship('InterviewAnswer', backref='interview_session', lazy='dynamic',
+                              order_by='InterviewAnswer.question_index', cascade='all, delete-orphan')
+    
+    @staticmethod
+    def get_with_content(session_id):
+        """Load a session together with its questions and audio files (one query instead of two)"""
+        return InterviewSession.query.options(undefer_group('content')).get(session_id)
     
-    def __init__(self, **kwargs):
-        super(InterviewSession, self).__init__(**kwargs)
-        # Only initialize answers, leave questions to be set by the application logic
-        if self.answers is None:
-            self.answers = []
+    @staticmethod
+    def owner_id(session_id):
+        """user_id of a session, or None if it doesn't exist; nothing else is loaded"""
+        return db.session.scalar(db.select(InterviewSession.user_id).where(InterviewSession.id == session_id))
+    
+    @property
+    def resume_text_data(self):
+        """Resume text, loaded from the shared Resume row only when accessed"""
+        return self.resume.text if self.resume else None
     
     def add_question(self, question_text):
         """Add a question to the session"""
@@ -83,18 +228,31 @@ class InterviewSession(db.Model):
         db.session.commit()
     
     def add_answer(self, question_index, answer_text):
-        """Add answer for a specific question index"""
-        if not self.answers:
-            self.answers = []
-        
-        # Ensure answers array has enough slots
-        while len(self.answers) <= question_index:
-            self.answers.append(None)
-        
-        self.answers[question_index] = {
-            'answer': answer_text,
-            'answered_at': datetime.utcnow().isoformat()
-        }
+        """Add or replace the answer for a specific question index (one row, safe against concurrent saves)"""
+        self._save_answer(question_index, answer=answer_text)
+    
+    def set_answer_audio(self, question_index, audio_path, content_type, size):
+        """Link an uploaded recording to the answer for a question index, keeping any answer text"""
+        self._save_answer(question_index, audio_path=audio_path, audio_content_type=content_type,
+                          audio_size=size)
+    
+    def _save_answer(self, question_index, **fields):
+        """Upsert the answer row, changing only the given fields"""
+        now = datetime.utcnow()
+        upsert = _upsert(
+            InterviewAnswer.__table__,
+            dict(fields, session_id=self.id, question_index=question_index, created_at=now, updated_at=now),
+            ['session_id', 'question_index'],
+            lambda new: {name: new[name] for name in list(fields) + ['updated_at']})
+        if upsert is not None:
+            db.session.execute(upsert)
+        else:
+            answer = self.answers.filter_by(question_index=question_index).first()
+            if answer is None:
+                answer = InterviewAnswer(session_id=self.id, question_index=question_index, created_at=now)
+                db.session.add(answer)
+            for name, value in dict(fields, updated_at=now).items():
+                setattr(answer, name, value)
         db.session.commit()
     
     def get_question_count(self):
@@ -102,14 +260,147 @@ class InterviewSession(db.Model):
         return len(self.questions) if self.questions else 0
     
     def get_answered_count(self):
-        """Get number of answered questions"""
-        if not self.answers:
-            return 0
-        return len([a for a in self.answers if a is not None])
+        """Get number of answered questions (a COUNT over the session's answer index)"""
+        return db.session.scalar(db.select(func.count()).select_from(InterviewAnswer)
+                                 .where(InterviewAnswer.session_id == self.id))
     
     def __repr__(self):
         return f'<InterviewSession {self.id}: {self.job_title}>'
 
+class InterviewAnswer(db.Model):
+    """A candidate's answer to one question of an interview session"""
+    __tablename__ = 'interview_answers'
+    __table_args__ = (
+        # Also serves the per-session COUNT and ordered reads
+        db.UniqueConstraint('session_id', 'question_index', name='uq_interview_answers_session_question'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('interview_sessions.id'), nullable=False)
+    question_index = db.Column(db.Integer, nullable=False)
+    answer = db.Column(db.Text)
+    audio_path = db.Column(db.String(500))  # Recorded answer, written by the chunked upload
+    audio_content_type = db.Column(db.String(100))
+    audio_size = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # When the answer was last (re)saved
+    
+    def __repr__(self):
+        return f'<InterviewAnswer {self.session_id}#{self.question_index}>'
+
+class InterviewJob(db.Model):
+    """Queued background work for an interview session, processed by `flask interview-worker`"""
+    __tablename__ = 'interview_jobs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('interview_sessions.id'), nullable=False, index=True)
+    kind = db.Column(db.String(50), default='prepare_interview', nullable=False)
+    status = db.Column(db.Enum('queued', 'running', 'done', 'failed', name='job_status'),
+                       default='queued', nullable=False, index=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    not_before = db.Column(db.DateTime)  # A failed job waits until then before its next attempt
+    
+    # Relationships
+    interview_session = db.relationship('InterviewSession', backref='jobs')
+    
+    @staticmethod
+    def enqueue(session_id, kind='prepare_interview'):
+        """Queue a job for the session unless an identical one is already pending"""
+        job = InterviewJob.query.filter(
+            InterviewJob.session_id == session_id,
+            InterviewJob.kind == kind,
+            InterviewJob.status.in_(['queued', 'running'])
+        ).first()
+        
+        if not job:
+            job = InterviewJob(session_id=session_id, kind=kind, status='queued')
+            db.session.add(job)
+            db.session.commit()
+        
+        return job
+    
+    @staticmethod
+    def claim_next():
+        """Atomically move the oldest queued job that is due to running and return it"""
+        while True:
+            job = InterviewJob.query.filter(
+                InterviewJob.status == 'queued',
+                db.or_(InterviewJob.not_before.is_(None), InterviewJob.not_before <= datetime.utcnow())
+            ).order_by(InterviewJob.id).first()
+            if not job:
+                return None
+            if job.claim():
+                return job
+    
+    def claim(self):
+        """Move this job from queued to running; False if another worker got it first"""
+        # Conditional update so two workers can't claim the same job
+        claimed = InterviewJob.query.filter_by(id=self.id, status='queued').update({
+            'status': 'running',
+            'started_at': datetime.utcnow(),
+            'attempts': InterviewJob.attempts + 1
+        }, synchronize_session=False)
+        db.session.commit()
+        
+        if claimed:
+            db.session.refresh(self)
+        return bool(claimed)
+    
+    @staticmethod
+    def requeue_stale(max_age_seconds):
+        """Return jobs left running by a crashed worker to the queue"""
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+        count = InterviewJob.query.filter(
+            InterviewJob.status == 'running',
+            InterviewJob.started_at < cutoff
+        ).update({'status': 'queued'}, synchronize_session=False)
+        db.session.commit()
+        return count
+    
+    def __repr__(self):
+        return f'<InterviewJob {self.id}: {self.kind} ({self.status})>'
+
+class QuestionCacheEntry(db.Model):
+    """Generated interview questions memoized by a hash of everything that shaped the prompt"""
+    __tablename__ = 'question_cache'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    model = db.Column(db.String(100))
+    prompt_version = db.Column(db.String(50))
+    questions = db.Column(JSON, nullable=False)
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_hit_at = db.Column(db.DateTime)
+    expires_at = db.Column(db.DateTime, index=True)
+    
+    @staticmethod
+    def purge_expired():
+        """Delete entries past their TTL"""
+        count = QuestionCacheEntry.query.filter(
+            QuestionCacheEntry.expires_at < datetime.utcnow()
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return count
+    
+    def __repr__(self):
+        return f'<QuestionCacheEntry {self.cache_key[:12]}>'
+
+class ServerSession(db.Model):
+    """Flask session data kept server-side; the cookie only carries the session ID"""
+    __tablename__ = 'server_sessions'
+    
+    id = db.Column(db.String(64), primary_key=True)  # sha256 of the session ID, never the ID itself
+    data = db.Column(db.Text, nullable=False)  # Flask's tagged JSON
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ServerSession {self.id[:12]}>'
+
 class JobPosting(db.Model):
     __tablename__ = 'job_postings'
     
@@ -0,0 +1,243 @@
+# app/services/answer_uploads.py - Chunked, resumable uploads of recorded interview answers
+import fcntl
+import hashlib
+import json
+import os
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from flask import current_app
+
+# Recording formats accepted from browsers (MediaRecorder) -> stored file extension
+AUDIO_EXTENSIONS = {
+    'audio/webm': 'webm',
+    'audio/ogg': 'ogg',
+    'audio/wav': 'wav',
+    'audio/x-wav': 'wav',
+    'audio/mp4': 'm4a',
+    'audio/mpeg': 'mp3',
+}
+
+UPLOAD_ID_RE = re.compile(r'^[A-Za-z0-9_-]{22}$')
+
+# Request body is copied to disk in pieces of this size, never whole
+COPY_BUFFER_BYTES = 64 * 1024
+
+
+class UploadConflict(ValueError):
+    """A chunk was sent for an offset other than the next one expected"""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(message)
+        self.offset = offset
+
+
+class AnswerUploads:
+    """
+    Resumable uploads of answer audio into per-session storage
+
+    An upload is created for a session, question index, total size and
+    content type, then filled with fixed-size chunks (the last may be
+    shorter), each sent for the offset the upload has reached and
+    checked against its SHA-256 before it counts. Chunks stream from the
+    request to ``<root>/.uploads/<id>.part``; the committed offset lives
+    in ``<id>.json`` and anything past it (a chunk cut off by a
+    disconnect) is truncated away, so a client resumes by asking for the
+    offset and sending from there. The complete file is moved to
+    ``<root>/session_<id>/answer_<index>.<ext>``. Unfinished uploads are
+    removed after ANSWER_UPLOAD_EXPIRY_SECONDS.
+    """
+
+    def __init__(self, app=None):
+        self.root = None
+        self.chunk_bytes = 0
+        self.max_bytes = 0
+        self.expiry_seconds = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = os.path.abspath(app.config.get('ANSWER_AUDIO_DIR', 'answer_audio'))
+        self.chunk_bytes = app.config.get('ANSWER_UPLOAD_CHUNK_BYTES', 1024 * 1024)
+        self.max_bytes = app.config.get('ANSWER_AUDIO_MAX_BYTES', 50 * 1024 * 1024)
+        self.expiry_seconds = app.config.get('ANSWER_UPLOAD_EXPIRY_SECONDS', 24 * 3600)
+        os.makedirs(self._pending_dir(), exist_ok=True)
+        app.extensions['answer_uploads'] = self
+
+    def _pending_dir(self) -> str:
+        return os.path.join(self.root, '.uploads')
+
+    def _paths(self, upload_id: str):
+        if not UPLOAD_ID_RE.match(upload_id or ''):
+            raise LookupError('Unknown upload')
+        base = os.path.join(self._pending_dir(), upload_id)
+        return base + '.json', base + '.part'
+
+    def _read_meta(self, meta_path: str) -> Dict:
+        try:
+            with open(meta_path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise LookupError('Unknown upload') from None
+
+    def _write_meta(self, meta_path: str, meta: Dict):
+        tmp_path = f'{meta_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, meta_path)
+
+    @contextmanager
+    def _locked(self, part_path: str):
+        """Exclusive hold on an upload across threads and worker processes"""
+        try:
+            part = open(part_path, 'r+b')
+        except FileNotFoundError:
+            raise LookupError('Unknown upload') from None
+        with part:
+            fcntl.flock(part, fcntl.LOCK_EX)
+            try:
+                yield part
+            finally:
+                fcntl.flock(part, fcntl.LOCK_UN)
+
+    def create(self, user_id: int, session_id: int, question_index: int, size: int, content_type: str) -> Dict:
+        """Start an upload; returns its status (see status())"""
+        content_type = (content_type or '').split(';')[0].strip().lower()
+        if content_type not in AUDIO_EXTENSIONS:
+            raise ValueError(f"Unsupported audio type {content_type or '(none)'}")
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError('size must be a positive integer')
+        if size > self.max_bytes:
+            raise ValueError(f"Recording is larger than {self.max_bytes / (1024 * 1024):.1f} MB")
+
+        self.sweep()
+        upload_id = secrets.token_urlsafe(16)
+        meta_path, part_path = self._paths(upload_id)
+        open(part_path, 'wb').close()
+        meta = {
+            'user_id': user_id,
+            'session_id': session_id,
+            'question_index': question_index,
+            'size': size,
+            'chunk_size': self.chunk_bytes,
+            'content_type': content_type,
+            'offset': 0,
+            'created_at': time.time(),
+        }
+        self._write_meta(meta_path, meta)
+        return self._status(upload_id, meta)
+
+    def _status(self, upload_id: str, meta: Dict) -> Dict:
+        return {
+            'upload_id': upload_id,
+            'session_id': meta['session_id'],
+            'question_index': meta['question_index'],
+            'size': meta['size'],
+            'chunk_size': meta['chunk_size'],
+            'offset': meta['offset'],
+            'complete': meta['offset'] >= meta['size'],
+        }
+
+    def status(self, upload_id: str, user_id: int) -> Dict:
+        """Where an upload stands: the next offset to send, and whether it is complete"""
+        meta_path, _ = self._paths(upload_id)
+        meta = self._read_meta(meta_path)
+        if meta['user_id'] != user_id:
+            raise LookupError('Unknown upload')
+        return self._status(upload_id, meta)
+
+    def write_chunk(self, upload_id: str, user_id: int, offset: int, stream, checksum: str,
+                    on_complete=None) -> Dict:
+        """
+        Append the chunk read from stream at offset
+
+        Args:
+            checksum: Hex SHA-256 of the chunk
+            on_complete: Called with (meta, final path) once the last chunk is in;
+                if it raises, the last chunk is undone and can be sent again
+
+        Raises:
+            LookupError: Unknown (or another user's) upload
+            UploadConflict: offset isn't the upload's current offset
+            ValueError: Wrong chunk length or checksum; nothing is kept
+        """
+        meta_path, part_path = self._paths(upload_id)
+        with self._locked(part_path) as part:
+            meta = self._read_meta(meta_path)
+            if meta['user_id'] != user_id:
+                raise LookupError('Unknown upload')
+            if offset != meta['offset']:
+                raise UploadConflict(f"Expected offset {meta['offset']}", meta['offset'])
+            expected = min(meta['chunk_size'], meta['size'] - offset)
+            if expected <= 0:
+                raise UploadConflict('Upload is already complete', meta['offset'])
+
+            # Drop whatever an interrupted chunk left past the committed offset
+            part.truncate(offset)
+            part.seek(offset)
+            digest = hashlib.sha256()
+            received = 0
+            while received <= expected:
+                block = stream.read(min(COPY_BUFFER_BYTES, expected + 1 - received))
+                if not block:
+                    break
+                digest.update(block)
+                part.write(block)
+                received += len(block)
+
+            if received != expected:
+                part.truncate(offset)
+                raise ValueError(f"Chunk at offset {offset} must be {expected} bytes, got "
+                                 f"{received if received <= expected else 'more'}")
+            if not secrets.compare_digest(digest.hexdigest(), (checksum or '').lower()):
+                part.truncate(offset)
+                raise ValueError(f"Checksum mismatch for chunk at offset {offset}")
+
+            part.flush()
+            os.fsync(part.fileno())
+            meta['offset'] = offset + received
+            if meta['offset'] < meta['size']:
+                self._write_meta(meta_path, meta)
+                return self._status(upload_id, meta)
+
+            path = self._final_path(meta)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(part_path, path)
+            if on_complete is not None:
+                try:
+                    on_complete(meta, path)
+                except Exception:
+                    # Put the data back so the last chunk can be sent again
+                    os.replace(path, part_path)
+                    part.truncate(offset)
+                    raise
+            os.remove(meta_path)
+        status = self._status(upload_id, meta)
+        status['path'] = path
+        return status
+
+    def _final_path(self, meta: Dict) -> str:
+        extension = AUDIO_EXTENSIONS[meta['content_type']]
+        return os.path.join(self.root, f"session_{meta['session_id']}",
+                            f"answer_{meta['question_index']}.{extension}")
+
+    def sweep(self) -> int:
+        """Remove uploads left unfinished for longer than the expiry; returns how many"""
+        cutoff = time.time() - self.expiry_seconds
+        removed = 0
+        for filename in os.listdir(self._pending_dir()):
+            path = os.path.join(self._pending_dir(), filename)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += filename.endswith('.json')
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+def get_answer_uploads() -> Optional[AnswerUploads]:
+    """Return the answer upload store registered on the current app, if any"""
+    return current_app.extensions.get('answer_uploads')
@@ -0,0 +1,263 @@
+# app/services/audio_cache.py - Content-addressed cache for synthesized speech
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+from flask import current_app
+from app.services.tts import wave_file
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different spellings share a cache entry"""
+    return ' '.join(unicodedata.normalize('NFC', text or '').split())
+
+
+class AudioCache:
+    """
+    Shared on-disk store of WAV files keyed by a hash of what was synthesized
+
+    Entries live in ``<root>/<key[:2]>/<key>.wav`` and are evicted least
+    recently used first once the store exceeds ``max_bytes`` or
+    ``max_entries``. When the app has an AudioEncoder, each entry also gets
+    a compressed variant beside its WAV, which is linked and evicted with
+    it and counted in its size. Recently used files are also kept in a small in-memory
+    hot tier so repeated reads don't touch the disk. Session directories get
+    hard links into the store rather than copies.
+    """
+
+    def __init__(self, app=None):
+        self.root = None
+        self.max_bytes = 0
+        self.max_entries = 0
+        self.memory_max_bytes = 0
+        self._entries = OrderedDict()  # key -> size on disk, oldest first
+        self._total_bytes = 0
+        self._memory = OrderedDict()  # key -> wav bytes, oldest first
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.encoder = None
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = os.path.abspath(app.config.get('AUDIO_CACHE_DIR', 'audio_cache'))
+        self.max_bytes = app.config.get('AUDIO_CACHE_MAX_BYTES', 512 * 1024 * 1024)
+        self.max_entries = app.config.get('AUDIO_CACHE_MAX_ENTRIES', 10000)
+        self.memory_max_bytes = app.config.get('AUDIO_CACHE_MEMORY_BYTES', 16 * 1024 * 1024)
+        self.encoder = app.extensions.get('audio_encoder')
+        os.makedirs(self.root, exist_ok=True)
+        self._load_index()
+        app.extensions['audio_cache'] = self
+
+    def _load_index(self):
+        """Rebuild the LRU order from files already on disk (least recently accessed first)"""
+        found = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                if not filename.endswith('.wav'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(dirpath, filename))
+                except OSError:
+                    continue
+                found.append((stat.st_atime, filename[:-4], stat.st_size + self._variant_size(filename[:-4])))
+
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            for _, key, size in sorted(found):
+                self._entries[key] = size
+                self._total_bytes += size
+
+    @staticmethod
+    def make_key(text: str, voice: str, prompt: str, model: str) -> str:
+        """Hash of (normalized text, voice, prompt style, model)"""
+        material = '\x1f'.join([normalize_text(text), voice or '', prompt or '', model or ''])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f'{key}.wav')
+
+    def _variant_path(self, key: str) -> Optional[str]:
+        return self.encoder.variant_path(self._path(key)) if self.encoder else None
+
+    def _variant_size(self, key: str) -> int:
+        variant = self._variant_path(key)
+        try:
+            return os.path.getsize(variant) if variant else 0
+        except OSError:
+            return 0
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Return the stored WAV path for key, or None on a miss"""
+        return self._lookup(key, record=True)
+
+    def peek(self, key: str) -> Optional[str]:
+        """Return the stored WAV path for key without counting a hit or refreshing its LRU position"""
+        path = self._path(key)
+        return path if os.path.exists(path) else None
+
+    def _lookup(self, key: str, record: bool) -> Optional[str]:
+        path = self._path(key)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+            if not os.path.exists(path):
+                self._forget(key)
+                if record:
+                    self.misses += 1
+                return None
+            if key not in self._entries:
+                # Written by another worker process
+                size = os.path.getsize(path) + self._variant_size(key)
+                self._entries[key] = size
+                self._total_bytes += size
+            self._entries.move_to_end(key)
+            if record:
+                self.hits += 1
+
+        try:
+            # atime is the LRU clock shared between worker processes; mtime stays
+            # the content's, which AudioDelivery keys digests and Last-Modified on
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored WAV bytes for key, or None on a miss"""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key: str, pcm: bytes) -> str:
+        """Store PCM audio as a WAV file under key and return its path"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            wave_file(tmp_path, pcm)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.encoder is not None:
+            self.encoder.encode(path)
+
+        size = os.path.getsize(path) + self._variant_size(key)
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    def link_into(self, key: str, dest_path: str) -> Optional[str]:
+        """
+        Make dest_path reference the cached entry for key
+
+        Uses a hard link so the session copy survives eviction from the
+        store, falling back to a plain copy across filesystems. The
+        compressed variant, if any, is linked beside dest_path too.
+        """
+        src_path = self._lookup(key, record=False)
+        if src_path is None:
+            return None
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        _link(src_path, dest_path)
+        variant = self._variant_path(key)
+        if variant and os.path.exists(variant):
+            _link(variant, self.encoder.variant_path(dest_path))
+        return dest_path
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.memory_hits + self.misses
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits + self.memory_hits) / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+            }
+
+    def _remember(self, key: str, data: bytes):
+        """Keep data in the hot tier, evicting the least recently used entries"""
+        if len(data) > self.memory_max_bytes:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_max_bytes and self._memory:
+                _, old = self._memory.popitem(last=False)
+                self._memory_bytes -= len(old)
+
+    def _forget(self, key: str):
+        """Drop key from both tiers; caller holds the lock"""
+        self._total_bytes -= self._entries.pop(key, 0)
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+
+    def _evict(self):
+        """Remove least recently used files until within bounds; caller holds the lock"""
+        while self._entries and (self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            key = next(iter(self._entries))
+            self._forget(key)
+            for path in (self._path(key), self._variant_path(key)):
+                try:
+                    if path:
+                        os.remove(path)
+                except OSError:
+                    pass
+            self.evictions += 1
+
+
+def _link(src_path: str, dest_path: str):
+    """Hard link src_path at dest_path, replacing it; copies across filesystems"""
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+    try:
+        os.link(src_path, dest_path)
+    except OSError:
+        shutil.copyfile(src_path, dest_path)
+
+
+def get_audio_cache() -> Optional[AudioCache]:
+    """Return the cache registered on the current app, if any"""
+    return current_app.extensions.get('audio_cache')
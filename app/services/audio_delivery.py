@@ -0,0 +1,156 @@
+# app/services/audio_delivery.py - Cacheable responses for stored audio files
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import quote
+from flask import current_app, request, send_file
+
+SENDFILE_MODES = ('x-sendfile', 'x-accel-redirect')
+
+# Content digests remembered per worker, keyed by file identity
+DIGEST_CACHE_ENTRIES = 4096
+
+# Length of the content hash put in URLs
+VERSION_LENGTH = 16
+
+
+class AudioDelivery:
+    """
+    Sends audio files with strong validators and long-lived caching
+
+    Every response carries an ETag that is the SHA-256 of the bytes
+    served (so the WAV and its compressed variant differ), answers
+    If-None-Match with 304 and Range with 206. URLs built with version()
+    carry a content hash (``?v=``); a request whose hash matches the
+    file is marked ``private, max-age=AUDIO_MAX_AGE, immutable`` so
+    replaying or seeking never goes back to the server, while anything
+    else (no hash, or one for older content) must revalidate.
+
+    Digests are computed once per worker and file: entries are keyed by
+    device, inode, size and mtime, so rewritten files are hashed again
+    and hard-linked copies share one entry.
+
+    With AUDIO_SENDFILE set to ``x-sendfile`` (Apache mod_xsendfile,
+    lighttpd) or ``x-accel-redirect`` (nginx), the worker only checks
+    access and validators and hands the file to the reverse proxy, which
+    streams it and handles ranges. For nginx, files under
+    AUDIO_ACCEL_REDIRECT_ROOT are redirected to AUDIO_ACCEL_REDIRECT_PREFIX
+    plus their relative path, which must be an ``internal`` location
+    aliasing that directory.
+    """
+
+    def __init__(self, app=None):
+        self.max_age = 0
+        self.sendfile = None
+        self.accel_root = None
+        self.accel_prefix = None
+        self._digests = OrderedDict()  # (dev, ino, size, mtime_ns) -> hex digest, oldest first
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_age = app.config.get('AUDIO_MAX_AGE', 365 * 24 * 3600)
+        self.sendfile = (app.config.get('AUDIO_SENDFILE') or '').lower() or None
+        if self.sendfile and self.sendfile not in SENDFILE_MODES:
+            raise ValueError(f"Unknown AUDIO_SENDFILE {self.sendfile!r}; use one of {', '.join(SENDFILE_MODES)}")
+        self.accel_root = os.path.abspath(app.config.get('AUDIO_ACCEL_REDIRECT_ROOT') or os.getcwd())
+        self.accel_prefix = '/' + (app.config.get('AUDIO_ACCEL_REDIRECT_PREFIX') or '/protected-audio/').strip('/') + '/'
+        app.extensions['audio_delivery'] = self
+
+    def digest(self, path: str, stat: Optional[os.stat_result] = None) -> Optional[str]:
+        """Hex SHA-256 of the file's contents, or None if it doesn't exist"""
+        try:
+            stat = stat or os.stat(path)
+        except OSError:
+            return None
+        identity = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            value = self._digests.get(identity)
+            if value is not None:
+                self._digests.move_to_end(identity)
+                return value
+
+        digest = hashlib.sha256()
+        try:
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        except OSError:
+            return None
+        value = digest.hexdigest()
+
+        with self._lock:
+            self._digests[identity] = value
+            while len(self._digests) > DIGEST_CACHE_ENTRIES:
+                self._digests.popitem(last=False)
+        return value
+
+    def version(self, path: str) -> Optional[str]:
+        """Content hash to put in the file's URL, or None if it doesn't exist"""
+        value = self.digest(path)
+        return value[:VERSION_LENGTH] if value else None
+
+    def send(self, path: str, mimetype: str, version: Optional[str] = None, versioned_path: Optional[str] = None):
+        """
+        Response for path, or None if the file doesn't exist
+
+        Args:
+            version: The ``v`` the client asked with; the response is cacheable
+                for good only if it matches the current content
+            versioned_path: The file version refers to, when path is derived from
+                it (a compressed variant served in place of its WAV); defaults to path
+
+        Raises:
+            RequestedRangeNotSatisfiable: Range lies outside the file
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        etag = self.digest(path, stat)
+        if etag is None:
+            return None
+        immutable = bool(version) and version == self.version(versioned_path or path)
+
+        redirect_to = self._redirect_target(path)
+        if redirect_to is None:
+            response = send_file(path, mimetype=mimetype, etag=etag, last_modified=stat.st_mtime,
+                                 conditional=True)
+        else:
+            # The proxy sends the body and serves ranges; only validators are checked here
+            response = current_app.response_class(mimetype=mimetype)
+            response.set_etag(etag)
+            response.last_modified = stat.st_mtime
+            response.headers['Accept-Ranges'] = 'bytes'
+            response = response.make_conditional(request)
+            if response.status_code != 304:
+                response.headers[redirect_to[0]] = redirect_to[1]
+
+        response.cache_control.no_cache = None if immutable else True
+        response.cache_control.public = False
+        response.cache_control.private = True
+        response.cache_control.max_age = self.max_age if immutable else 0
+        response.cache_control.immutable = immutable or None
+        response.expires = None
+        return response
+
+    def _redirect_target(self, path: str):
+        """(header, value) handing path to the reverse proxy, or None to send it from here"""
+        if self.sendfile == 'x-sendfile':
+            return 'X-Sendfile', os.path.abspath(path)
+        if self.sendfile == 'x-accel-redirect':
+            path = os.path.abspath(path)
+            if os.path.commonpath([self.accel_root, path]) != self.accel_root:
+                current_app.logger.warning(f"{path} is outside AUDIO_ACCEL_REDIRECT_ROOT; sending it directly")
+                return None
+            relative = os.path.relpath(path, self.accel_root).replace(os.sep, '/')
+            return 'X-Accel-Redirect', self.accel_prefix + quote(relative)
+        return None
+
+
+def get_audio_delivery() -> Optional[AudioDelivery]:
+    """Return the audio delivery registered on the current app, if any"""
+    return current_app.extensions.get('audio_delivery')
@@ -0,0 +1,107 @@
+# app/services/audio_encoding.py - Compressed variants of synthesized WAV audio
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional, Tuple
+from flask import current_app
+
+# Variant formats: name -> (file extension, MIME type, ffmpeg output arguments)
+VARIANT_FORMATS = {
+    'opus': ('.opus', 'audio/ogg; codecs=opus', ['-c:a', 'libopus', '-application', 'voip', '-f', 'ogg']),
+}
+
+
+class AudioEncoder:
+    """
+    Writes a compressed copy next to each WAV file, using ffmpeg
+
+    TTS output is 24 kHz 16-bit mono PCM, about 48 KB per second of
+    speech; Opus at AUDIO_VARIANT_BITRATE (24 kbit/s by default) is about
+    3 KB per second at speech quality. The variant shares the WAV's path
+    with another extension, so whatever links or removes the WAV can do
+    the same for the variant. Without ffmpeg (FFMPEG_PATH, else found on
+    PATH) or with AUDIO_VARIANT_FORMAT empty, no variants are made and
+    WAV is served as before.
+
+    encode() runs ffmpeg synchronously, in whichever thread stored the
+    WAV: the preparation job for question audio, the request itself for
+    chat speech (a few hundred milliseconds for a reply, capped by
+    AUDIO_ENCODE_TIMEOUT). A failed or timed-out encode only means the
+    WAV is served.
+    """
+
+    def __init__(self, app=None):
+        self.format = None
+        self.bitrate = 24000
+        self.ffmpeg = None
+        self.timeout = 30
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.format = app.config.get('AUDIO_VARIANT_FORMAT', 'opus') or None
+        if self.format and self.format not in VARIANT_FORMATS:
+            raise ValueError(f"Unknown AUDIO_VARIANT_FORMAT {self.format!r}")
+        self.bitrate = app.config.get('AUDIO_VARIANT_BITRATE', 24000)
+        self.ffmpeg = app.config.get('FFMPEG_PATH') or shutil.which('ffmpeg')
+        self.timeout = app.config.get('AUDIO_ENCODE_TIMEOUT', 30)
+        if self.format and not self.ffmpeg:
+            app.logger.warning('ffmpeg not found: audio is served as WAV only')
+        app.extensions['audio_encoder'] = self
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.format and self.ffmpeg)
+
+    def variant_path(self, wav_path: str) -> Optional[str]:
+        """Where the compressed copy of wav_path lives (whether or not it exists yet)"""
+        if not self.format:
+            return None
+        return os.path.splitext(wav_path)[0] + VARIANT_FORMATS[self.format][0]
+
+    def encode(self, wav_path: str) -> Optional[str]:
+        """Write the variant of wav_path and return its path; None if disabled or encoding failed"""
+        if not self.enabled:
+            return None
+        path = self.variant_path(wav_path)
+        extension, _, output_args = VARIANT_FORMATS[self.format]
+
+        # Write then rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(suffix=extension + '.tmp', dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            subprocess.run([self.ffmpeg, '-nostdin', '-loglevel', 'error', '-y', '-i', wav_path,
+                            *output_args, '-b:a', str(self.bitrate), tmp_path],
+                           check=True, capture_output=True, timeout=self.timeout)
+            os.replace(tmp_path, path)
+            return path
+        except (OSError, subprocess.SubprocessError) as e:
+            stderr = getattr(e, 'stderr', None)
+            current_app.logger.warning(f"Could not encode {wav_path}: "
+                                       f"{stderr.decode(errors='replace').strip() if stderr else str(e)}")
+            return None
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def choose(self, wav_path: str, requested: Optional[str], accept) -> Tuple[str, str]:
+        """
+        (path, MIME type) to serve for wav_path
+
+        The variant is served when it exists and the client asked for it,
+        either with ?format=<name> or by listing its MIME type explicitly
+        in Accept (a bare */* doesn't count: not every browser plays Opus).
+        """
+        variant = self.variant_path(wav_path) if self.format else None
+        if variant and os.path.exists(variant):
+            mimetype = VARIANT_FORMATS[self.format][1]
+            explicit = any(value == mimetype.split(';')[0] and quality > 0 for value, quality in accept)
+            if requested == self.format or (requested is None and explicit):
+                return variant, mimetype
+        return wav_path, 'audio/wav'
+
+
+def get_audio_encoder() -> Optional[AudioEncoder]:
+    """Return the encoder registered on the current app, if any"""
+    return current_app.extensions.get('audio_encoder')
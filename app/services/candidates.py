@@ -0,0 +1,121 @@
+# app/services/candidates.py - Reverse matching: rank stored resumes against a job posting
+import base64
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from flask import current_app
+from app.services.matching import SkillIndex, get_job_matcher
+
+
+def extract_resume_skills(text: str) -> List[str]:
+    """
+    Skills mentioned in resume text
+
+    Matched against the skill taxonomy plus every skill the job postings
+    list, so resumes are described in the postings' vocabulary.
+    """
+    return get_job_matcher().skill_matcher().find(text)
+
+
+def ensure_resume_skills(resume, force: bool = False) -> bool:
+    """Store the resume's skills if they haven't been extracted yet; True if they were (re)computed"""
+    if resume.skills_extracted_at is not None and not force:
+        return False
+    resume.skills = extract_resume_skills(resume.text)
+    resume.skills_extracted_at = datetime.utcnow()
+    return True
+
+
+def encode_cursor(score: float, resume_id: int) -> str:
+    return base64.urlsafe_b64encode(f'{score!r}:{resume_id}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        score, resume_id = raw.split(':')
+        return float(score), int(resume_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+
+class CandidateMatcher:
+    """
+    Per-process SkillIndex over the stored skills of each user's latest resume
+
+    Only the precomputed ``Resume.skills`` lists are loaded, so ranking
+    never re-parses resume text. Resumes uploaded through this process are
+    added as they are stored; others appear once the index is older than
+    JOB_MATCH_REFRESH_SECONDS.
+    """
+
+    def __init__(self, app=None):
+        self.refresh_seconds = 1800
+        self._index = None
+        self._user_resume = {}  # user id -> indexed resume id
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get('JOB_MATCH_REFRESH_SECONDS', 1800)
+        app.extensions['candidate_matcher'] = self
+
+    def index(self) -> SkillIndex:
+        """Return the current index, building it when missing or due for a refresh"""
+        index = self._index
+        if index is not None and time.time() - index.built_at < self.refresh_seconds:
+            return index
+
+        with self._lock:
+            index = self._index
+            if index is None or time.time() - index.built_at >= self.refresh_seconds:
+                started = time.perf_counter()
+                latest = self._load_latest_resumes()
+                index = SkillIndex.build((resume_id, skills) for resume_id, skills in latest.values())
+                self._user_resume = {user_id: resume_id for user_id, (resume_id, _) in latest.items()}
+                self._index = index
+                current_app.logger.info(f"Built candidate index: {len(index)} resumes in "
+                                        f"{(time.perf_counter() - started) * 1000:.0f}ms")
+            return index
+
+    @staticmethod
+    def _load_latest_resumes() -> Dict[int, Tuple[int, List[str]]]:
+        """user id -> (resume id, skills) of their newest resume with extracted skills"""
+        # Imported here: the app package imports this module while it is being set up
+        from app import db
+        from app.models import Resume
+
+        rows = db.session.query(Resume.id, Resume.user_id, Resume.skills) \
+            .filter(Resume.skills_extracted_at.isnot(None)) \
+            .order_by(Resume.user_id, Resume.created_at, Resume.id)
+        latest = {}
+        for resume_id, user_id, skills in rows.yield_per(1000):
+            latest[user_id] = (resume_id, skills or [])
+        return latest
+
+    def add(self, resume):
+        """Index a stored resume as its user's current one"""
+        index = self._index
+        if index is None or resume.skills_extracted_at is None:
+            return
+        previous = self._user_resume.get(resume.user_id)
+        if previous is not None and previous > resume.id:
+            # An older resume re-uploaded; the newer one stays current
+            return
+        if previous is not None and previous != resume.id:
+            index.remove(previous)
+        index.add(resume.id, resume.skills or [])
+        self._user_resume[resume.user_id] = resume.id
+
+    def rank(self, skills: Sequence[str], limit: int = 20,
+             after: Optional[Tuple[float, int]] = None) -> List[Dict]:
+        """Resumes ranked by coverage of skills; see SkillIndex.top_k_for_query"""
+        return self.index().top_k_for_query(skills, limit, after)
+
+
+def get_candidate_matcher() -> CandidateMatcher:
+    """Return the candidate matcher registered on the current app"""
+    return current_app.extensions['candidate_matcher']
@@ -0,0 +1,132 @@
+# app/services/clients.py - Process-wide Gemini client registry
+import os
+import threading
+from typing import Dict
+import httpx
+import google.generativeai as genai
+from flask import current_app
+from google import genai as genai_client
+from google.genai import types
+
+
+class GeminiClients:
+    """
+    Shared Gemini text models and TTS client for the current process
+
+    Clients are built lazily on first use and reused for every request, so
+    the underlying HTTP/gRPC connections stay alive between calls. Built
+    clients are tied to the process that created them and rebuilt after a
+    fork (e.g. gunicorn --preload), since sockets must not be shared across
+    workers.
+    """
+
+    def __init__(self, app=None):
+        self.api_key = None
+        self.pool_size = 10
+        self.keepalive_expiry = 60.0
+        self._pid = None
+        self._text_models = {}
+        self._tts_client = None
+        self._lock = threading.Lock()
+        self._counters = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.api_key = app.config.get('GEMINI_API_KEY')
+        self.pool_size = app.config.get('GEMINI_HTTP_POOL_SIZE', 10)
+        self.keepalive_expiry = app.config.get('GEMINI_HTTP_KEEPALIVE', 60.0)
+        self._reset()
+        app.extensions['gemini_clients'] = self
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        """Drop clients built by another process; the next call rebuilds them"""
+        self._pid = os.getpid()
+        self._text_models = {}
+        self._tts_client = None
+        self._lock = threading.Lock()
+        self._counters = {
+            'text_checkouts': 0,
+            'text_clients_created': 0,
+            'tts_checkouts': 0,
+            'tts_clients_created': 0,
+            'http_requests': 0,
+            'connections_opened': 0,
+        }
+
+    def _ensure_process(self):
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _require_api_key(self):
+        if not self.api_key:
+            raise ValueError("GEMINI_API_KEY environment variable is required")
+
+    def text_model(self, model_name: str = 'gemini-2.0-flash') -> genai.GenerativeModel:
+        """Return the shared GenerativeModel for model_name"""
+        self._require_api_key()
+        self._ensure_process()
+        with self._lock:
+            self._counters['text_checkouts'] += 1
+            model = self._text_models.get(model_name)
+            if model is None:
+                if not self._text_models:
+                    # Configures the process-wide transport the models share
+                    genai.configure(api_key=self.api_key)
+                model = genai.GenerativeModel(model_name)
+                self._text_models[model_name] = model
+                self._counters['text_clients_created'] += 1
+            return model
+
+    def tts_client(self) -> genai_client.Client:
+        """Return the shared google-genai client used for TTS"""
+        self._require_api_key()
+        self._ensure_process()
+        with self._lock:
+            self._counters['tts_checkouts'] += 1
+            if self._tts_client is None:
+                self._tts_client = genai_client.Client(
+                    api_key=self.api_key,
+                    http_options=types.HttpOptions(client_args={
+                        'limits': httpx.Limits(
+                            max_connections=self.pool_size,
+                            max_keepalive_connections=self.pool_size,
+                            keepalive_expiry=self.keepalive_expiry,
+                        ),
+                        'event_hooks': {'request': [self._on_request]},
+                    }),
+                )
+                self._counters['tts_clients_created'] += 1
+            return self._tts_client
+
+    def _on_request(self, request):
+        """httpx request hook: count requests and trace new TCP connections"""
+        with self._lock:
+            self._counters['http_requests'] += 1
+        request.extensions['trace'] = self._on_trace
+
+    def _on_trace(self, event_name, info):
+        if event_name == 'connection.connect_tcp.started':
+            with self._lock:
+                self._counters['connections_opened'] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Client and connection reuse counters for this process"""
+        self._ensure_process()
+        with self._lock:
+            stats = dict(self._counters)
+        checkouts = stats['text_checkouts'] + stats['tts_checkouts']
+        created = stats['text_clients_created'] + stats['tts_clients_created']
+        requests = stats['http_requests']
+        stats['pid'] = self._pid
+        stats['pool_size'] = self.pool_size
+        stats['client_reuse_rate'] = 1 - created / checkouts if checkouts else 0.0
+        stats['connection_reuse_rate'] = (1 - stats['connections_opened'] / requests) if requests else 0.0
+        return stats
+
+
+def get_gemini_clients() -> GeminiClients:
+    """Return the client registry of the current app"""
+    return current_app.extensions['gemini_clients']
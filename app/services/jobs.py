@@ -0,0 +1,133 @@
+# app/services/jobs.py - Background preparation of interview sessions
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from app import db
+from app.models import InterviewSession, InterviewJob, QuestionCacheEntry
+
+
+def enqueue_preparation(interview_session: InterviewSession, kind: str = 'prepare_interview') -> InterviewJob:
+    """
+    Queue question and audio generation for a session
+
+    kind 'regenerate_questions' asks Gemini for new questions even when
+    the question cache has some for this resume and role. With
+    INTERVIEW_JOBS_INLINE set (handy for local development without a
+    worker) the job runs immediately in the calling request instead.
+    """
+    interview_session.preparation_status = 'queued'
+    db.session.commit()
+
+    job = InterviewJob.enqueue(interview_session.id, kind)
+
+    if current_app.config.get('INTERVIEW_JOBS_INLINE') and job.status == 'queued' and job.claim():
+        run_job(job)
+
+    return job
+
+
+def prepare_interview(interview_session: InterviewSession, force_fresh: bool = False):
+    """Generate questions, then audio, publishing each stage on the session as it completes"""
+    # Imported here: the interview blueprint imports this module
+    from app.main.routes import prepare_questions, generate_audio_for_questions
+
+    if force_fresh or not interview_session.questions_ready or not interview_session.questions:
+        prepare_questions(interview_session, force_fresh=force_fresh)
+
+    interview_session.audio_files = {}
+    db.session.commit()
+
+    def publish_audio(index, path):
+        # Reassign so the JSON column is flagged as modified
+        interview_session.audio_files = {**(interview_session.audio_files or {}), index: path}
+        db.session.commit()
+
+    return generate_audio_for_questions(interview_session.id, interview_session.questions,
+                                        on_audio_ready=publish_audio)
+
+
+def run_job(job: InterviewJob) -> bool:
+    """Run a claimed job, recording success or failure on the job and its session"""
+    interview_session = InterviewSession.get_with_content(job.session_id)
+    if not interview_session:
+        job.status = 'failed'
+        job.error = f'Interview session {job.session_id} not found'
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return False
+
+    try:
+        interview_session.preparation_status = 'running'
+        db.session.commit()
+
+        audio_files = prepare_interview(interview_session, force_fresh=job.kind == 'regenerate_questions')
+
+        interview_session.preparation_status = 'ready'
+        job.status = 'done'
+        job.error = None
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+        current_app.logger.info(f"Prepared session {job.session_id}: "
+                                f"{len(audio_files)}/{len(interview_session.questions)} audio files")
+        return True
+
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error running job {job.id} for session {job.session_id}: {str(e)}")
+
+        # Retry until the attempt budget is spent, backing off so an outage isn't
+        # burnt through in seconds
+        max_attempts = current_app.config.get('INTERVIEW_JOB_MAX_ATTEMPTS', 3)
+        job.status = 'queued' if job.attempts < max_attempts else 'failed'
+        job.error = str(e)
+        job.finished_at = datetime.utcnow()
+        if job.status == 'queued':
+            job.not_before = job.finished_at + timedelta(seconds=retry_delay(job.attempts))
+        interview_session.preparation_status = 'queued' if job.status == 'queued' else 'failed'
+        db.session.commit()
+        return False
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before retrying a job that has failed attempts times"""
+    delay = current_app.config.get('INTERVIEW_JOB_RETRY_DELAY', 30)
+    return min(delay * 2 ** max(attempts - 1, 0), current_app.config.get('INTERVIEW_JOB_RETRY_MAX_DELAY', 900))
+
+
+def run_worker(poll_interval: float = 2.0, once: bool = False) -> int:
+    """
+    Process queued jobs until interrupted
+
+    Args:
+        poll_interval: Seconds to sleep when the queue is empty
+        once: Stop as soon as the queue is empty
+
+    Returns:
+        Number of jobs processed
+    """
+    stale_after = current_app.config.get('INTERVIEW_JOB_STALE_SECONDS', 600)
+    next_sweep = 0.0
+
+    processed = 0
+    while True:
+        # Jobs of workers that died while this one runs are picked up within 1.25 * stale_after
+        if time.monotonic() >= next_sweep:
+            requeued = InterviewJob.requeue_stale(stale_after)
+            if requeued:
+                current_app.logger.warning(f"Requeued {requeued} stale interview jobs")
+            QuestionCacheEntry.purge_expired()
+            next_sweep = time.monotonic() + stale_after / 4
+
+        job = InterviewJob.claim_next()
+        if job is None:
+            if once:
+                return processed
+            # Release the connection while idle
+            db.session.remove()
+            time.sleep(poll_interval)
+            continue
+
+        current_app.logger.info(f"Running job {job.id} ({job.kind}) for session {job.session_id}")
+        run_job(job)
+        processed += 1
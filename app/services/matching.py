@@ -0,0 +1,505 @@
+# app/services/matching.py - Skill matching of candidates against job postings
+import math
+import os
+import threading
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from flask import current_app
+from app.services import posting_events
+from app.services.skill_taxonomy import TAXONOMY, SkillMatcher, tokenize
+from app.services.snapshot import open_current_snapshot, publish_snapshot
+
+def normalize_skill(skill: str) -> str:
+    """Lower-case, collapse whitespace and resolve aliases from the skill taxonomy"""
+    return TAXONOMY.normalize(skill)
+
+
+class SkillIndex:
+    """
+    Inverted index from skill to the postings that list it, updated in place
+
+    Each skill keeps an append-only ``array('i')`` of posting rows. A row is
+    one version of a posting: updating a posting retires its old row and
+    appends a new one, and removing it just retires the row. Retired rows
+    are dropped from the postings lists once they make up a quarter of the
+    index. A query reads only the lists of the candidate's skills, so
+    postings sharing no skill with the candidate are never touched.
+
+    An index opened from a snapshot keeps the snapshot's (memory-mapped,
+    read-only) arrays as a base and appends later changes after it, so
+    workers share the base through the page cache.
+
+    A posting's score is the IDF-weighted share of its skills the
+    candidate has, between 0 and 1, with IDF taken from the live postings. IDF and the
+    per-posting totals are cached and recomputed by the first query after a
+    change.
+    """
+
+    SNAPSHOT_KIND = 'skill-index'
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.vocabulary = {}  # skill -> column
+        self.skills = []  # column -> skill
+        self._base = None  # read-only arrays from a snapshot, rows 0.._base_rows-1
+        self._base_rows = self._base_entries = self._base_columns = 0
+        self._postings = []  # column -> array of rows listing the skill (after the base)
+        self._df = array('i')  # column -> live postings listing the skill
+        self._entries = array('i')  # columns of every row after the base, row after row
+        self._row_start = array('q')  # offsets count base entries too
+        self._row_length = array('i')
+        self._row_job_id = array('q')
+        self._row_live = array('b')  # every row, base included
+        self._job_row = {}  # job id -> live row
+        self._retired = 0
+        self._idf = None  # IDF and total IDF per row, recomputed after changes
+        self._row_totals = None
+        self._matcher = None  # taxonomy plus indexed skills, built on first use
+        self.built_at = time.time()
+
+    @classmethod
+    def build(cls, postings: Iterable[Tuple[int, Iterable[str]]]) -> 'SkillIndex':
+        """Build the index from (job_id, skills) pairs"""
+        index = cls()
+        for job_id, skills in postings:
+            index.add(job_id, skills)
+        return index
+
+    def __len__(self):
+        return len(self._job_row)
+
+    def __contains__(self, job_id):
+        return job_id in self._job_row
+
+    def _row_count(self) -> int:
+        return self._base_rows + len(self._row_job_id)
+
+    def _row(self, row: int) -> Tuple[int, int, int]:
+        """(entries offset, skill count, job id) of a row"""
+        if row < self._base_rows:
+            base = self._base
+            return int(base['row_start'][row]), int(base['row_length'][row]), int(base['row_job_id'][row])
+        row -= self._base_rows
+        return self._row_start[row], self._row_length[row], self._row_job_id[row]
+
+    def _row_columns(self, row: int) -> Sequence[int]:
+        start, length, _ = self._row(row)
+        if row < self._base_rows:
+            return self._base['entries'][start:start + length].tolist()
+        start -= self._base_entries
+        return self._entries[start:start + length]
+
+    def _column(self, skill: str) -> int:
+        column = self.vocabulary.get(skill)
+        if column is None:
+            column = self.vocabulary[skill] = len(self.skills)
+            self.skills.append(skill)
+            self._postings.append(array('i'))
+            self._df.append(0)
+            if self._matcher is not None:
+                self._matcher.add(skill)
+        return column
+
+    def add(self, job_id: int, skills: Iterable[str]):
+        """Index a posting, replacing any previous version of it"""
+        with self._lock:
+            self._retire(job_id)
+            columns = sorted({self._column(skill) for skill in map(normalize_skill, skills or ()) if skill})
+            row = self._row_count()
+            self._row_start.append(self._base_entries + len(self._entries))
+            self._row_length.append(len(columns))
+            self._row_job_id.append(job_id)
+            self._row_live.append(1)
+            self._entries.extend(columns)
+            for column in columns:
+                self._postings[column].append(row)
+                self._df[column] += 1
+            self._job_row[job_id] = row
+            self._idf = self._row_totals = None
+            if self._retired * 4 > self._row_count():
+                self._compact()
+
+    def remove(self, job_id: int):
+        """Drop a posting (deleted or deactivated) from the index"""
+        with self._lock:
+            self._retire(job_id)
+            if self._retired * 4 > self._row_count():
+                self._compact()
+
+    def _retire(self, job_id: int):
+        row = self._job_row.pop(job_id, None)
+        if row is None:
+            return
+        self._idf = self._row_totals = None
+        self._row_live[row] = 0
+        for column in self._row_columns(row):
+            self._df[column] -= 1
+        self._retired += 1
+
+    def _compact(self):
+        """Rebuild the arrays from live rows, dropping retired rows and unused skills"""
+        live = [(job_id, self.posting_skills(row)) for job_id, row in sorted(self._job_row.items())]
+        built_at = self.built_at
+        self._reset()
+        for job_id, skills in live:
+            self.add(job_id, skills)
+        self.built_at = built_at
+
+    def posting_skills(self, row: int) -> List[str]:
+        return [self.skills[column] for column in self._row_columns(row)]
+
+    def matcher(self) -> SkillMatcher:
+        """Matcher for every taxonomy skill and every indexed skill"""
+        with self._lock:
+            if self._matcher is None:
+                self._matcher = TAXONOMY.matcher(self.skills)
+            return self._matcher
+
+    def skills_in_text(self, text: str) -> List[str]:
+        """Indexed skills mentioned in free text, in order of first mention"""
+        return [skill for skill in self.matcher().find(text) if skill in self.vocabulary]
+
+    def top_k(self, skills: Sequence[str], k: int = 10, min_score: float = 0.0) -> List[Dict]:
+        """
+        Best matching postings for a candidate
+
+        Args:
+            skills: Candidate skills (normalized here)
+            k: Maximum number of matches
+            min_score: Drop matches scoring at or below this
+
+        Returns:
+            Dicts with job_id, score, matched_skills and missing_skills, best first
+        """
+        skills = [normalize_skill(skill) for skill in skills]
+        with self._lock:
+            # NumPy views of the arrays must not outlive the lock, or appends would fail
+            return self._top_k(skills, k, min_score)
+
+    def top_k_for_query(self, skills: Sequence[str], k: int = 10,
+                        after: Optional[Tuple[float, int]] = None) -> List[Dict]:
+        """
+        Rows ranked by how much of the query they cover (e.g. candidates for a posting)
+
+        A row's score is the IDF-weighted share of the query's skills it has;
+        query skills no row has count at the highest IDF. Results are ordered
+        by score, then id, and ``after`` = (score, id) of the last result of
+        the previous page continues from there (keyset pagination).
+
+        Returns:
+            Dicts with id, score and matched_skills, best first
+        """
+        skills = list(dict.fromkeys(skill for skill in map(normalize_skill, skills) if skill))
+        with self._lock:
+            return self._top_k_for_query(skills, k, after)
+
+    def _top_k_for_query(self, skills: List[str], k: int, after: Optional[Tuple[float, int]]) -> List[Dict]:
+        columns = [self.vocabulary[skill] for skill in skills if skill in self.vocabulary]
+        if not columns or k <= 0 or not self._job_row:
+            return []
+
+        idf, _ = self._weights()
+        unknown = len(skills) - len(columns)
+        query_total = float(idf[columns].sum()) + unknown * math.log1p(len(self._job_row))
+
+        lists = [self._column_rows(column) for column in columns]
+        rows = np.concatenate([part for parts in lists for part in parts])
+        weights = np.repeat(idf[columns], [sum(len(part) for part in parts) for parts in lists])
+        live = np.frombuffer(self._row_live, dtype=np.int8)[rows].astype(bool)
+        matched = np.bincount(rows[live], weights=weights[live], minlength=self._row_count())
+        touched = np.flatnonzero(matched)
+
+        # Rounded so cursors compare exactly against recomputed scores
+        scores = np.round(matched[touched] / query_total, 6)
+        ids = self._all_rows('row_job_id', np.int64)[touched]
+        if after is not None:
+            keep = (scores < after[0]) | ((scores == after[0]) & (ids > after[1]))
+            touched, scores, ids = touched[keep], scores[keep], ids[keep]
+
+        if len(scores) > k:
+            # Partial selection, keeping every row tied with the k-th score
+            kth = np.partition(-scores, k - 1)[k - 1]
+            keep = -scores <= kth
+            touched, scores, ids = touched[keep], scores[keep], ids[keep]
+        order = np.lexsort((ids, -scores))[:k]
+
+        wanted = set(skills)
+        return [{
+            'id': int(ids[i]),
+            'score': float(scores[i]),
+            'matched_skills': [skill for skill in self.posting_skills(int(touched[i])) if skill in wanted],
+        } for i in order]
+
+    def _column_rows(self, column: int) -> List[np.ndarray]:
+        rows = [np.frombuffer(self._postings[column], dtype=np.int32)]
+        if column < self._base_columns:
+            offsets = self._base['postings_offsets']
+            rows.insert(0, self._base['postings_rows'][offsets[column]:offsets[column + 1]])
+        return rows
+
+    def _all_rows(self, name: str, dtype) -> np.ndarray:
+        """A per-row or per-entry array across base and appended rows"""
+        appended = np.frombuffer(getattr(self, f'_{name}'), dtype=dtype)
+        if self._base is None:
+            return appended
+        return np.concatenate((self._base[name], appended))
+
+    def _weights(self) -> Tuple[np.ndarray, np.ndarray]:
+        """IDF per skill and total IDF per row, cached until the index changes"""
+        if self._idf is None:
+            df = np.frombuffer(self._df, dtype=np.int32)
+            lengths = self._all_rows('row_length', np.int32)
+            entries = self._all_rows('entries', np.int32)
+            idf = np.log1p(len(self._job_row) / np.maximum(df, 1))
+            entry_rows = np.repeat(np.arange(len(lengths)), lengths)
+            self._row_totals = np.bincount(entry_rows, weights=idf[entries], minlength=len(lengths))
+            self._idf = idf
+        return self._idf, self._row_totals
+
+    def _top_k(self, skills: List[str], k: int, min_score: float) -> List[Dict]:
+        columns = sorted({self.vocabulary[skill] for skill in skills if skill in self.vocabulary})
+        if not columns or k <= 0 or not self._job_row:
+            return []
+
+        idf, row_totals = self._weights()
+        lists = [self._column_rows(column) for column in columns]
+        rows = np.concatenate([part for parts in lists for part in parts])
+        weights = np.repeat(idf[columns], [sum(len(part) for part in parts) for parts in lists])
+
+        live = np.frombuffer(self._row_live, dtype=np.int8)[rows].astype(bool)
+        matched = np.bincount(rows[live], weights=weights[live], minlength=self._row_count())
+        touched = np.flatnonzero(matched)
+        if not len(touched):
+            return []
+        scores = matched[touched] / row_totals[touched]
+
+        k = min(k, len(scores))
+        # Partial sort: only the k best are ordered
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+
+        have = set(skills)
+        matches = []
+        for i in best:
+            score = float(scores[i])
+            if score <= min_score:
+                break
+            row = int(touched[i])
+            posting_skills = self.posting_skills(row)
+            matches.append({
+                'job_id': self._row(row)[2],
+                'score': round(score, 4),
+                'matched_skills': [skill for skill in posting_skills if skill in have],
+                'missing_skills': [skill for skill in posting_skills if skill not in have],
+            })
+        return matches
+
+    def to_snapshot(self) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """Arrays and metadata for write_snapshot(); retired rows are compacted away first"""
+        with self._lock:
+            if self._retired:
+                self._compact()
+            idf, row_totals = self._weights()
+            lists = [np.concatenate(self._column_rows(column)) for column in range(len(self.skills))]
+            postings_offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+            postings_offsets[1:] = np.cumsum([len(rows) for rows in lists])
+            arrays = {
+                'postings_offsets': postings_offsets,
+                'postings_rows': np.concatenate(lists) if lists else np.zeros(0, np.int32),
+                'entries': self._all_rows('entries', np.int32),
+                'row_start': self._all_rows('row_start', np.int64),
+                'row_length': self._all_rows('row_length', np.int32),
+                'row_job_id': self._all_rows('row_job_id', np.int64),
+                'df': np.frombuffer(self._df, dtype=np.int32).copy(),
+                'idf': idf,
+                'row_totals': row_totals,
+            }
+            meta = {'skills': list(self.skills), 'built_at': self.built_at}
+            return {name: np.ascontiguousarray(value) for name, value in arrays.items()}, meta
+
+    @classmethod
+    def from_snapshot(cls, arrays: Dict[str, np.ndarray], meta: Dict) -> 'SkillIndex':
+        """Open an index over snapshot arrays without copying the postings"""
+        index = cls()
+        index.skills = list(meta['skills'])
+        index.vocabulary = {skill: column for column, skill in enumerate(index.skills)}
+        index.built_at = meta['built_at']
+        index._base = arrays
+        index._base_rows = len(arrays['row_job_id'])
+        index._base_entries = len(arrays['entries'])
+        index._base_columns = len(index.skills)
+        index._postings = [array('i') for _ in index.skills]
+        index._df.frombytes(arrays['df'].astype(np.int32).tobytes())
+        index._row_live = array('b', b'\x01' * index._base_rows)
+        index._job_row = dict(zip(arrays['row_job_id'].tolist(), range(index._base_rows)))
+        index._idf = arrays['idf']
+        index._row_totals = arrays['row_totals']
+        return index
+
+
+def posting_skills(skills_required, requirements, matcher: SkillMatcher) -> List[str]:
+    """Skills of a posting: its listed skills, else the skills matcher finds in its requirements"""
+    if skills_required:
+        return list(skills_required)
+    return matcher.find(requirements) if requirements else []
+
+
+def load_postings() -> List[Tuple[int, List[str]]]:
+    """(id, skills) of every active posting, using requirements text when no skills are listed"""
+    # Imported here: the app package imports this module while it is being set up
+    from app import db
+    from app.models import JobPosting
+
+    rows = db.session.query(JobPosting.id, JobPosting.skills_required, JobPosting.requirements) \
+        .filter(JobPosting.is_active.is_(True)).order_by(JobPosting.id).all()
+
+    # Free-text requirements are matched against the taxonomy and every listed skill
+    matcher = TAXONOMY.matcher({normalize_skill(skill) for _, skills, _ in rows for skill in skills or ()})
+    return [(job_id, posting_skills(skills, requirements, matcher)) for job_id, skills, requirements in rows]
+
+
+def load_listed_skills() -> List[str]:
+    """Normalized skills listed by the active postings, without reading their requirements text"""
+    # Imported here: the app package imports this module while it is being set up
+    from app import db
+    from app.models import JobPosting
+
+    rows = db.session.query(JobPosting.skills_required).filter(JobPosting.is_active.is_(True))
+    return sorted({normalize_skill(skill) for skills, in rows.yield_per(1000) for skill in skills or ()} - {''})
+
+
+class JobMatcher:
+    """
+    Per-process SkillIndex over the active job postings
+
+    On first use the index is opened from the current snapshot under
+    INDEX_SNAPSHOT_DIR (written by ``flask build-index``) when one exists
+    and is recent enough, and built from the database otherwise. It is then
+    kept current by session events: committed inserts, updates,
+    deactivations and deletes of JobPosting are applied to it in place.
+    Changes made elsewhere (other worker processes, bulk Query.update())
+    are picked up once the index is older than JOB_MATCH_REFRESH_SECONDS.
+    """
+
+    def __init__(self, app=None):
+        self.refresh_seconds = 1800
+        self.snapshot_dir = None
+        self._index = None
+        self._skill_matcher = None  # (matcher, built at) for when no index is loaded
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get('JOB_MATCH_REFRESH_SECONDS', 1800)
+        self.snapshot_dir = os.path.abspath(app.config.get('INDEX_SNAPSHOT_DIR', 'index_snapshots'))
+        app.extensions['job_matcher'] = self
+        posting_events.subscribe('job_matcher')
+
+    def _expired(self, index: Optional[SkillIndex]) -> bool:
+        return index is None or time.time() - index.built_at >= self.refresh_seconds
+
+    def index(self) -> SkillIndex:
+        """Return the current index, loading or building it when missing or due for a refresh"""
+        index = self._index
+        if not self._expired(index):
+            return index
+
+        with self._lock:
+            # Another thread may have rebuilt it while we waited
+            index = self._index
+            if self._expired(index):
+                index = self._open_snapshot()
+                if self._expired(index):
+                    started = time.perf_counter()
+                    index = SkillIndex.build(load_postings())
+                    current_app.logger.info(f"Built skill index: {len(index)} postings, "
+                                            f"{len(index.vocabulary)} skills in "
+                                            f"{(time.perf_counter() - started) * 1000:.0f}ms")
+                self._index = index
+            return index
+
+    def skill_matcher(self) -> SkillMatcher:
+        """
+        Matcher for the taxonomy plus every skill the active postings list
+
+        The loaded index's own matcher when it is current. Otherwise one
+        built from just the postings' listed skills and kept for
+        JOB_MATCH_REFRESH_SECONDS, so callers in a request path (resume
+        uploads) never wait for the whole index to be built.
+        """
+        index = self._index
+        if not self._expired(index):
+            return index.matcher()
+
+        cached = self._skill_matcher
+        if cached is None or time.time() - cached[1] >= self.refresh_seconds:
+            with self._lock:
+                cached = self._skill_matcher
+                if cached is None or time.time() - cached[1] >= self.refresh_seconds:
+                    cached = self._skill_matcher = (TAXONOMY.matcher(load_listed_skills()), time.time())
+        return cached[0]
+
+    def _open_snapshot(self) -> Optional[SkillIndex]:
+        started = time.perf_counter()
+        try:
+            snapshot = open_current_snapshot(self.snapshot_dir, SkillIndex.SNAPSHOT_KIND)
+            if snapshot is None:
+                return None
+            index = SkillIndex.from_snapshot(snapshot.arrays, snapshot.meta)
+        except (OSError, ValueError, KeyError) as e:
+            current_app.logger.warning(f"Ignoring skill index snapshot: {str(e)}")
+            return None
+        current_app.logger.info(f"Opened skill index snapshot {snapshot.path}: {len(index)} postings in "
+                                f"{(time.perf_counter() - started) * 1000:.0f}ms")
+        return index
+
+    def write_snapshot(self) -> str:
+        """Build the index from the database, publish it as the current snapshot and use it"""
+        index = SkillIndex.build(load_postings())
+        arrays, meta = index.to_snapshot()
+        path = publish_snapshot(self.snapshot_dir, SkillIndex.SNAPSHOT_KIND, arrays, meta)
+        self._index = index
+        return path
+
+    def invalidate(self):
+        """Force a rebuild on the next query"""
+        self._index = None
+        self._skill_matcher = None
+
+    def apply(self, changes: Dict[int, Optional[posting_events.PostingChange]]):
+        """Apply committed posting changes; see posting_events.subscribe"""
+        index = self._index
+        if index is None:
+            # Nothing built yet; the first query loads the committed state
+            cached = self._skill_matcher
+            if cached is not None:
+                for change in filter(None, changes.values()):
+                    for skill in map(normalize_skill, change.skills_required or ()):
+                        if skill and skill not in TAXONOMY.unmatched:
+                            cached[0].add(skill)
+            return
+        for job_id, change in changes.items():
+            if change is None or not change.is_active:
+                index.remove(job_id)
+            else:
+                index.add(job_id, posting_skills(change.skills_required, change.requirements, index.matcher()))
+
+    def match(self, skills: Sequence[str], k: int = 10) -> List[Dict]:
+        return self.index().top_k(skills, k)
+
+    def match_text(self, text: str, k: int = 10) -> Tuple[List[str], List[Dict]]:
+        """Extract indexed skills from text and match them; returns (skills, matches)"""
+        index = self.index()
+        skills = index.skills_in_text(text)
+        return skills, index.top_k(skills, k)
+
+
+def get_job_matcher() -> JobMatcher:
+    """Return the matcher registered on the current app"""
+    return current_app.extensions['job_matcher']
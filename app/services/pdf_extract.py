@@ -0,0 +1,193 @@
+# app/services/pdf_extract.py - Resume text extraction in a bounded process pool
+import io
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Union
+import PyPDF2
+import pdfplumber
+from flask import current_app
+
+# Minimum amount of pdfplumber text before falling back to PyPDF2
+MIN_TEXT_LENGTH = 50
+
+PdfSource = Union[str, bytes]
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+class PdfExtractionTimeout(Exception):
+    """Raised when extraction exceeds its wall-clock budget"""
+
+
+def _open_source(source: PdfSource):
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def count_pages(source: PdfSource) -> int:
+    """Number of pages in the document (reads only the page tree)"""
+    reader = PyPDF2.PdfReader(_open_source(source))
+    return len(reader.pages)
+
+
+def extract_page_range(source: PdfSource, start: int, stop: Optional[int], fallback: bool = True) -> List[str]:
+    """
+    Extract text for pages [start, stop) with pdfplumber, PyPDF2 as fallback
+
+    Runs inside pool workers, so it must stay a picklable module-level
+    function. Returns the pdfplumber text of each page, followed by the
+    PyPDF2 text of each page when the fallback kicked in.
+    """
+    texts = []
+    with pdfplumber.open(_open_source(source)) as pdf:
+        for page in pdf.pages[start:stop]:
+            texts.append(page.extract_text() or '')
+
+    # If no text found, try PyPDF2
+    if fallback and len(''.join(texts).strip()) < MIN_TEXT_LENGTH:
+        reader = PyPDF2.PdfReader(_open_source(source))
+        texts.extend(page.extract_text() or '' for page in reader.pages[start:stop])
+    return texts
+
+
+def _raise_timeout(signum, frame):
+    raise PdfExtractionTimeout('PDF extraction ran past its deadline')
+
+
+def _extract_task(source: PdfSource, start: int, stop: Optional[int], fallback: bool,
+                  deadline: Optional[float]) -> List[str]:
+    """
+    Pool entry point: extract_page_range() that gives up at deadline (time.time())
+
+    The worker interrupts itself with SIGALRM, so a document that runs
+    too long frees its worker without disturbing the rest of the pool.
+    Tasks still queued when their deadline passes give up at once.
+    """
+    if deadline is None or not hasattr(signal, 'setitimer'):
+        return extract_page_range(source, start, stop, fallback)
+    budget = deadline - time.time()
+    if budget <= 0:
+        raise PdfExtractionTimeout('PDF extraction ran past its deadline')
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        return extract_page_range(source, start, stop, fallback)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _join_pages(texts: List[str]) -> str:
+    return ''.join(text + '\n' for text in texts if text).strip()
+
+
+def _get_pool(workers: int, start_method: str) -> ProcessPoolExecutor:
+    """Return this process's extraction pool, creating it on first use"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        # A pool inherited through fork belongs to the parent
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def shutdown_pool(wait: bool = True):
+    """Stop the pool; the next extraction starts a new one"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _result(future, deadline: Optional[float]):
+    """future.result() within deadline (time.monotonic()), as PdfExtractionTimeout if it passes"""
+    remaining = max(0.0, deadline - time.monotonic()) if deadline else None
+    try:
+        return future.result(timeout=remaining)
+    except FuturesTimeoutError:
+        raise PdfExtractionTimeout('PDF extraction ran past its deadline') from None
+
+
+def extract_text(source: PdfSource, max_pages: Optional[int] = None, timeout: Optional[float] = None,
+                 workers: int = 0, pages_per_task: int = 0, start_method: str = 'spawn') -> str:
+    """
+    Extract text from a PDF path or bytes
+
+    Args:
+        source: File path or the PDF bytes
+        max_pages: Only the first max_pages pages are read (None = all)
+        timeout: Wall-clock budget in seconds (pool mode only)
+        workers: Pool size; 0 extracts in the calling thread
+        pages_per_task: Split documents longer than this across pool workers (0 = never)
+        start_method: multiprocessing start method for the pool
+
+    Returns:
+        The extracted text, stripped
+
+    Raises:
+        PdfExtractionTimeout: extraction ran past ``timeout``
+    """
+    if not workers:
+        return _join_pages(extract_page_range(source, 0, max_pages))
+
+    deadline = time.monotonic() + timeout if timeout else None
+    # Workers compare against the wall clock, which they share with this process
+    task_deadline = time.time() + timeout if timeout else None
+    pool = _get_pool(workers, start_method)
+
+    ranges = [(0, max_pages)]
+    if pages_per_task:
+        page_count = count_pages(source)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+        if page_count > pages_per_task:
+            ranges = [(start, min(start + pages_per_task, page_count))
+                      for start in range(0, page_count, pages_per_task)]
+
+    # With several chunks the PyPDF2 fallback is decided on the whole document below
+    fallback = len(ranges) == 1
+    futures = [pool.submit(_extract_task, source, start, stop, fallback, task_deadline)
+               for start, stop in ranges]
+    texts = []
+    try:
+        for future in futures:
+            texts.extend(_result(future, deadline))
+        if not fallback and len(_join_pages(texts)) < MIN_TEXT_LENGTH:
+            futures = [pool.submit(_extract_task, source, 0, max_pages, True, task_deadline)]
+            texts = _result(futures[0], deadline)
+    except PdfExtractionTimeout:
+        # Only this document's tasks stop: queued ones are cancelled and running
+        # ones interrupt themselves at the same deadline; the pool carries on
+        for future in futures:
+            future.cancel()
+        raise PdfExtractionTimeout(f"PDF extraction exceeded {timeout}s") from None
+    except BrokenProcessPool:
+        # A worker died (e.g. crashed on a malformed file); start fresh next time
+        shutdown_pool(wait=False)
+        raise
+
+    return _join_pages(texts)
+
+
+def extract_pdf_text(source: PdfSource) -> str:
+    """extract_text() configured from the current app (PDF_* settings)"""
+    config = current_app.config
+    return extract_text(
+        source,
+        max_pages=config.get('PDF_MAX_PAGES'),
+        timeout=config.get('PDF_EXTRACT_TIMEOUT'),
+        workers=config.get('PDF_POOL_WORKERS', 0),
+        pages_per_task=config.get('PDF_PAGES_PER_TASK', 0),
+        start_method=config.get('PDF_POOL_START_METHOD', 'spawn'),
+    )
@@ -0,0 +1,61 @@
+# app/services/posting_events.py - Committed JobPosting changes for in-process indexes
+from typing import List, NamedTuple, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# app.extensions keys whose apply(changes) runs after each commit touching postings
+_subscribers: List[str] = []
+
+
+class PostingChange(NamedTuple):
+    """Indexed fields of a posting as committed"""
+    skills_required: Optional[list]
+    requirements: Optional[str]
+    is_active: bool
+    title: str
+    description: Optional[str]
+
+
+def subscribe(extension_name: str):
+    """
+    Deliver committed JobPosting changes to app.extensions[extension_name].apply()
+
+    changes maps job id -> PostingChange, or None for a deleted posting.
+    Bulk Query.update()/delete() bypass the session and are not reported.
+    """
+    for name, listener in (('after_flush', _record_posting_changes),
+                           ('after_commit', _apply_posting_changes),
+                           ('after_rollback', _discard_posting_changes)):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+    if extension_name not in _subscribers:
+        _subscribers.append(extension_name)
+
+
+def _record_posting_changes(session, flush_context):
+    """Remember JobPosting rows written by this flush until the transaction ends"""
+    from app.models import JobPosting
+
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, JobPosting) and obj.id is not None:
+            session.info.setdefault('job_posting_changes', {})[obj.id] = \
+                PostingChange(obj.skills_required, obj.requirements, obj.is_active is not False,
+                              obj.title, obj.description)
+    for obj in session.deleted:
+        if isinstance(obj, JobPosting):
+            session.info.setdefault('job_posting_changes', {})[obj.id] = None
+
+
+def _apply_posting_changes(session):
+    changes = session.info.pop('job_posting_changes', None)
+    if not changes or not has_app_context():
+        return
+    for name in _subscribers:
+        extension = current_app.extensions.get(name)
+        if extension:
+            extension.apply(changes)
+
+
+def _discard_posting_changes(session):
+    session.info.pop('job_posting_changes', None)
@@ -0,0 +1,133 @@
+# app/services/question_cache.py - Persistent memoization of generated interview questions
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import QuestionCacheEntry
+
+# Per-process lookup counters; persistent per-entry hits live in QuestionCacheEntry.hit_count
+_stats = {'hits': 0, 'misses': 0, 'bypasses': 0}
+_stats_lock = threading.Lock()
+
+
+def normalize_resume_text(text: str) -> str:
+    """Collapse whitespace so re-extracting the same PDF yields the same key"""
+    return ' '.join((text or '').split())
+
+
+def make_cache_key(resume_text: str, job_title: str, difficulty_level: str,
+                   prompt_version: str, model: str) -> str:
+    """Hash of (normalized resume text, job title, difficulty, prompt version, model)"""
+    material = '\x1f'.join([
+        normalize_resume_text(resume_text),
+        ' '.join((job_title or '').lower().split()),
+        difficulty_level or '',
+        prompt_version or '',
+        model or '',
+    ])
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def _count(name: str):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def lookup(cache_key: str) -> Optional[List[str]]:
+    """Return unexpired cached questions for cache_key, recording the hit"""
+    entry = QuestionCacheEntry.query.filter_by(cache_key=cache_key).first()
+    if not entry or (entry.expires_at and entry.expires_at < datetime.utcnow()):
+        return None
+
+    entry.hit_count = (entry.hit_count or 0) + 1
+    entry.last_hit_at = datetime.utcnow()
+    db.session.commit()
+    return list(entry.questions)
+
+
+def store(cache_key: str, questions: List[str], model: str, prompt_version: str):
+    """Insert or refresh the cache entry for cache_key"""
+    ttl = current_app.config.get('QUESTION_CACHE_TTL', 7 * 24 * 3600)
+    expires_at = datetime.utcnow() + timedelta(seconds=ttl) if ttl else None
+
+    entry = QuestionCacheEntry.query.filter_by(cache_key=cache_key).first()
+    if entry:
+        entry.questions = list(questions)
+        entry.created_at = datetime.utcnow()
+        entry.expires_at = expires_at
+    else:
+        db.session.add(QuestionCacheEntry(
+            cache_key=cache_key,
+            model=model,
+            prompt_version=prompt_version,
+            questions=list(questions),
+            expires_at=expires_at
+        ))
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request stored the same key first
+        db.session.rollback()
+
+
+def get_or_generate_questions(generate: Callable[[], List[str]], resume_text: str, job_title: str,
+                              difficulty_level: str, model: str, prompt_version: str,
+                              force_fresh: bool = False) -> List[str]:
+    """
+    Serve questions from the cache, calling generate() only on a miss
+
+    Args:
+        generate: Produces fresh questions (the LLM call)
+        model: Model name the questions come from
+        prompt_version: Bumped whenever the prompt template changes
+        force_fresh: Skip the lookup and overwrite the cached entry
+
+    Returns:
+        List of questions
+    """
+    cache_key = make_cache_key(resume_text, job_title, difficulty_level, prompt_version, model)
+
+    if force_fresh:
+        _count('bypasses')
+    else:
+        try:
+            questions = lookup(cache_key)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Question cache lookup failed: {str(e)}")
+            questions = None
+        if questions is not None:
+            _count('hits')
+            return questions
+        _count('misses')
+
+    questions = generate()
+
+    try:
+        store(cache_key, questions, model, prompt_version)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Question cache store failed: {str(e)}")
+
+    return questions
+
+
+def stats() -> Dict[str, float]:
+    """Per-process hit rate plus totals persisted in the cache table"""
+    with _stats_lock:
+        result = dict(_stats)
+    lookups = result['hits'] + result['misses']
+    result['hit_rate'] = result['hits'] / lookups if lookups else 0.0
+
+    entries, stored_hits = db.session.query(
+        func.count(QuestionCacheEntry.id),
+        func.coalesce(func.sum(QuestionCacheEntry.hit_count), 0)
+    ).one()
+    result['entries'] = entries
+    result['stored_hits'] = int(stored_hits)
+    return result
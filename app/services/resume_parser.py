@@ -0,0 +1,212 @@
+# app/services/resume_parser.py - Structured resume profile, parsed once at upload
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Stored with each profile; profiles of another version are re-parsed when the resume is
+# uploaded again or by `flask extract-resume-skills --all`
+PARSER_VERSION = 1
+
+# Section name -> headings that open it (compared lower-cased, without a trailing colon)
+SECTION_HEADINGS = {
+    'summary': ('summary', 'profile', 'professional summary', 'career summary', 'objective',
+                'career objective', 'about', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'education': ('education', 'academic background', 'education and training', 'qualifications'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies', 'technologies',
+               'tools and technologies', 'tech stack'),
+    'projects': ('projects', 'personal projects', 'key projects', 'selected projects'),
+    'certifications': ('certifications', 'certificates', 'licenses and certifications', 'courses'),
+    'achievements': ('achievements', 'awards', 'honors', 'honours', 'publications'),
+}
+_HEADINGS = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# Words that make an experience line a job title
+TITLE_WORDS = frozenset("""
+engineer developer programmer architect manager lead analyst scientist designer consultant
+administrator specialist director officer technician intern internship founder co-founder cto ceo
+head devops sre tester researcher teacher lecturer coordinator
+""".split())
+
+DEGREE_RE = re.compile(r"\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|b\.?s|m\.?s|b\.?a|m\.?a|"
+                       r"b\.?e|m\.?e|b\.?tech|m\.?tech|mba|diploma|degree|associate)\b", re.IGNORECASE)
+YEARS_CLAIM_RE = re.compile(r"\b(\d{1,2})\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+DATE_RANGE_RE = re.compile(r"\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now|date)\b",
+                           re.IGNORECASE)
+_BULLET_RE = re.compile(r"^[\s•·▪◦●○■\-*–>]+")
+
+# Caps on what is stored per resume
+MAX_TITLES = 8
+MAX_EDUCATION = 3
+MAX_HIGHLIGHTS = 12
+MAX_SUMMARY_CHARS = 400
+MAX_LINE_CHARS = 200
+
+
+def _heading(line: str) -> Optional[str]:
+    """Section name if line is a section heading"""
+    candidate = line.strip().rstrip(':').strip().lower()
+    if len(candidate) > 40:
+        return None
+    return _HEADINGS.get(' '.join(candidate.split()))
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """
+    Non-empty lines of each recognised section, in order
+
+    Lines before the first heading (name, contact details) are kept under
+    'header'; text under an unrecognised heading stays with the previous
+    section.
+    """
+    sections = {'header': []}
+    current = 'header'
+    for raw in (text or '').splitlines():
+        line = ' '.join(raw.split())
+        if not line:
+            continue
+        name = _heading(line)
+        if name:
+            current = name
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def _clean(line: str) -> str:
+    return _BULLET_RE.sub('', line)[:MAX_LINE_CHARS].strip()
+
+
+def extract_titles(lines: Sequence[str]) -> List[str]:
+    """Job titles from experience lines such as 'Senior Data Engineer at Acme | 2019 - 2022'"""
+    titles = []
+    for line in lines:
+        line = _clean(line)
+        if len(line) > 100:
+            continue
+        for part in re.split(r"\s+(?:at|@)\s+|\s*[|,(–—]\s*|\s+-\s+", line):
+            words = part.lower().split()
+            if 0 < len(words) <= 6 and TITLE_WORDS.intersection(words) and not DATE_RANGE_RE.search(part):
+                title = part.strip(' .:;')
+                if title.lower() not in (t.lower() for t in titles):
+                    titles.append(title)
+                break
+        if len(titles) >= MAX_TITLES:
+            break
+    return titles
+
+
+def years_of_experience(lines: Sequence[str], today: Optional[datetime] = None) -> Optional[float]:
+    """
+    Years of work experience
+
+    Taken from the date ranges in the given lines (overlapping jobs are
+    counted once), else from the largest "N years" claim; None if neither
+    is present.
+    """
+    this_year = (today or datetime.utcnow()).year
+    spans: List[Tuple[int, int]] = []
+    for line in lines:
+        for start, end in DATE_RANGE_RE.findall(line):
+            end_year = int(end) if end.isdigit() else this_year
+            if int(start) <= end_year <= this_year:
+                spans.append((int(start), end_year))
+    if spans:
+        total = 0
+        covered_until = None
+        for start, end in sorted(spans):
+            if covered_until is not None and start < covered_until:
+                start = covered_until
+            if end > start:
+                total += end - start
+            covered_until = max(covered_until or end, end)
+        return float(total)
+
+    claims = [int(years) for line in lines for years in YEARS_CLAIM_RE.findall(line) if int(years) <= 50]
+    return float(max(claims)) if claims else None
+
+
+def parse_resume(text: str, skills: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Compact, deterministic profile of a resume
+
+    Args:
+        text: Extracted resume text
+        skills: Normalized skills already found in it (Resume.skills)
+
+    Returns:
+        JSON-serializable dict: version, sections (names found), skills,
+        titles, years_experience, education, summary and highlights
+        (experience and project lines). Contact details are not kept.
+    """
+    sections = split_sections(text)
+    experience = sections.get('experience', [])
+
+    highlights = []
+    for name in ('experience', 'projects', 'achievements'):
+        for line in sections.get(name, []):
+            line = _clean(line)
+            # Bullet points describing work, not title/date lines
+            if len(line.split()) >= 6 and not DATE_RANGE_RE.search(line):
+                highlights.append(line)
+    summary = ' '.join(sections.get('summary', []))[:MAX_SUMMARY_CHARS]
+
+    return {
+        'version': PARSER_VERSION,
+        'sections': [name for name in sections if name != 'header' and sections[name]],
+        'skills': list(skills or []),
+        'titles': extract_titles(experience or sections['header']),
+        'years_experience': years_of_experience(experience or [line for name, lines in sections.items()
+                                                               if name != 'education' for line in lines]),
+        'education': [_clean(line) for line in sections.get('education', []) if DEGREE_RE.search(line)]
+                     [:MAX_EDUCATION],
+        'summary': summary,
+        'highlights': highlights[:MAX_HIGHLIGHTS],
+    }
+
+
+def ensure_resume_parsed(resume, force: bool = False) -> bool:
+    """Store the resume's profile if missing or from an older parser; True if it was (re)computed"""
+    parsed = resume.parsed
+    if parsed and parsed.get('version') == PARSER_VERSION and not force:
+        return False
+    resume.parsed = parse_resume(resume.text, resume.skills)
+    resume.parsed_at = datetime.utcnow()
+    return True
+
+
+def format_profile(parsed: Dict, max_chars: int = 1500) -> str:
+    """Render a parsed profile as prompt text, adding highlights while they fit in max_chars"""
+    lines = []
+    if parsed.get('titles'):
+        lines.append(f"Roles: {'; '.join(parsed['titles'])}")
+    if parsed.get('years_experience') is not None:
+        lines.append(f"Years of experience: {parsed['years_experience']:g}")
+    if parsed.get('skills'):
+        lines.append(f"Skills: {', '.join(parsed['skills'])}")
+    if parsed.get('education'):
+        lines.append(f"Education: {'; '.join(parsed['education'])}")
+    if parsed.get('summary'):
+        lines.append(f"Summary: {parsed['summary']}")
+    text = '\n'.join(lines)[:max_chars]
+
+    highlights = ''
+    for highlight in parsed.get('highlights') or []:
+        line = f'\n- {highlight}'
+        if len(text) + len('\nExperience highlights:') + len(highlights) + len(line) > max_chars:
+            break
+        highlights += line
+    if highlights:
+        text += '\nExperience highlights:' + highlights
+    return text
+
+
+def resume_prompt_text(resume, max_chars: int = 1500) -> Optional[str]:
+    """What prompts send about a resume: its parsed profile, or the start of its text if not parsed yet"""
+    if resume is None:
+        return None
+    if resume.parsed:
+        return format_profile(resume.parsed, max_chars)
+    return resume.text[:max_chars]
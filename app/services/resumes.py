@@ -0,0 +1,88 @@
+# app/services/resumes.py - Deduplicated resume storage
+import hashlib
+from typing import Callable, Optional
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Resume, ResumeFile
+from app.services.candidates import ensure_resume_skills, get_candidate_matcher
+from app.services.question_cache import normalize_resume_text
+from app.services.resume_parser import ensure_resume_parsed
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(normalize_resume_text(text).encode('utf-8')).hexdigest()
+
+
+def get_or_create_resume(user_id: int, pdf_bytes: bytes, extract: Callable[[bytes], Optional[str]]) -> Optional[Resume]:
+    """
+    Return the user's Resume for these PDF bytes, extracting text only for unseen files
+
+    A file already uploaded by the user is matched by its byte hash and
+    extraction is skipped entirely. Otherwise extract() runs and a resume
+    with the same normalized text (e.g. the same CV re-exported) is reused,
+    remembering this file as a ResumeFile so the next upload of it skips
+    extraction too, before a new row is created. When a concurrent upload of the same
+    file stores it first, its row is returned.
+
+    Args:
+        user_id: Owner of the resume
+        pdf_bytes: Uploaded PDF
+        extract: Turns the PDF bytes into resume text, None if unreadable
+
+    Returns:
+        The Resume, or None if no usable text could be extracted
+    """
+    file_hash = hash_bytes(pdf_bytes)
+    resume = _find_by_file(user_id, file_hash)
+    if resume:
+        return _with_skills(resume)
+
+    text = extract(pdf_bytes)
+    if not text or len(text.strip()) < 50:
+        return None
+
+    text_hash = hash_text(text)
+    resume = Resume.query.filter_by(user_id=user_id, text_hash=text_hash).first()
+    if resume:
+        # Alongside the file it was first uploaded as, so alternating exports all skip extraction
+        db.session.add(ResumeFile(resume=resume, user_id=user_id, file_hash=file_hash))
+    else:
+        resume = Resume(user_id=user_id, file_hash=file_hash, text_hash=text_hash, text=text)
+        db.session.add(resume)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another upload of the same file committed between the lookup and here
+        db.session.rollback()
+        resume = _find_by_file(user_id, file_hash)
+        if resume is None:
+            raise
+    return _with_skills(resume)
+
+
+def _find_by_file(user_id: int, file_hash: str) -> Optional[Resume]:
+    """The user's resume first uploaded as, or since matched to, the file with this hash"""
+    return (Resume.query.filter_by(user_id=user_id, file_hash=file_hash).first()
+            or Resume.query.join(ResumeFile).filter(ResumeFile.user_id == user_id,
+                                                    ResumeFile.file_hash == file_hash).first())
+
+
+def _with_skills(resume: Resume) -> Resume:
+    """Extract the resume's skills and profile once (for matching and prompts) and index it"""
+    try:
+        skills_changed = ensure_resume_skills(resume)
+        # The profile embeds the skills, so it follows them
+        if ensure_resume_parsed(resume, force=skills_changed) or skills_changed:
+            db.session.commit()
+        if skills_changed:
+            get_candidate_matcher().add(resume)
+    except Exception as e:
+        # The upload still succeeds; `flask extract-resume-skills` fills the gap later
+        db.session.rollback()
+        current_app.logger.warning(f"Could not extract skills for resume {resume.id}: {str(e)}")
+    return resume
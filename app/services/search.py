@@ -0,0 +1,433 @@
+# app/services/search.py - BM25 full-text search over job postings
+import fcntl
+import json
+import math
+import os
+import shutil
+import threading
+import time
+import unicodedata
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from flask import current_app
+from app.services import posting_events
+from app.services.skill_taxonomy import TAXONOMY, tokenize
+
+SEGMENT_FORMAT = 1
+
+# Fields a search can be filtered on, matched case-insensitively
+FILTER_FIELDS = ('location', 'experience_level', 'employment_type')
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or our that the their this
+to was we will with you your
+""".split())
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Title terms count this many times, so title matches outrank body matches
+TITLE_BOOST = 2
+
+
+def analyze(text: str) -> List[str]:
+    """
+    Turn text into index terms
+
+    Unicode-normalizes and folds accents, lower-cases, keeps skill
+    punctuation (c++, c#, node.js), folds skill aliases (js -> javascript)
+    and drops stopwords. No stemming, so terms stay exact.
+    """
+    text = text or ''
+    if not text.isascii():
+        text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    terms = []
+    for token in tokenize(text):
+        term = TAXONOMY.aliases.get(token, token)
+        if ' ' in term:
+            terms.extend(word for word in term.split() if word not in STOPWORDS)
+        elif term not in STOPWORDS:
+            terms.append(term)
+    return terms
+
+
+def normalize_filter_value(value) -> str:
+    return ' '.join(str(value or '').lower().split())
+
+
+class Segment:
+    """
+    Immutable BM25 index over a set of postings
+
+    Documents are numbered in job id order. Term t's postings are
+    ``postings_doc[term_offsets[t]:term_offsets[t + 1]]`` (document numbers)
+    with matching term frequencies in ``postings_tf``. ``doc_norm`` holds
+    the length-normalization part of the BM25 denominator per document.
+
+    On disk a segment is a directory holding ``meta.json`` (counts,
+    parameters, filter value dictionaries), ``terms.txt`` (one term per
+    line, in term-id order) and one ``.npy`` file per array.
+    """
+
+    ARRAYS = ('doc_ids', 'doc_norm', 'term_offsets', 'postings_doc', 'postings_tf') + \
+        tuple(f'{field}_codes' for field in FILTER_FIELDS)
+
+    def __init__(self, meta: Dict, terms: List[str], arrays: Dict[str, np.ndarray]):
+        self.meta = meta
+        self.terms = {term: i for i, term in enumerate(terms)}
+        self.term_list = terms
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+        self.filter_values = {field: {value: code for code, value in enumerate(values)}
+                              for field, values in meta['filters'].items()}
+        self.built_at = meta['built_at']
+        # Postings removed since the segment was built
+        self.live = np.ones(len(self.doc_ids), dtype=bool)
+
+    def __len__(self):
+        return int(self.live.sum())
+
+    @classmethod
+    def build(cls, documents: Iterable[Dict]) -> 'Segment':
+        """
+        Index documents with keys id, title, text and the FILTER_FIELDS
+
+        Documents must arrive in ascending id order.
+        """
+        postings = {}  # term -> ([doc], [tf])
+        doc_ids, doc_lengths = [], []
+        filter_values = {field: {'': 0} for field in FILTER_FIELDS}
+        filter_codes = {field: [] for field in FILTER_FIELDS}
+
+        for doc, document in enumerate(documents):
+            terms = analyze(document.get('title')) * TITLE_BOOST + analyze(document.get('text'))
+            for term, tf in Counter(terms).items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = ([], [])
+                entry[0].append(doc)
+                entry[1].append(tf)
+            doc_ids.append(document['id'])
+            doc_lengths.append(len(terms))
+            for field in FILTER_FIELDS:
+                values = filter_values[field]
+                value = normalize_filter_value(document.get(field))
+                filter_codes[field].append(values.setdefault(value, len(values)))
+
+        terms = sorted(postings)
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        term_offsets[1:] = np.cumsum([len(postings[term][0]) for term in terms])
+        postings_doc = np.fromiter((doc for term in terms for doc in postings[term][0]),
+                                   dtype=np.int32, count=int(term_offsets[-1]))
+        postings_tf = np.fromiter((min(tf, 65535) for term in terms for tf in postings[term][1]),
+                                  dtype=np.uint16, count=int(term_offsets[-1]))
+
+        lengths = np.asarray(doc_lengths, dtype=np.float32)
+        avgdl = float(lengths.mean()) if len(lengths) else 0.0
+        doc_norm = K1 * (1 - B + B * lengths / avgdl) if avgdl else np.full(len(lengths), K1, np.float32)
+
+        meta = {
+            'format': SEGMENT_FORMAT,
+            'doc_count': len(doc_ids),
+            'avgdl': avgdl,
+            'k1': K1,
+            'b': B,
+            'built_at': time.time(),
+            'filters': {field: sorted(values, key=values.get) for field, values in filter_values.items()},
+        }
+        arrays = {
+            'doc_ids': np.asarray(doc_ids, dtype=np.int64),
+            'doc_norm': doc_norm.astype(np.float32),
+            'term_offsets': term_offsets,
+            'postings_doc': postings_doc,
+            'postings_tf': postings_tf,
+        }
+        for field in FILTER_FIELDS:
+            arrays[f'{field}_codes'] = np.asarray(filter_codes[field], dtype=np.int32)
+        return cls(meta, terms, arrays)
+
+    def save(self, path: str):
+        """Write the segment to a new directory at path"""
+        os.makedirs(path)
+        for name in self.ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, name))
+        with open(os.path.join(path, 'terms.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.term_list))
+        # meta.json last: a directory without it is an unfinished write
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(self.meta, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'Segment':
+        """Open a saved segment; arrays are memory-mapped unless mmap=False"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('format') != SEGMENT_FORMAT:
+            raise ValueError(f"Unsupported search segment format {meta.get('format')} in {path}")
+        with open(os.path.join(path, 'terms.txt'), encoding='utf-8') as f:
+            content = f.read()
+        terms = content.split('\n') if content else []
+        arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None)
+                  for name in cls.ARRAYS}
+        return cls(meta, terms, arrays)
+
+    def remove(self, job_id: int):
+        """Hide a posting until the next build"""
+        doc = int(np.searchsorted(self.doc_ids, job_id))
+        if doc < len(self.doc_ids) and self.doc_ids[doc] == job_id:
+            self.live[doc] = False
+
+    def search(self, query: str, filters: Optional[Dict[str, Sequence[str]]] = None,
+               offset: int = 0, limit: int = 20) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        Rank postings for query
+
+        Args:
+            query: Free-text query
+            filters: field -> accepted values, for fields in FILTER_FIELDS
+            offset: Results to skip (pagination)
+            limit: Page size
+
+        Returns:
+            (total matching postings, [(job_id, score), ...] for the page)
+        """
+        term_ids = sorted({self.terms[term] for term in analyze(query) if term in self.terms})
+        if not term_ids or limit <= 0:
+            return 0, []
+
+        doc_count = self.meta['doc_count']
+        scores = np.zeros(doc_count, dtype=np.float32)
+        for term_id in term_ids:
+            start, stop = int(self.term_offsets[term_id]), int(self.term_offsets[term_id + 1])
+            docs = self.postings_doc[start:stop]
+            tf = self.postings_tf[start:stop].astype(np.float32)
+            df = stop - start
+            idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+            # A term lists each document once, so plain fancy-index addition is safe
+            scores[docs] += idf * tf * (K1 + 1) / (tf + self.doc_norm[docs])
+
+        mask = (scores > 0) & self.live
+        for field, values in (filters or {}).items():
+            known = self.filter_values[field]
+            codes = [known[value] for value in map(normalize_filter_value, values) if value in known]
+            mask &= np.isin(getattr(self, f'{field}_codes'), codes)
+
+        candidates = np.flatnonzero(mask)
+        total = len(candidates)
+        wanted = min(offset + limit, total)
+        if wanted <= offset:
+            return total, []
+
+        candidate_scores = scores[candidates]
+        if wanted < total:
+            # Partial sort: only the first `wanted` results are ordered
+            top = np.argpartition(-candidate_scores, wanted - 1)[:wanted]
+            candidates, candidate_scores = candidates[top], candidate_scores[top]
+        # Ties broken by job id so pages are stable
+        order = np.lexsort((self.doc_ids[candidates], -candidate_scores))[offset:wanted]
+        return total, [(int(self.doc_ids[candidates[i]]), round(float(candidate_scores[i]), 4)) for i in order]
+
+
+def load_search_documents() -> Iterable[Dict]:
+    """Searchable fields of every active posting, in id order"""
+    # Imported here: the app package imports this module while it is being set up
+    from app import db
+    from app.models import JobPosting
+
+    query = db.session.query(
+        JobPosting.id, JobPosting.title, JobPosting.company, JobPosting.description,
+        JobPosting.requirements, JobPosting.skills_required, JobPosting.location,
+        JobPosting.experience_level, JobPosting.employment_type,
+    ).filter(JobPosting.is_active.is_(True)).order_by(JobPosting.id)
+
+    for row in query.yield_per(1000):
+        yield {
+            'id': row.id,
+            'title': row.title,
+            'text': '\n'.join(filter(None, [row.company, ' '.join(row.skills_required or []),
+                                             row.description, row.requirements])),
+            'location': row.location,
+            'experience_level': row.experience_level,
+            'employment_type': row.employment_type,
+        }
+
+
+class JobSearch:
+    """
+    Per-process BM25 search over the active job postings
+
+    The current segment lives under SEARCH_INDEX_DIR as ``seg-<n>``
+    directories plus a ``CURRENT`` file naming the newest one, so workers
+    load a recent segment instead of rebuilding it. Deleted or deactivated
+    postings disappear from results as soon as the change commits; new and
+    edited postings trigger a rebuild in a background thread while the
+    previous segment keeps serving. The thread waits SEARCH_REBUILD_DELAY
+    seconds before each build, so a burst of edits costs one rebuild (and
+    one segment on disk) rather than one per edit. Segments older than
+    SEARCH_REFRESH_SECONDS are rebuilt on the next query.
+    """
+
+    def __init__(self, app=None):
+        self.root = None
+        self.refresh_seconds = 1800
+        self.rebuild_delay = 5
+        self._segment = None
+        self._lock = threading.Lock()
+        self._rebuilding = False
+        self._stale = False
+        self._removed = set()  # postings removed while a rebuild is running
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.root = os.path.abspath(app.config.get('SEARCH_INDEX_DIR', 'search_index'))
+        self.refresh_seconds = app.config.get('SEARCH_REFRESH_SECONDS', 1800)
+        self.rebuild_delay = app.config.get('SEARCH_REBUILD_DELAY', 5)
+        app.extensions['job_search'] = self
+        posting_events.subscribe('job_search')
+
+    def segment(self) -> Segment:
+        """Return the current segment, loading or building it when missing or expired"""
+        segment = self._segment
+        if segment is not None and time.time() - segment.built_at < self.refresh_seconds:
+            return segment
+
+        with self._lock:
+            segment = self._segment
+            if segment is None or time.time() - segment.built_at >= self.refresh_seconds:
+                segment = self._load_current()
+                if segment is None or time.time() - segment.built_at >= self.refresh_seconds:
+                    segment = self.build()
+                self._segment = segment
+            return segment
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Hold SEARCH_INDEX_DIR's lock, which orders CURRENT swaps and pruning across worker processes"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, 'LOCK'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _current_name(self) -> Optional[str]:
+        try:
+            with open(os.path.join(self.root, 'CURRENT')) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _load_current(self) -> Optional[Segment]:
+        try:
+            # Shared lock: the segment CURRENT names can't be pruned while it is opened
+            with self._locked(shared=True):
+                name = self._current_name()
+                if name is None:
+                    raise FileNotFoundError('no CURRENT segment')
+                return Segment.load(os.path.join(self.root, name))
+        except (OSError, ValueError) as e:
+            current_app.logger.info(f"No usable search segment on disk: {str(e)}")
+            return None
+
+    def build(self) -> Segment:
+        """Build a segment from the database and publish it as CURRENT unless a newer one already is"""
+        started = time.perf_counter()
+        # Named before reading the database, so a later name always holds later data
+        name = f'seg-{time.time_ns()}-{os.getpid()}'
+        segment = Segment.build(load_search_documents())
+
+        with self._locked():
+            current = self._current_name()
+            if current is None or current < name:
+                segment.save(os.path.join(self.root, name))
+                tmp_path = os.path.join(self.root, f'CURRENT.{os.getpid()}.tmp')
+                with open(tmp_path, 'w') as f:
+                    f.write(name)
+                os.replace(tmp_path, os.path.join(self.root, 'CURRENT'))
+                current = name
+            self._prune(keep=current)
+
+        current_app.logger.info(f"Built search segment {name}: {segment.meta['doc_count']} postings, "
+                                f"{len(segment.terms)} terms in {(time.perf_counter() - started) * 1000:.0f}ms"
+                                + ('' if current == name else f" (kept newer {current} as CURRENT)"))
+        return segment
+
+    def _prune(self, keep: str):
+        """
+        Remove segments older than keep, the one CURRENT names
+
+        Called under _locked(), so no other process is between saving a
+        segment and pointing CURRENT at it. Readers that still map a
+        removed segment keep their open files.
+        """
+        for name in os.listdir(self.root):
+            if name.startswith('seg-') and name < keep:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def apply(self, changes: Dict[int, Optional[posting_events.PostingChange]]):
+        """Hide removed postings now; rebuild in the background for new or edited ones"""
+        segment = self._segment
+        if segment is None:
+            return
+        stale = False
+        with self._lock:
+            for job_id, change in changes.items():
+                if change is None or not change.is_active:
+                    segment.remove(job_id)
+                    self._removed.add(job_id)
+                else:
+                    stale = True
+            if not stale:
+                return
+            self._stale = True
+            if self._rebuilding:
+                # The running rebuild sees _stale before it stops and goes round again
+                return
+            self._rebuilding = True
+        self._rebuild_in_background(current_app._get_current_object())
+
+    def _rebuild_in_background(self, app):
+        """Rebuild until no change is pending; the caller has set _rebuilding"""
+
+        def rebuild():
+            with app.app_context():
+                try:
+                    while True:
+                        # Let further edits arrive so one build covers them all
+                        time.sleep(self.rebuild_delay)
+                        with self._lock:
+                            # Checked and cleared together with _rebuilding, so a change
+                            # made after this either is seen here or starts a new thread
+                            if not self._stale:
+                                self._rebuilding = False
+                                return
+                            self._stale = False
+                            self._removed = set()
+                        segment = self.build()
+                        with self._lock:
+                            # The build may have read postings removed while it ran
+                            for job_id in self._removed:
+                                segment.remove(job_id)
+                            self._segment = segment
+                except Exception as e:
+                    app.logger.error(f"Error rebuilding search segment: {str(e)}")
+                    with self._lock:
+                        # Retried with the next change
+                        self._stale = True
+                        self._rebuilding = False
+
+        threading.Thread(target=rebuild, name='job-search-rebuild', daemon=True).start()
+
+    def search(self, query: str, filters: Optional[Dict[str, Sequence[str]]] = None,
+               offset: int = 0, limit: int = 20) -> Tuple[int, List[Tuple[int, float]]]:
+        return self.segment().search(query, filters, offset, limit)
+
+
+def get_job_search() -> JobSearch:
+    """Return the search index registered on the current app"""
+    return current_app.extensions['job_search']
@@ -0,0 +1,440 @@
+# app/services/semantic.py - Offline semantic matching: hashed character n-gram embeddings + IVF search
+import math
+import os
+import threading
+import time
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
+from flask import current_app
+from app.services import posting_events
+from app.services.search import analyze
+from app.services.snapshot import open_current_snapshot, publish_snapshot
+
+# Word feature vectors kept by an embedder before its cache is cleared
+WORD_CACHE_SIZE = 200000
+
+
+class HashingEmbedder:
+    """
+    Deterministic text embedder using the hashing trick
+
+    Each analyzed word (see search.analyze, which also folds skill aliases
+    such as ml -> machine learning) is represented by its character
+    n-grams, padded as ``<word>``, plus the whole padded word. Every
+    feature is hashed with CRC32 into one of ``dim`` buckets with a hashed
+    sign, so spelling variants ("postgres", "postgresql") share most of
+    their buckets. A text is the sum of its word vectors weighted by
+    1 + log(tf), L2-normalized, so cosine similarity is a dot product.
+    No vocabulary or training: the same text gives the same vector in
+    every process.
+    """
+
+    def __init__(self, dim: int = 256, min_n: int = 3, max_n: int = 5):
+        self.dim = dim
+        self.min_n = min_n
+        self.max_n = max_n
+        self._words: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def params(self) -> Dict:
+        return {'dim': self.dim, 'min_n': self.min_n, 'max_n': self.max_n}
+
+    def _word_features(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(buckets, signed unit-norm weights) of a word's features"""
+        features = self._words.get(word)
+        if features is not None:
+            return features
+
+        padded = f'<{word}>'
+        grams = [padded]
+        for n in range(self.min_n, self.max_n + 1):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        hashes = np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint32, count=len(grams))
+        buckets = (hashes % self.dim).astype(np.int64)
+        signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+        features = (buckets, signs / np.float32(math.sqrt(len(grams))))
+
+        if len(self._words) >= WORD_CACHE_SIZE:
+            self._words = {}
+        self._words[word] = features
+        return features
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        buckets, weights = [], []
+        for word, count in Counter(analyze(text)).items():
+            word_buckets, word_weights = self._word_features(word)
+            buckets.append(word_buckets)
+            weights.append(word_weights * np.float32(1 + math.log(count)))
+        if not buckets:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        return np.concatenate(buckets), np.concatenate(weights)
+
+    def embed(self, text: str) -> np.ndarray:
+        """Unit-length float32 vector of text (all zeros when it has no words)"""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed several texts at once; returns a (len(texts), dim) float32 array"""
+        buckets, weights = [], []
+        for row, text in enumerate(texts):
+            text_buckets, text_weights = self._features(text)
+            buckets.append(text_buckets + row * self.dim)
+            weights.append(text_weights)
+        size = len(texts) * self.dim
+        if not size:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        vectors = np.bincount(np.concatenate(buckets), np.concatenate(weights), minlength=size) \
+            .astype(np.float32).reshape(len(texts), self.dim)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+
+def _spherical_kmeans(sample: np.ndarray, clusters: int, iterations: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """Unit-length centroids of unit-length sample rows (cosine k-means)"""
+    centroids = sample[rng.choice(len(sample), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = _nearest(sample, centroids)
+        order = np.argsort(assignment, kind='stable')
+        counts = np.bincount(assignment, minlength=clusters)
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        starts = np.cumsum(counts) - counts
+        sums[~empty] = np.add.reduceat(sample[order], starts[~empty], axis=0)
+        # Re-seed clusters that lost all their points
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = np.divide(sums, norms, out=sums, where=norms > 0)
+    return centroids
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, batch_size: int = 16384) -> np.ndarray:
+    """Index of the most similar centroid for every row"""
+    assignment = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch_size):
+        assignment[start:start + batch_size] = np.argmax(vectors[start:start + batch_size] @ centroids.T, axis=1)
+    return assignment
+
+
+class _IndexView(NamedTuple):
+    """A VectorIndex's arrays as of one moment, consistent with each other"""
+    list_offsets: np.ndarray
+    vectors: np.ndarray
+    ids: np.ndarray
+    live: np.ndarray
+    delta_ids: np.ndarray
+    delta_vectors: np.ndarray
+
+
+class VectorIndex:
+    """
+    Inverted-file (IVF) index for cosine nearest-neighbour search
+
+    Vectors are clustered around ``nlist`` k-means centroids (about
+    sqrt(n) of them) and stored grouped by cluster: cluster c's rows are
+    ``vectors[list_offsets[c]:list_offsets[c + 1]]`` with their job ids in
+    ``ids``. A query scores the centroids, then only the rows of the
+    ``nprobe`` closest clusters, so it reads roughly nprobe / nlist of the
+    vectors. Indexes under MIN_CLUSTERED vectors use a single cluster,
+    i.e. exact search.
+
+    Vectors added after the build go to a small delta that is scanned in
+    full; once it outgrows a fraction of the index it is merged into the
+    clusters (without re-training the centroids). Removed rows are masked.
+    """
+
+    SNAPSHOT_KIND = 'semantic-index'
+
+    MIN_CLUSTERED = 4096
+
+    def __init__(self, centroids: np.ndarray, list_offsets: np.ndarray, vectors: np.ndarray, ids: np.ndarray):
+        self.built_at = time.time()
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.vectors = vectors
+        self.ids = ids
+        self._live = np.ones(len(ids), dtype=bool)
+        self._row = dict(zip(ids.tolist(), range(len(ids))))
+        self._delta: Dict[int, np.ndarray] = {}
+        self._delta_arrays = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, ids: Sequence[int], vectors: np.ndarray, nlist: Optional[int] = None,
+              iterations: int = 10, seed: int = 0) -> 'VectorIndex':
+        """Cluster unit-length vectors (one row per id) and index them"""
+        ids = np.asarray(ids, dtype=np.int64)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        if nlist is None:
+            nlist = 1 if len(ids) < cls.MIN_CLUSTERED else int(math.sqrt(len(ids)))
+        nlist = max(1, min(nlist, len(ids)))
+
+        if nlist == 1:
+            centroid = vectors.sum(axis=0, keepdims=True) if len(ids) else np.zeros((1, dim), dtype=np.float32)
+            return cls(centroid, np.array([0, len(ids)], dtype=np.int64), vectors, ids)
+
+        rng = np.random.default_rng(seed)
+        # A few dozen points per cluster are enough to place the centroids
+        sample_size = min(len(ids), 64 * nlist)
+        sample = vectors[rng.choice(len(ids), sample_size, replace=False)]
+        centroids = _spherical_kmeans(sample, nlist, iterations, rng)
+        return cls._grouped(centroids, ids, vectors)
+
+    @classmethod
+    def _grouped(cls, centroids: np.ndarray, ids: np.ndarray, vectors: np.ndarray) -> 'VectorIndex':
+        assignment = _nearest(vectors, centroids)
+        order = np.argsort(assignment, kind='stable')
+        list_offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(centroids)), out=list_offsets[1:])
+        return cls(centroids, list_offsets, vectors[order], ids[order])
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def __len__(self):
+        with self._lock:
+            return int(self._live.sum()) + len(self._delta)
+
+    def __contains__(self, job_id):
+        with self._lock:
+            row = self._row.get(job_id)
+            return job_id in self._delta or (row is not None and bool(self._live[row]))
+
+    def add(self, job_id: int, vector: np.ndarray):
+        """Index a vector for job_id, replacing any previous one"""
+        with self._lock:
+            self._remove(job_id)
+            self._delta[job_id] = np.asarray(vector, dtype=np.float32)
+            self._delta_arrays = None
+
+    def remove(self, job_id: int):
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: int):
+        row = self._row.get(job_id)
+        if row is not None:
+            self._live[row] = False
+        if self._delta.pop(job_id, None) is not None:
+            self._delta_arrays = None
+
+    def _delta_matrix(self) -> _IndexView:
+        """
+        The clustered arrays and the delta as matrices, taken together
+
+        A merge replaces list_offsets, vectors, ids and the live mask at
+        once, so readers work from one view rather than the attributes.
+        """
+        with self._lock:
+            if self._delta_arrays is None:
+                if len(self._delta) > max(1024, len(self.ids) // 16):
+                    self._merge_delta()
+                dim = self.centroids.shape[1]
+                ids = np.fromiter(self._delta.keys(), dtype=np.int64, count=len(self._delta))
+                vectors = np.array(list(self._delta.values()), dtype=np.float32).reshape(len(ids), dim)
+                self._delta_arrays = (ids, vectors)
+            return _IndexView(self.list_offsets, self.vectors, self.ids, self._live, *self._delta_arrays)
+
+    def _merge_delta(self):
+        """Move delta vectors into the clusters, dropping removed rows"""
+        merged = VectorIndex._grouped(
+            self.centroids,
+            np.concatenate([self.ids[self._live], np.fromiter(self._delta.keys(), dtype=np.int64)]),
+            np.concatenate([self.vectors[self._live], np.array(list(self._delta.values()), dtype=np.float32)]),
+        )
+        self.list_offsets, self.vectors, self.ids = merged.list_offsets, merged.vectors, merged.ids
+        self._live, self._row = merged._live, merged._row
+        self._delta = {}
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: int = 8) -> List[Tuple[int, float]]:
+        """Approximate top k (job id, cosine similarity), best first"""
+        query = np.asarray(query, dtype=np.float32)
+        view = self._delta_matrix()
+        list_offsets = view.list_offsets
+
+        nprobe = min(max(nprobe, 1), self.nlist)
+        if nprobe < self.nlist:
+            probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            ranges = [(list_offsets[c], list_offsets[c + 1]) for c in probe]
+        else:
+            ranges = [(0, list_offsets[-1])]
+        return self._top_k(view, ranges, query, k)
+
+    def search_exact(self, query: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        """Exact top k by scanning every vector (the reference for recall)"""
+        view = self._delta_matrix()
+        return self._top_k(view, [(0, len(view.ids))], np.asarray(query, dtype=np.float32), k)
+
+    @staticmethod
+    def _top_k(view: _IndexView, ranges: List[Tuple[int, int]], query: np.ndarray,
+               k: int) -> List[Tuple[int, float]]:
+        # Clusters are contiguous row ranges, scored in place without gathering rows
+        scores = np.concatenate([view.vectors[start:end] @ query for start, end in ranges] +
+                                [view.delta_vectors @ query])
+        ids = np.concatenate([view.ids[start:end] for start, end in ranges] + [view.delta_ids])
+        live = np.concatenate([view.live[start:end] for start, end in ranges] +
+                              [np.ones(len(view.delta_ids), dtype=bool)])
+        scores[~live] = -np.inf
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[top], scores[top]
+        order = np.lexsort((ids, -scores))
+        return [(int(ids[i]), round(float(scores[i]), 6)) for i in order if scores[i] > -np.inf]
+
+    def to_snapshot(self) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """Arrays and metadata for snapshot.publish_snapshot (delta merged, removed rows dropped)"""
+        view = self._delta_matrix()
+        index = VectorIndex._grouped(self.centroids,
+                                     np.concatenate([view.ids[view.live], view.delta_ids]),
+                                     np.concatenate([view.vectors[view.live], view.delta_vectors]))
+        arrays = {
+            'centroids': index.centroids,
+            'list_offsets': index.list_offsets,
+            'vectors': index.vectors,
+            'ids': index.ids,
+        }
+        return arrays, {'built_at': self.built_at}
+
+    @classmethod
+    def from_snapshot(cls, arrays: Dict[str, np.ndarray], meta: Dict) -> 'VectorIndex':
+        """Index over a snapshot's (read-only, possibly memory-mapped) arrays"""
+        index = cls(arrays['centroids'], arrays['list_offsets'], arrays['vectors'], arrays['ids'])
+        index.built_at = meta['built_at']
+        return index
+
+
+def posting_text(title, skills_required, requirements, description) -> str:
+    """The text a posting is embedded from"""
+    return '\n'.join(filter(None, [title, ' '.join(skills_required or []), requirements, description]))
+
+
+def load_posting_texts() -> Iterable[Tuple[int, str]]:
+    """(id, text) of every active posting, in id order"""
+    # Imported here: the app package imports this module while it is being set up
+    from app import db
+    from app.models import JobPosting
+
+    query = db.session.query(JobPosting.id, JobPosting.title, JobPosting.skills_required,
+                             JobPosting.requirements, JobPosting.description) \
+        .filter(JobPosting.is_active.is_(True)).order_by(JobPosting.id)
+    for row in query.yield_per(1000):
+        yield row.id, posting_text(row.title, row.skills_required, row.requirements, row.description)
+
+
+class SemanticMatcher:
+    """
+    Per-process VectorIndex of hashed embeddings of the active job postings
+
+    Matches free text (a resume, a list of skills) by meaning rather than
+    exact skill tokens, without any network calls. Loaded like JobMatcher:
+    from the current snapshot under INDEX_SNAPSHOT_DIR when it is recent
+    and was embedded with the configured parameters, else built from the
+    database; committed posting changes are applied in place.
+    """
+
+    def __init__(self, app=None):
+        self.refresh_seconds = 1800
+        self.snapshot_dir = None
+        self.nprobe = 8
+        self.embedder = HashingEmbedder()
+        self._index = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get('JOB_MATCH_REFRESH_SECONDS', 1800)
+        self.snapshot_dir = os.path.abspath(app.config.get('INDEX_SNAPSHOT_DIR', 'index_snapshots'))
+        self.nprobe = app.config.get('SEMANTIC_NPROBE', 8)
+        self.embedder = HashingEmbedder(dim=app.config.get('SEMANTIC_DIM', 256))
+        app.extensions['semantic_matcher'] = self
+        posting_events.subscribe('semantic_matcher')
+
+    def _expired(self, index: Optional[VectorIndex]) -> bool:
+        return index is None or time.time() - index.built_at >= self.refresh_seconds
+
+    def index(self) -> VectorIndex:
+        """Return the current index, loading or building it when missing or due for a refresh"""
+        index = self._index
+        if not self._expired(index):
+            return index
+
+        with self._lock:
+            index = self._index
+            if self._expired(index):
+                index = self._open_snapshot()
+                if self._expired(index):
+                    started = time.perf_counter()
+                    index = self._build()
+                    current_app.logger.info(f"Built semantic index: {len(index)} postings, "
+                                            f"{index.nlist} clusters in "
+                                            f"{(time.perf_counter() - started) * 1000:.0f}ms")
+                self._index = index
+            return index
+
+    def _build(self, batch_size: int = 10000) -> VectorIndex:
+        ids, batches, texts = [], [], []
+        for job_id, text in load_posting_texts():
+            ids.append(job_id)
+            texts.append(text)
+            if len(texts) == batch_size:
+                batches.append(self.embedder.embed_many(texts))
+                texts = []
+        batches.append(self.embedder.embed_many(texts))
+        return VectorIndex.build(ids, np.concatenate(batches))
+
+    def _open_snapshot(self) -> Optional[VectorIndex]:
+        started = time.perf_counter()
+        try:
+            snapshot = open_current_snapshot(self.snapshot_dir, VectorIndex.SNAPSHOT_KIND)
+            if snapshot is None:
+                return None
+            if snapshot.meta.get('embedder') != self.embedder.params:
+                raise ValueError(f"embedded with {snapshot.meta.get('embedder')}, "
+                                 f"configured {self.embedder.params}")
+            index = VectorIndex.from_snapshot(snapshot.arrays, snapshot.meta)
+        except (OSError, ValueError, KeyError) as e:
+            current_app.logger.warning(f"Ignoring semantic index snapshot: {str(e)}")
+            return None
+        current_app.logger.info(f"Opened semantic index snapshot {snapshot.path}: {len(index)} postings in "
+                                f"{(time.perf_counter() - started) * 1000:.0f}ms")
+        return index
+
+    def write_snapshot(self) -> str:
+        """Build the index from the database, publish it as the current snapshot and use it"""
+        index = self._build()
+        arrays, meta = index.to_snapshot()
+        meta['embedder'] = self.embedder.params
+        path = publish_snapshot(self.snapshot_dir, VectorIndex.SNAPSHOT_KIND, arrays, meta)
+        self._index = index
+        return path
+
+    def apply(self, changes: Dict[int, Optional[posting_events.PostingChange]]):
+        """Apply committed posting changes; see posting_events.subscribe"""
+        index = self._index
+        if index is None:
+            return
+        for job_id, change in changes.items():
+            if change is None or not change.is_active:
+                index.remove(job_id)
+            else:
+                text = posting_text(change.title, change.skills_required, change.requirements, change.description)
+                index.add(job_id, self.embedder.embed(text))
+
+    def match_text(self, text: str, k: int = 10) -> List[Dict]:
+        """Postings most similar to text, best first (unrelated ones, scoring 0 or less, left out)"""
+        vector = self.embedder.embed(text)
+        if not vector.any():
+            return []
+        return [{'job_id': job_id, 'score': score}
+                for job_id, score in self.index().search(vector, k, self.nprobe) if score > 0]
+
+
+def get_semantic_matcher() -> SemanticMatcher:
+    """Return the semantic matcher registered on the current app"""
+    return current_app.extensions['semantic_matcher']
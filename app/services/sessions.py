@@ -0,0 +1,228 @@
+# app/services/sessions.py - Server-side Flask sessions: the cookie carries only an opaque ID
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+def _storage_key(sid: str) -> str:
+    """Stores index sessions by a hash of the ID, so reading the store does not yield usable cookies"""
+    return hashlib.sha256(sid.encode('ascii', 'replace')).hexdigest()
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session data loaded from a store; tracks changes so unchanged sessions are not written back"""
+
+    def __init__(self, initial=None, sid: Optional[str] = None, expires_at: Optional[float] = None):
+        def on_update(session):
+            session.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.new = sid is None
+        self.modified = False
+        self.previous_sid = None
+
+    def regenerate(self):
+        """Move the data to a fresh ID when the response is saved (call on login, against session fixation)"""
+        if self.sid and not self.previous_sid:
+            self.previous_sid = self.sid
+        self.sid = None
+        self.modified = True
+
+
+class DatabaseSessionStore:
+    """Sessions in the app database (ServerSession), written on their own connection"""
+
+    def _table(self):
+        # Imported here: the app package imports this module while it is being set up
+        from app.models import ServerSession
+        return ServerSession.__table__
+
+    def _engine(self):
+        from app import db
+        return db.engine
+
+    def load(self, key: str) -> Optional[Tuple[str, float]]:
+        table = self._table()
+        with self._engine().connect() as connection:
+            row = connection.execute(
+                table.select().with_only_columns(table.c.data, table.c.expires_at).where(table.c.id == key)
+            ).first()
+        return (row.data, row.expires_at.replace(tzinfo=timezone.utc).timestamp()) if row else None
+
+    def save(self, key: str, data: str, expires_at: float):
+        # Not through db.session, so saving a session never commits a view's pending work
+        table = self._table()
+        values = {'data': data, 'expires_at': datetime.utcfromtimestamp(expires_at)}
+        with self._engine().begin() as connection:
+            updated = connection.execute(table.update().where(table.c.id == key).values(**values)).rowcount
+            if not updated:
+                connection.execute(table.insert().values(id=key, **values))
+
+    def delete(self, key: str):
+        table = self._table()
+        with self._engine().begin() as connection:
+            connection.execute(table.delete().where(table.c.id == key))
+
+    def sweep(self) -> int:
+        """Delete expired sessions; returns how many"""
+        table = self._table()
+        with self._engine().begin() as connection:
+            return connection.execute(table.delete().where(table.c.expires_at < datetime.utcnow())).rowcount
+
+
+class SQLiteSessionStore:
+    """Sessions in a local SQLite file, for single-host deployments; one connection per thread"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS sessions '
+                               '(id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_sessions_expires_at ON sessions (expires_at)')
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            # Readers don't block the writer (and vice versa) across worker processes
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+    def load(self, key: str) -> Optional[Tuple[str, float]]:
+        row = self._connection().execute('SELECT data, expires_at FROM sessions WHERE id = ?', (key,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def save(self, key: str, data: str, expires_at: float):
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO sessions (id, data, expires_at) VALUES (?, ?, ?)',
+                               (key, data, expires_at))
+
+    def delete(self, key: str):
+        with self._connection() as connection:
+            connection.execute('DELETE FROM sessions WHERE id = ?', (key,))
+
+    def sweep(self) -> int:
+        with self._connection() as connection:
+            return connection.execute('DELETE FROM sessions WHERE expires_at < ?', (time.time(),)).rowcount
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Keep session data in a store; the cookie holds a random 256-bit ID
+
+    Unchanged sessions are not written back, except to push their expiry
+    out once less than half of PERMANENT_SESSION_LIFETIME remains. Expired
+    sessions are swept from the store at most every sweep_seconds, during
+    a save, and by `flask sweep-sessions`.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, sweep_seconds: int = 3600):
+        self.store = store
+        self.sweep_seconds = sweep_seconds
+        self._last_sweep = time.time()
+
+    def open_session(self, app, request) -> ServerSideSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            record = self.store.load(_storage_key(sid))
+            if record and record[1] > time.time():
+                try:
+                    return ServerSideSession(self.serializer.loads(record[0]), sid, record[1])
+                except ValueError:
+                    app.logger.warning('Discarding unreadable server-side session')
+        return ServerSideSession()
+
+    def save_session(self, app, session: ServerSideSession, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+        if session.previous_sid:
+            self.store.delete(_storage_key(session.previous_sid))
+            session.previous_sid = None
+
+        if not session:
+            if session.sid:
+                self.store.delete(_storage_key(session.sid))
+                response.delete_cookie(name, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                                       partitioned=self.get_cookie_partitioned(app),
+                                       httponly=self.get_cookie_httponly(app),
+                                       samesite=self.get_cookie_samesite(app))
+            return
+
+        now = time.time()
+        lifetime = app.permanent_session_lifetime.total_seconds()
+        expiring = session.expires_at is None or session.expires_at - now < lifetime / 2
+        if not (session.modified or expiring):
+            return
+
+        if session.sid is None:
+            session.sid = secrets.token_urlsafe(32)
+        session.expires_at = now + lifetime
+        self.store.save(_storage_key(session.sid), self.serializer.dumps(dict(session)), session.expires_at)
+        response.set_cookie(name, session.sid, expires=self.get_expiration_time(app, session),
+                            httponly=self.get_cookie_httponly(app), domain=domain, path=path,
+                            secure=self.get_cookie_secure(app), partitioned=self.get_cookie_partitioned(app),
+                            samesite=self.get_cookie_samesite(app))
+
+        if now - self._last_sweep >= self.sweep_seconds:
+            self._last_sweep = now
+            try:
+                swept = self.store.sweep()
+                app.logger.info(f"Swept {swept} expired sessions")
+            except Exception as e:
+                app.logger.warning(f"Session sweep failed: {str(e)}")
+
+
+class ServerSessions:
+    """
+    Installs the server-side session interface on the app
+
+    SESSION_BACKEND selects the store: "database" (default, the
+    server_sessions table), "sqlite" (a local file at SESSION_SQLITE_PATH)
+    or "cookie" (Flask's signed cookie sessions, unchanged).
+    """
+
+    def __init__(self, app=None):
+        self.interface = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('SESSION_BACKEND', 'database')
+        if backend == 'database':
+            store = DatabaseSessionStore()
+        elif backend == 'sqlite':
+            store = SQLiteSessionStore(os.path.abspath(app.config.get('SESSION_SQLITE_PATH', 'sessions.sqlite3')))
+        elif backend == 'cookie':
+            store = None
+        else:
+            raise ValueError(f"Unknown SESSION_BACKEND {backend!r}")
+        if store is not None:
+            self.interface = ServerSideSessionInterface(store, app.config.get('SESSION_SWEEP_SECONDS', 3600))
+            app.session_interface = self.interface
+        app.extensions['server_sessions'] = self
+
+    def sweep(self) -> int:
+        """Delete expired sessions from the store (0 for cookie sessions)"""
+        return self.interface.store.sweep() if self.interface else 0
@@ -0,0 +1,161 @@
+# app/services/skill_taxonomy.py - Canonical skills, their aliases, and one-pass skill matching
+import os
+import re
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Canonical skills and aliases shipped with the app, loaded at import
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'skills.txt')
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split free text into lower-case tokens, keeping skill punctuation (c++, node.js, c#)"""
+    return [token.rstrip('.-') for token in _TOKEN_RE.findall((text or '').lower())]
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over token sequences
+
+    Phrases are stored as paths of tokens, so matches always fall on word
+    boundaries and a phrase may span several words ("machine learning").
+    find() walks the text's tokens once, following failure links instead
+    of backtracking, and reports every phrase that occurs, overlapping
+    ones included, so its cost is linear in the text whatever the number
+    of phrases. Phrases can be added at any time; the failure links are
+    rebuilt on the next find().
+    """
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]  # node -> token -> child node
+        self._output: List[Optional[str]] = [None]  # node -> skill of the phrase ending there
+        self._fail: List[int] = []  # node -> longest proper suffix node
+        self._link: List[int] = []  # node -> nearest suffix node with an output (0 = none)
+        self._built = False
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return sum(output is not None for output in self._output)
+
+    def add(self, phrase: str, skill: Optional[str] = None):
+        """Report skill (default: phrase) wherever the tokens of phrase occur"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return
+        with self._lock:
+            node = 0
+            for token in tokens:
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = self._goto[node][token] = len(self._goto)
+                    self._goto.append({})
+                    self._output.append(None)
+                node = child
+            self._output[node] = skill or phrase
+            self._built = False
+
+    def _build(self):
+        """Breadth-first pass setting every node's failure and output links"""
+        fail = [0] * len(self._goto)
+        link = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                state = fail[node]
+                while state and token not in self._goto[state]:
+                    state = fail[state]
+                fail[child] = self._goto[state].get(token, 0)
+                link[child] = fail[child] if self._output[fail[child]] is not None else link[fail[child]]
+                queue.append(child)
+        self._fail, self._link = fail, link
+        self._built = True
+
+    def find(self, text: str) -> List[str]:
+        """Skills of every phrase in text, each once, in the order their first mention ends"""
+        with self._lock:
+            if not self._built:
+                self._build()
+            goto, fail, link, output = self._goto, self._fail, self._link, self._output
+            found = {}
+            node = 0
+            for token in tokenize(text):
+                while node and token not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(token, 0)
+                match = node if output[node] is not None else link[node]
+                while match:
+                    found.setdefault(output[match], None)
+                    match = link[match]
+            return list(found)
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills and the aliases that fold onto them
+
+    Loaded from a text file with one canonical skill per line followed by
+    its aliases, separated by ``|``; blank lines and ``#`` comments are
+    ignored. Everything is stored lower-cased with whitespace collapsed.
+    A name (skill or alias) written with a leading ``~`` is ambiguous in
+    prose: normalize() resolves it, but matchers never look for it.
+    """
+
+    def __init__(self, entries: Dict[str, Iterable[str]]):
+        self.skills: List[str] = []
+        self.aliases: Dict[str, str] = {}  # alias -> canonical skill
+        self.unmatched = set()  # names left out of free-text matching
+        for skill, aliases in entries.items():
+            skill = self._add_name(skill)
+            self.skills.append(skill)
+            for alias in aliases:
+                self.aliases[self._add_name(alias)] = skill
+
+    def _add_name(self, name: str) -> str:
+        name = _clean(name)
+        if name.startswith('~'):
+            name = name[1:].strip()
+            self.unmatched.add(name)
+        return name
+
+    @classmethod
+    def load(cls, path: str) -> 'SkillTaxonomy':
+        entries = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                # Only whole-line comments: skills such as c# contain '#'
+                if not line or line.startswith('#'):
+                    continue
+                skill, *aliases = (part.strip() for part in line.split('|'))
+                entries[skill] = [alias for alias in aliases if alias]
+        return cls(entries)
+
+    def normalize(self, skill: str) -> str:
+        """Lower-case, collapse whitespace and resolve aliases"""
+        skill = _clean(skill).strip('.,;:')
+        return self.aliases.get(skill, skill)
+
+    def matcher(self, extra_skills: Iterable[str] = ()) -> SkillMatcher:
+        """Matcher for the canonical skills, their aliases and extra_skills (already normalized)"""
+        matcher = SkillMatcher()
+        for skill in self.skills:
+            if skill not in self.unmatched:
+                matcher.add(skill)
+        for alias, skill in self.aliases.items():
+            if alias not in self.unmatched:
+                matcher.add(alias, skill)
+        for skill in extra_skills:
+            if skill not in self.unmatched:
+                matcher.add(skill)
+        return matcher
+
+
+def _clean(text: str) -> str:
+    return ' '.join(str(text or '').lower().split())
+
+
+TAXONOMY = SkillTaxonomy.load(DEFAULT_TAXONOMY_PATH)
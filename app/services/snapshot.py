@@ -0,0 +1,142 @@
+# app/services/snapshot.py - Versioned, memory-mapped array snapshots
+import json
+import mmap
+import os
+import struct
+import time
+from typing import Dict, Optional
+import numpy as np
+
+MAGIC = b'HJMSNAP\x00'
+FORMAT_VERSION = 1
+
+# Arrays start on cache-line boundaries
+ALIGNMENT = 64
+
+_HEADER_LENGTH = struct.Struct('<Q')
+
+
+def _aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_snapshot(path: str, kind: str, arrays: Dict[str, np.ndarray], meta: Dict):
+    """
+    Write arrays and JSON metadata to a single snapshot file
+
+    Layout: MAGIC, the header length (uint64 little-endian), a JSON header
+    describing every array (dtype, shape, offset from the data start), then
+    the raw array data, each array aligned to ALIGNMENT bytes. The file is
+    written next to path and renamed into place.
+    """
+    table = {}
+    offset = 0
+    for name, value in arrays.items():
+        offset = _aligned(offset)
+        table[name] = {'dtype': value.dtype.str, 'shape': list(value.shape), 'offset': offset}
+        offset += value.nbytes
+
+    header = json.dumps({
+        'format': FORMAT_VERSION,
+        'kind': kind,
+        'created_at': time.time(),
+        'meta': meta,
+        'arrays': table,
+    }).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + _HEADER_LENGTH.size + len(header))
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            for name, value in arrays.items():
+                f.seek(data_start + table[name]['offset'])
+                f.write(np.ascontiguousarray(value).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class Snapshot:
+    """
+    A snapshot file opened read-only
+
+    Arrays are NumPy views straight onto a shared read-only mapping of the
+    file, so every process that opens the same snapshot shares its pages
+    through the OS page cache and opening costs no copying.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            # The mapping stays valid after the file is closed
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a snapshot file")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._map[header_start:header_start + header_length])
+        if header.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {header.get('format')} in {path}")
+
+        self.kind = header['kind']
+        self.created_at = header['created_at']
+        self.meta = header['meta']
+        data_start = _aligned(header_start + header_length)
+        self.arrays = {}
+        for name, spec in header['arrays'].items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            if not count:
+                self.arrays[name] = np.zeros(spec['shape'], dtype=dtype)
+                continue
+            self.arrays[name] = np.frombuffer(self._map, dtype=dtype, count=count,
+                                              offset=data_start + spec['offset']).reshape(spec['shape'])
+
+
+def publish_snapshot(root: str, kind: str, arrays: Dict[str, np.ndarray], meta: Dict, keep: int = 2) -> str:
+    """
+    Write a new snapshot version under root and make it the current one
+
+    Versions are named ``<kind>-<time_ns>.snap``; ``<kind>.CURRENT`` names
+    the newest. Only the newest ``keep`` versions are kept on disk (open
+    mappings of removed files stay valid).
+    """
+    os.makedirs(root, exist_ok=True)
+    name = f'{kind}-{time.time_ns()}.snap'
+    write_snapshot(os.path.join(root, name), kind, arrays, meta)
+
+    pointer = os.path.join(root, f'{kind}.CURRENT')
+    tmp_path = f'{pointer}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(name)
+    os.replace(tmp_path, pointer)
+
+    versions = sorted(entry for entry in os.listdir(root)
+                      if entry.startswith(f'{kind}-') and entry.endswith('.snap'))
+    for old in versions[:-keep]:
+        try:
+            os.remove(os.path.join(root, old))
+        except OSError:
+            pass
+    return os.path.join(root, name)
+
+
+def open_current_snapshot(root: str, kind: str) -> Optional[Snapshot]:
+    """Open the current snapshot of kind under root, or None if there is none"""
+    try:
+        with open(os.path.join(root, f'{kind}.CURRENT')) as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    snapshot = Snapshot(os.path.join(root, name))
+    if snapshot.kind != kind:
+        raise ValueError(f"{snapshot.path} holds a {snapshot.kind} snapshot, not {kind}")
+    return snapshot
@@ -0,0 +1,128 @@
+# app/services/tts.py - Gemini text-to-speech helpers
+import math
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Callable, Dict, List, Optional
+from flask import current_app
+from google.genai import types
+
+TTS_MODEL = "gemini-2.5-flash-preview-tts"
+DEFAULT_VOICE = 'Kore'
+INTERVIEWER_PROMPT = "Say in a professional, friendly interviewer tone: {text}"
+CHEERFUL_PROMPT = "Say cheerfully: {text}"
+
+
+def wave_file(filename, pcm, channels=1, rate=24000, sample_width=2):
+    """Save PCM data as a wave file"""
+    with wave.open(filename, "wb") as wf:
+        wf.setnchannels(channels)
+        wf.setsampwidth(sample_width)
+        wf.setframerate(rate)
+        wf.writeframes(pcm)
+
+
+def build_speech_config(voice_name: str = DEFAULT_VOICE, timeout: Optional[float] = None) -> types.GenerateContentConfig:
+    """Build the GenerateContentConfig for an audio-only TTS request"""
+    kwargs = {}
+    if timeout:
+        # HttpOptions.timeout is expressed in milliseconds
+        kwargs['http_options'] = types.HttpOptions(timeout=int(timeout * 1000))
+
+    return types.GenerateContentConfig(
+        response_modalities=["AUDIO"],
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                    voice_name=voice_name,
+                )
+            )
+        ),
+        **kwargs
+    )
+
+
+def extract_audio_data(response) -> Optional[bytes]:
+    """Return the inline PCM payload of a TTS response, or None if it has none"""
+    if (response.candidates and
+        len(response.candidates) > 0 and
+        response.candidates[0].content and
+        response.candidates[0].content.parts and
+        len(response.candidates[0].content.parts) > 0 and
+        response.candidates[0].content.parts[0].inline_data):
+        return response.candidates[0].content.parts[0].inline_data.data
+    return None
+
+
+def synthesize_speech(client, text: str, voice_name: str = DEFAULT_VOICE,
+                      prompt: str = INTERVIEWER_PROMPT, timeout: Optional[float] = None) -> Optional[bytes]:
+    """Run a single TTS request and return the raw PCM audio"""
+    response = client.models.generate_content(
+        model=TTS_MODEL,
+        contents=prompt.format(text=text),
+        config=build_speech_config(voice_name, timeout),
+    )
+    return extract_audio_data(response)
+
+
+def synthesize_many(client, texts: List[str], max_workers: int = 1, timeout: Optional[float] = None,
+                    voice_name: str = DEFAULT_VOICE, prompt: str = INTERVIEWER_PROMPT,
+                    on_result: Optional[Callable[[int, bytes], None]] = None) -> Dict[int, bytes]:
+    """
+    Synthesize several texts with a bounded thread pool
+
+    Each text is an independent request: a failure, an empty response or a
+    call exceeding ``timeout`` only drops that index from the result.
+
+    Args:
+        client: Gemini client exposing ``models.generate_content``
+        texts: Texts to synthesize, in order
+        max_workers: Maximum number of concurrent TTS requests (1 = sequential)
+        timeout: Per-call timeout in seconds, None to wait indefinitely
+        on_result: Called in the caller's thread with (index, audio) as each text completes
+
+    Returns:
+        Dict mapping text index to PCM audio bytes
+    """
+    if not texts:
+        return {}
+
+    app = current_app._get_current_object()
+    width = max(1, min(int(max_workers or 1), len(texts)))
+
+    def run(text):
+        with app.app_context():
+            return synthesize_speech(client, text, voice_name, prompt, timeout)
+
+    executor = ThreadPoolExecutor(max_workers=width, thread_name_prefix='tts')
+    try:
+        futures = {executor.submit(run, text): i for i, text in enumerate(texts)}
+
+        # Calls run in waves of `width`, so the whole batch gets one timeout per wave
+        deadline = timeout * math.ceil(len(texts) / width) if timeout else None
+
+        results = {}
+        try:
+            for future in as_completed(futures, timeout=deadline):
+                index = futures[future]
+                try:
+                    audio_data = future.result()
+                except Exception as e:
+                    current_app.logger.error(f"Error generating audio for text {index + 1}: {str(e)}")
+                    continue
+                if not audio_data:
+                    current_app.logger.error(f"No audio data received for text {index + 1}")
+                    continue
+
+                results[index] = audio_data
+                if on_result:
+                    on_result(index, audio_data)
+        except FuturesTimeoutError:
+            for future, index in futures.items():
+                if not future.done():
+                    future.cancel()
+                    current_app.logger.error(f"Timed out generating audio for text {index + 1}")
+
+        return results
+    finally:
+        # Don't block the request on calls that already timed out
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,50 @@
+# app/services/uploads.py - Buffered handling of uploaded files
+from tempfile import SpooledTemporaryFile
+from flask import Request, current_app
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+
+
+class SpoolingRequest(Request):
+    """
+    Request whose file uploads stay in memory up to UPLOAD_SPOOL_THRESHOLD
+
+    Werkzeug's default spills anything over 500 KB to a named temporary
+    file; here larger uploads still go to an anonymous temporary file,
+    which the OS reclaims as soon as the upload is closed. A body that is
+    truncated or malformed raises BadRequest instead of parsing silently
+    into an empty form (which looked like no file was sent at all).
+    """
+
+    def make_form_data_parser(self):
+        parser = super().make_form_data_parser()
+        parser.silent = False
+        return parser
+
+    def _load_form_data(self):
+        try:
+            super()._load_form_data()
+        except ValueError as e:
+            # Leave an empty form behind so later accesses (cleanup) don't parse again
+            self.__dict__.setdefault('form', self.parameter_storage_class())
+            self.__dict__.setdefault('files', self.parameter_storage_class())
+            raise BadRequest(f"Malformed upload: {str(e)}") from e
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        threshold = current_app.config.get('UPLOAD_SPOOL_THRESHOLD', 1024 * 1024)
+        return SpooledTemporaryFile(max_size=threshold, mode='rb+')
+
+
+def read_upload(file, max_bytes: int) -> bytes:
+    """
+    Read an uploaded FileStorage into memory and close it
+
+    Raises:
+        RequestEntityTooLarge: the file is larger than max_bytes
+    """
+    try:
+        data = file.stream.read(max_bytes + 1)
+        if len(data) > max_bytes:
+            raise RequestEntityTooLarge(f"File is larger than {max_bytes / (1024 * 1024):.1f} MB")
+        return data
+    finally:
+        file.close()
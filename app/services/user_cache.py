@@ -0,0 +1,119 @@
+# app/services/user_cache.py - User lookups memoized per request and, briefly, per process
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from flask import current_app, g
+from sqlalchemy.orm import make_transient_to_detached
+
+# Marks a lookup this request already found no user for
+_MISSING = object()
+
+
+class UserCache:
+    """
+    Loads users by ID or Auth0 ID with at most one query per user per request
+
+    Within a request a user is looked up once (flask.g); across requests
+    the row's column values are kept in this process for USER_CACHE_TTL
+    seconds and turned back into a session-attached User without a query.
+    User.get_or_create_user invalidates the entry when it updates a user,
+    so this process sees a login's changes at once; other worker processes
+    may serve the previous values for up to the TTL. A TTL of 0 keeps only
+    the per-request memo.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 60
+        self.max_entries = 10000
+        self._entries: Dict[Tuple[str, object], Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL', 60)
+        self.max_entries = app.config.get('USER_CACHE_MAX_ENTRIES', 10000)
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id: Optional[int] = None, auth0_id: Optional[str] = None):
+        """The User with this ID (or else this Auth0 ID), or None"""
+        key = ('id', int(user_id)) if user_id is not None else ('auth0', auth0_id)
+        memo = g.setdefault('_user_cache', {})
+        user = memo.get(key)
+        if user is None:
+            user = self._load(key)
+            memo[key] = user if user is not None else _MISSING
+            if user is not None:
+                memo[('id', user.id)] = memo[('auth0', user.auth0_id)] = user
+        return None if user is _MISSING else user
+
+    def _load(self, key):
+        from app import db
+        from app.models import User
+
+        values = self._cached(key)
+        if values is not None:
+            self.hits += 1
+            user = User(**values)
+            # Attach as the persistent row it was read from, without a SELECT
+            make_transient_to_detached(user)
+            return db.session.merge(user, load=False)
+
+        self.misses += 1
+        kind, value = key
+        user = db.session.get(User, value) if kind == 'id' else User.query.filter_by(auth0_id=value).first()
+        if user is not None:
+            self._store(user)
+        return user
+
+    def _cached(self, key) -> Optional[Dict]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def _store(self, user):
+        if self.ttl <= 0:
+            return
+        values = {column.key: getattr(user, column.key) for column in user.__table__.columns}
+        entry = (time.monotonic() + self.ttl, values)
+        with self._lock:
+            # Each user is stored under two keys
+            while self._entries and len(self._entries) + 2 > self.max_entries:
+                # Oldest insertion first; expired entries are also dropped on read
+                del self._entries[next(iter(self._entries))]
+            self._entries[('id', user.id)] = entry
+            self._entries[('auth0', user.auth0_id)] = entry
+
+    def invalidate(self, user_id: Optional[int] = None, auth0_id: Optional[str] = None):
+        """Forget a user in this process and in the current request, if there is one"""
+        keys = [key for key in (('id', user_id), ('auth0', auth0_id)) if key[1] is not None]
+        with self._lock:
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    # Drop the entry under the user's other key too
+                    values = entry[1]
+                    self._entries.pop(('id', values['id']), None)
+                    self._entries.pop(('auth0', values['auth0_id']), None)
+        memo = g.get('_user_cache') if g else None
+        if memo:
+            for key in keys:
+                memo.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def get_user_cache() -> Optional[UserCache]:
+    """Return the user cache registered on the current app, if any"""
+    return current_app.extensions.get('user_cache')
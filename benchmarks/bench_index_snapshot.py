@@ -0,0 +1,68 @@
+# benchmarks/bench_index_snapshot.py - Worker start-up: rebuild vs memory-mapped snapshot
+#
+# Compares what a freshly booted worker pays to get a usable skill index:
+# building it from (job_id, skills) rows, as it would after reading MySQL,
+# versus opening the snapshot written by `flask build-index`. Also checks
+# that queries on the mapped index cost the same. Run from the repository root:
+#
+#     python benchmarks/bench_index_snapshot.py --postings 100000
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.matching import SkillIndex
+from app.services.snapshot import open_current_snapshot, publish_snapshot
+from bench_job_matching import make_postings
+
+
+def time_queries(index, queries, k):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.top_k(query, k)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Skill index rebuild vs snapshot open')
+    parser.add_argument('--postings', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    postings, skills, weights = make_postings(args.postings, args.vocabulary, 4, 15, rng)
+    queries = [list(set(rng.choices(skills, weights, k=rng.randint(5, 30)))) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    built = SkillIndex.build(postings)
+    built.top_k(queries[0], 10)  # includes the first IDF computation
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as root:
+        arrays, meta = built.to_snapshot()
+        path = publish_snapshot(root, SkillIndex.SNAPSHOT_KIND, arrays, meta)
+
+        start = time.perf_counter()
+        snapshot = open_current_snapshot(root, SkillIndex.SNAPSHOT_KIND)
+        mapped = SkillIndex.from_snapshot(snapshot.arrays, snapshot.meta)
+        mapped.top_k(queries[0], 10)
+        open_ms = (time.perf_counter() - start) * 1000
+
+        print(f"postings: {args.postings}  snapshot: {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"rebuild: {build_s * 1000:.0f}ms   open snapshot: {open_ms:.0f}ms   "
+              f"({build_s * 1000 / open_ms:.0f}x faster start-up)")
+        print(f"query p50: built {time_queries(built, queries, 10) * 1000:.1f}ms   "
+              f"mapped {time_queries(mapped, queries, 10) * 1000:.1f}ms")
+        del mapped, snapshot
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+# benchmarks/bench_job_matching.py - Vectorized skill matching over a large posting set
+#
+# Builds a synthetic catalogue of postings with a Zipf-like skill distribution
+# (a few skills everywhere, a long tail of niche ones), then times top-k
+# queries against a SkillMatrix (one pass over every posting, defined below), the
+# app's SkillIndex (only postings sharing a skill with the query) and, for
+# reference, a plain Python loop over the same postings. Also times incremental index updates.
+# Run from the repository root:
+#
+#     python benchmarks/bench_job_matching.py --postings 100000 --queries 200
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.services.matching import SkillIndex, normalize_skill
+
+
+class SkillMatrix:
+    """
+    Sparse posting x skill matrix in CSR layout, scored in one pass over every posting
+
+    The first matching engine, kept here as the reference SkillIndex is
+    measured against (the app uses SkillIndex).
+
+    Row i holds the skills of posting ``job_ids[i]`` in
+    ``indices[indptr[i]:indptr[i + 1]]`` with matching ``weights``. A
+    skill's weight is its IDF divided by the total IDF of the posting, so a
+    candidate's score for a posting is the IDF-weighted share of that
+    posting's skills they have, between 0 and 1.
+    """
+
+    def __init__(self, job_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 weights: np.ndarray, vocabulary: Dict[str, int]):
+        self.job_ids = job_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.vocabulary = vocabulary
+        self.skills = sorted(vocabulary, key=vocabulary.get)
+        self.built_at = time.time()
+        # Row number of every stored entry, so scoring is a single bincount
+        self._rows = np.repeat(np.arange(len(job_ids), dtype=np.int32), np.diff(indptr))
+
+    @classmethod
+    def build(cls, postings: Iterable[Tuple[int, Iterable[str]]]) -> 'SkillMatrix':
+        """Build the matrix from (job_id, skills) pairs"""
+        vocabulary = {}
+        job_ids = []
+        indptr = [0]
+        indices = []
+        for job_id, skills in postings:
+            columns = {vocabulary.setdefault(skill, len(vocabulary))
+                       for skill in map(normalize_skill, skills or ()) if skill}
+            job_ids.append(job_id)
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+
+        indptr = np.asarray(indptr, dtype=np.int64)
+        indices = np.asarray(indices, dtype=np.int32)
+        job_count = len(job_ids)
+
+        # Rare skills say more about a posting than ones every posting lists
+        document_frequency = np.bincount(indices, minlength=len(vocabulary))
+        idf = np.log1p(job_count / np.maximum(document_frequency, 1)).astype(np.float32)
+        rows = np.repeat(np.arange(job_count, dtype=np.int32), np.diff(indptr))
+        weights = idf[indices]
+        row_totals = np.bincount(rows, weights=weights, minlength=job_count)
+        weights = weights / row_totals[rows] if len(weights) else weights
+
+        return cls(np.asarray(job_ids, dtype=np.int64), indptr, indices,
+                   weights.astype(np.float32), vocabulary)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def vectorize(self, skills: Iterable[str]) -> np.ndarray:
+        """Dense 0/1 candidate vector over the vocabulary; unknown skills are ignored"""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        columns = [self.vocabulary[skill] for skill in map(normalize_skill, skills) if skill in self.vocabulary]
+        vector[columns] = 1.0
+        return vector
+
+    def score(self, skills: Iterable[str]) -> np.ndarray:
+        """Score every posting against the candidate's skills in one pass"""
+        vector = self.vectorize(skills)
+        return np.bincount(self._rows, weights=self.weights * vector[self.indices],
+                           minlength=len(self.job_ids))
+
+    def top_k(self, skills: Sequence[str], k: int = 10, min_score: float = 0.0) -> List[Dict]:
+        """
+        Best matching postings for a candidate
+
+        Args:
+            skills: Candidate skills (normalized here)
+            k: Maximum number of matches
+            min_score: Drop matches scoring at or below this
+
+        Returns:
+            Dicts with job_id, score, matched_skills and missing_skills, best first
+        """
+        if not len(self.job_ids) or k <= 0:
+            return []
+
+        skills = [normalize_skill(skill) for skill in skills]
+        scores = self.score(skills)
+        k = min(k, len(scores))
+        # Partial sort: only the k best are ordered
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        have = set(skills)
+        matches = []
+        for row in candidates:
+            score = float(scores[row])
+            if score <= min_score:
+                break
+            posting_skills = [self.skills[column] for column in self.indices[self.indptr[row]:self.indptr[row + 1]]]
+            matches.append({
+                'job_id': int(self.job_ids[row]),
+                'score': round(score, 4),
+                'matched_skills': [skill for skill in posting_skills if skill in have],
+                'missing_skills': [skill for skill in posting_skills if skill not in have],
+            })
+        return matches
+
+
+def make_postings(count, vocabulary_size, min_skills, max_skills, rng):
+    skills = [f'skill-{i}' for i in range(vocabulary_size)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary_size)]
+    return [(job_id, set(rng.choices(skills, weights, k=rng.randint(min_skills, max_skills))))
+            for job_id in range(1, count + 1)], skills, weights
+
+
+def naive_top_k(postings, candidate, k):
+    """Per-posting Python loop: the straightforward implementation"""
+    scored = []
+    for job_id, skills in postings:
+        if skills:
+            scored.append((len(skills & candidate) / len(skills), job_id))
+    scored.sort(reverse=True)
+    return scored[:k]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vectorized vs naive job matching')
+    parser.add_argument('--postings', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=5000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--naive-queries', type=int, default=5, help='Queries timed with the Python loop')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    postings, skills, weights = make_postings(args.postings, args.vocabulary, 4, 15, rng)
+    queries = [set(rng.choices(skills, weights, k=rng.randint(5, 30))) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    matrix = SkillMatrix.build(postings)
+    build_s = time.perf_counter() - start
+    print(f"postings: {len(matrix)}  skills: {len(matrix.vocabulary)}  entries: {len(matrix.indices)}  "
+          f"build: {build_s:.2f}s")
+
+    index = SkillIndex.build(postings)
+
+    def time_queries(engine):
+        engine.top_k(list(queries[0]), args.k)  # warm up
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            engine.top_k(list(query), args.k)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    results = {'matrix': time_queries(matrix), 'index': time_queries(index)}
+
+    updates = []
+    for _ in range(1000):
+        job_id = rng.randint(1, args.postings)
+        start = time.perf_counter()
+        index.add(job_id, set(rng.choices(skills, weights, k=rng.randint(4, 15))))
+        updates.append(time.perf_counter() - start)
+
+    # The first query after a change also refreshes the cached IDF weights
+    index.add(1, postings[0][1])
+    start = time.perf_counter()
+    index.top_k(list(queries[0]), args.k)
+    refresh_s = time.perf_counter() - start
+
+    naive = []
+    for query in queries[:args.naive_queries]:
+        start = time.perf_counter()
+        naive_top_k(postings, query, args.k)
+        naive.append(time.perf_counter() - start)
+
+    naive_p50 = statistics.median(naive)
+    for name, latencies in results.items():
+        p50 = statistics.median(latencies)
+        print(f"{name:>10}: p50={p50 * 1000:.1f}ms  p95={percentile(latencies, 0.95) * 1000:.1f}ms  "
+              f"max={max(latencies) * 1000:.1f}ms over {len(latencies)} queries  "
+              f"({naive_p50 / p50:.0f}x naive)")
+    print(f"{'naive':>10}: p50={naive_p50 * 1000:.1f}ms over {len(naive)} queries")
+    print(f"index update: p50={statistics.median(updates) * 1e6:.0f}us  "
+          f"max={max(updates) * 1000:.1f}ms (includes compactions), "
+          f"first query after a change: {refresh_s * 1000:.1f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_job_search.py - BM25 search latency over a large posting set
+#
+# Generates synthetic postings (Zipf-distributed vocabulary, a handful of
+# locations/levels/types), builds a search segment, saves and memory-maps it,
+# then times ranked queries with and without filters and deep pagination.
+# Run from the repository root:
+#
+#     python benchmarks/bench_job_search.py --postings 100000 --queries 300
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.search import Segment
+
+LOCATIONS = ['Remote', 'London', 'Berlin', 'New York', 'Colombo', 'Bangalore', 'Toronto', 'Singapore']
+LEVELS = ['Junior', 'Mid', 'Senior', 'Lead']
+TYPES = ['full-time', 'part-time', 'contract']
+
+
+def make_documents(count, vocabulary_size, words_per_doc, rng):
+    words = [f'term{i}' for i in range(vocabulary_size)]
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(vocabulary_size)))
+    for job_id in range(1, count + 1):
+        yield {
+            'id': job_id,
+            'title': ' '.join(rng.choices(words, cum_weights=weights, k=4)),
+            'text': ' '.join(rng.choices(words, cum_weights=weights, k=words_per_doc)),
+            'location': rng.choice(LOCATIONS),
+            'experience_level': rng.choice(LEVELS),
+            'employment_type': rng.choice(TYPES),
+        }, words, weights
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def time_queries(segment, queries, **kwargs):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        segment.search(query, **kwargs)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BM25 job search latency')
+    parser.add_argument('--postings', type=int, default=100000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--words', type=int, default=120, help='Body words per posting')
+    parser.add_argument('--queries', type=int, default=300)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    generated = list(make_documents(args.postings, args.vocabulary, args.words, rng))
+    documents = [document for document, _, _ in generated]
+    words, weights = generated[0][1], generated[0][2]
+
+    start = time.perf_counter()
+    built = Segment.build(documents)
+    build_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, 'seg-bench')
+        built.save(path)
+        start = time.perf_counter()
+        segment = Segment.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"postings: {args.postings}  terms: {len(segment.terms)}  postings entries: {len(segment.postings_doc)}  "
+              f"build: {build_s:.1f}s  load (mmap): {load_ms:.0f}ms")
+
+        queries = [' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(1, 5))) for _ in range(args.queries)]
+        segment.search(queries[0])  # warm up the page cache
+
+        runs = {
+            'plain': time_queries(segment, queries),
+            'filtered': time_queries(segment, queries, filters={'location': ['Remote', 'Berlin'],
+                                                                'employment_type': ['full-time']}),
+            'page 50': time_queries(segment, queries, offset=49 * 20, limit=20),
+        }
+        for name, latencies in runs.items():
+            print(f"{name:>9}: p50={statistics.median(latencies) * 1000:.1f}ms  "
+                  f"p95={percentile(latencies, 0.95) * 1000:.1f}ms  p99={percentile(latencies, 0.99) * 1000:.1f}ms  "
+                  f"max={max(latencies) * 1000:.1f}ms")
+        del segment
+
+
+if __name__ == '__main__':
+    main()
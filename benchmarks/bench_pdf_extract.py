@@ -0,0 +1,114 @@
+# benchmarks/bench_pdf_extract.py - In-thread vs process-pool resume extraction
+#
+# Generates a corpus of text PDFs, then extracts them from several concurrent
+# "upload" threads, first in-thread (the old behaviour, serialized by the GIL)
+# and then through the extraction process pool. Run from the repository root:
+#
+#     python benchmarks/bench_pdf_extract.py --docs 40 --concurrency 8 --workers 4
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.pdf_extract import extract_text, shutdown_pool
+
+WORDS = ("python flask sql docker kubernetes led team built designed scalable services "
+         "data pipeline machine learning api testing cloud aws react senior engineer").split()
+
+
+def make_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Build a minimal text-only PDF with the given number of pages"""
+    objects = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    page_objects = []
+    for _ in range(pages):
+        lines = [' '.join(random.choice(WORDS) for _ in range(12)) for _ in range(lines_per_page)]
+        stream = 'BT /F1 10 Tf 50 790 Td 14 TL\n' + ''.join(f'({line}) Tj T*\n' for line in lines) + 'ET'
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        page_objects.append((content_id, f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream'))
+        page_objects.append((page_id, f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+                                      f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>'))
+
+    objects.append((1, '<< /Type /Catalog /Pages 2 0 R >>'))
+    kids = ' '.join(f'{i} 0 R' for i in page_ids)
+    objects.append((2, f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'))
+    objects.append((font_id, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'))
+    objects.extend(page_objects)
+    objects.sort()
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for obj_id, body in objects:
+        offsets.append(len(out))
+        out += f'{obj_id} 0 obj\n{body}\nendobj\n'.encode('latin-1')
+    xref_offset = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode()
+    return out
+
+
+def run(corpus, concurrency, **kwargs):
+    latencies = []
+
+    def upload(pdf):
+        start = time.perf_counter()
+        text = extract_text(pdf, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        return len(text)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        chars = sum(executor.map(upload, corpus))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'elapsed': elapsed,
+        'docs_per_s': len(corpus) / elapsed,
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(len(latencies) * 0.95) - 1],
+        'chars': chars,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='In-thread vs process-pool PDF extraction')
+    parser.add_argument('--docs', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent uploads')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Extraction pool size')
+    parser.add_argument('--max-pages', type=int, default=20)
+    parser.add_argument('--pages-per-task', type=int, default=8)
+    args = parser.parse_args()
+
+    random.seed(7)
+    # Mostly 1-3 page resumes with the occasional 30-page CV
+    sizes = [random.choice([1, 1, 2, 2, 3, 30]) for _ in range(args.docs)]
+    corpus = [make_pdf(pages) for pages in sizes]
+    print(f"corpus: {len(corpus)} docs, {sum(sizes)} pages, {sum(map(len, corpus)) // 1024} KB")
+
+    current = run(corpus, args.concurrency)
+
+    # Warm the pool so process start-up isn't charged to the first uploads
+    extract_text(corpus[0], workers=args.workers)
+    pooled = run(corpus, args.concurrency, workers=args.workers, max_pages=args.max_pages,
+                 pages_per_task=args.pages_per_task, timeout=60)
+    shutdown_pool()
+
+    for name, result in (('in-thread', current), (f'pool x{args.workers}', pooled)):
+        print(f"{name:>10}: {result['elapsed']:.2f}s  {result['docs_per_s']:.1f} docs/s  "
+              f"p50={result['p50'] * 1000:.0f}ms  p95={result['p95'] * 1000:.0f}ms  chars={result['chars']}")
+    print(f"throughput: {pooled['docs_per_s'] / current['docs_per_s']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/bench_semantic_ann.py - Semantic matching: IVF recall@k and latency vs brute force
+#
+# Embeds synthetic postings with the hashing embedder, builds the IVF
+# index and, for a range of nprobe values, measures recall@k of the
+# approximate search against an exact scan together with query latency.
+# Postings are drawn from a few hundred topics (like job families) and
+# queries are postings with words dropped and misspelled. Run from the
+# repository root:
+#
+#     python benchmarks/bench_semantic_ann.py --postings 200000
+#     python benchmarks/bench_semantic_ann.py --postings 1000000 --dim 128
+import argparse
+import itertools
+import os
+import random
+import statistics
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.services.semantic import HashingEmbedder, VectorIndex
+
+# Related and unrelated wordings, for a feel of the similarity scale
+PAIRS = [('Postgres', 'PostgreSQL'), ('ML engineer', 'machine learning engineer'),
+         ('microservice architecture', 'microservices architect'), ('data engineering', 'data engineer'),
+         ('Java developer', 'frontend designer')]
+
+
+def make_words(count, rng):
+    syllables = [c + v for c in 'bcdfghjklmnprstvz' for v in 'aeiou']
+    return [''.join(rng.choices(syllables, k=rng.randint(2, 4))) for _ in range(count)]
+
+
+def make_texts(count, words, words_per_text, topics, rng):
+    """Postings about one of several topics: most words from the topic, the rest Zipf-distributed"""
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    topic_words = [rng.sample(words, 20) for _ in range(topics)]
+    texts = []
+    for _ in range(count):
+        topic = rng.choice(topic_words)
+        on_topic = sum(rng.random() < 0.8 for _ in range(words_per_text))
+        chosen = rng.choices(topic, k=on_topic) + rng.choices(words, cum_weights=weights,
+                                                              k=words_per_text - on_topic)
+        texts.append(' '.join(chosen))
+    return texts
+
+
+def perturb(text, rng):
+    """Keep about two thirds of the words and misspell some of those"""
+    words = [word for word in text.split() if rng.random() < 0.67] or text.split()[:1]
+    for i, word in enumerate(words):
+        if rng.random() < 0.3:
+            position = rng.randrange(len(word))
+            words[i] = word[:position] + rng.choice(string.ascii_lowercase) + word[position + 1:]
+    return ' '.join(words)
+
+
+def embed_in_batches(embedder, texts, batch_size=10000):
+    return np.concatenate([embedder.embed_many(texts[start:start + batch_size])
+                           for start in range(0, len(texts), batch_size)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Semantic IVF recall and latency')
+    parser.add_argument('--postings', type=int, default=200000)
+    parser.add_argument('--vocabulary', type=int, default=20000)
+    parser.add_argument('--words', type=int, default=20, help='Words per posting')
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    embedder = HashingEmbedder(dim=args.dim)
+    for left, right in PAIRS:
+        print(f"cosine({left!r}, {right!r}) = {float(embedder.embed(left) @ embedder.embed(right)):.2f}")
+
+    rng = random.Random(5)
+    texts = make_texts(args.postings, make_words(args.vocabulary, rng), args.words, args.topics, rng)
+
+    start = time.perf_counter()
+    vectors = embed_in_batches(embedder, texts)
+    embed_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = VectorIndex.build(range(1, args.postings + 1), vectors)
+    build_s = time.perf_counter() - start
+    print(f"postings: {args.postings}  dim: {args.dim}  clusters: {index.nlist}  "
+          f"embed: {embed_s:.1f}s ({embed_s / args.postings * 1e6:.0f}us/posting)  build: {build_s:.1f}s")
+    del vectors
+
+    queries = embedder.embed_many([perturb(rng.choice(texts), rng) for _ in range(args.queries)])
+    exact, exact_latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        exact.append({job_id for job_id, _ in index.search_exact(query, args.k)})
+        exact_latencies.append(time.perf_counter() - start)
+    print(f"{'exact':>10}: recall@{args.k}=1.000  scanned=100.0%  "
+          f"p50={statistics.median(exact_latencies) * 1000:.2f}ms")
+
+    sizes = np.diff(index.list_offsets)
+    for nprobe in (1, 2, 4, 8, 16, 32, 64):
+        if nprobe > index.nlist:
+            break
+        recalls, latencies, scanned = [], [], []
+        for query, truth in zip(queries, exact):
+            start = time.perf_counter()
+            found = index.search(query, args.k, nprobe)
+            latencies.append(time.perf_counter() - start)
+            recalls.append(len(truth.intersection(job_id for job_id, _ in found)) / len(truth))
+            probe = np.argsort(-(index.centroids @ query))[:nprobe]
+            scanned.append(sizes[probe].sum() / len(index.ids))
+        print(f"nprobe={nprobe:>3}: recall@{args.k}={statistics.mean(recalls):.3f}  "
+              f"scanned={statistics.mean(scanned) * 100:.1f}%  "
+              f"p50={statistics.median(latencies) * 1000:.2f}ms  "
+              f"({statistics.median(exact_latencies) / statistics.median(latencies):.0f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+# benchmarks/bench_session_history.py - Interview session queries at scale: indexes, keyset pages, deferred columns
+#
+# Fills a SQLite database with synthetic interview sessions (questions
+# and audio JSON included) and times the queries the app runs against
+# interview_sessions:
+#
+#   * a user's history page, newest first, with and without a status
+#     filter: OFFSET pagination without the (user_id, [status,]
+#     created_at) indexes, then keyset pagination with them, on the
+#     first page and deep in the history;
+#   * the ownership check done per audio file: loading the whole row,
+#     loading it with the JSON columns deferred, and reading user_id only.
+#
+# Run from the repository root:
+#
+#     python benchmarks/bench_session_history.py --sessions 1000000
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, or_, select
+from sqlalchemy.orm import Session, undefer_group
+
+from app import db
+from app.models import InterviewSession
+
+TABLES = ('users', 'resumes', 'interview_sessions')
+HISTORY_INDEXES = ('ix_interview_sessions_user_status_created', 'ix_interview_sessions_user_created')
+STATUSES = ('setup', 'in_progress', 'completed')
+
+
+def fill(engine, sessions, users, heavy_sessions, rng):
+    """users users with one resume each; user 1 owns heavy_sessions sessions, the rest are spread evenly"""
+    now = datetime(2026, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(db.metadata.tables['users'].insert(), [
+            {'id': i, 'auth0_id': f'auth0|{i}', 'email': f'user{i}@example.com', 'is_active': True}
+            for i in range(1, users + 1)])
+        connection.execute(db.metadata.tables['resumes'].insert(), [
+            {'id': i, 'user_id': i, 'text_hash': f'{i:064x}', 'text': 'resume'} for i in range(1, users + 1)])
+
+    table = InterviewSession.__table__
+    batch = []
+    for session_id in range(1, sessions + 1):
+        user_id = 1 if session_id <= heavy_sessions else rng.randint(2, users)
+        questions = [f'Question {n} about distributed systems, trade-offs and a project you led?' * 2
+                     for n in range(6)]
+        batch.append({
+            'id': session_id, 'user_id': user_id, 'job_title': 'Backend Engineer', 'difficulty_level': 'medium',
+            'resume_id': user_id, 'questions': questions,
+            'audio_files': {str(n): f'audio_files/session_{session_id}/question_{n + 1}.wav' for n in range(6)},
+            'created_at': now - timedelta(seconds=rng.randrange(365 * 24 * 3600)),
+            'status': rng.choice(STATUSES), 'preparation_status': 'ready', 'questions_ready': True,
+        })
+        if len(batch) == 50000:
+            with engine.begin() as connection:
+                connection.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        with engine.begin() as connection:
+            connection.execute(table.insert(), batch)
+
+
+def timed(fn, repeat):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+
+def history_offset(session, user_id, status, offset, limit):
+    query = session.query(InterviewSession).filter(InterviewSession.user_id == user_id)
+    if status:
+        query = query.filter(InterviewSession.status == status)
+    rows = query.order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc()) \
+        .offset(offset).limit(limit).all()
+    session.expunge_all()
+    return rows
+
+
+def history_keyset(session, user_id, status, after, limit):
+    query = session.query(InterviewSession).filter(InterviewSession.user_id == user_id)
+    if status:
+        query = query.filter(InterviewSession.status == status)
+    if after:
+        query = query.filter(InterviewSession.created_at <= after[0],
+                             or_(InterviewSession.created_at < after[0], InterviewSession.id < after[1]))
+    rows = query.order_by(InterviewSession.created_at.desc(), InterviewSession.id.desc()).limit(limit).all()
+    session.expunge_all()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Interview session history and ownership queries')
+    parser.add_argument('--sessions', type=int, default=1000000)
+    parser.add_argument('--users', type=int, default=20000)
+    parser.add_argument('--heavy', type=int, default=5000, help='Sessions of the user whose history is paged')
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'sessions.db')}")
+        db.metadata.create_all(engine, tables=[db.metadata.tables[name] for name in TABLES])
+        with engine.begin() as connection:
+            for name in HISTORY_INDEXES:
+                connection.exec_driver_sql(f'DROP INDEX {name}')
+
+        start = time.perf_counter()
+        fill(engine, args.sessions, args.users, args.heavy, rng)
+        print(f"sessions: {args.sessions}  users: {args.users}  paged user's sessions: {args.heavy}  "
+              f"fill: {time.perf_counter() - start:.0f}s  "
+              f"db: {os.path.getsize(os.path.join(directory, 'sessions.db')) / 1e6:.0f} MB")
+
+        session = Session(engine)
+        deep = args.heavy // 2
+        cases = [(None, 0), (None, deep), ('completed', 0), ('completed', deep // len(STATUSES))]
+
+        # The keyset cursor for each case is the last row before its offset
+        cursors = {}
+        for status, offset in cases:
+            if offset:
+                last = history_offset(session, 1, status, offset - 1, 1)[0]
+                cursors[status, offset] = (last.created_at, last.id)
+
+        before = {case: timed(lambda: history_offset(session, 1, case[0], case[1], args.limit), args.repeat)
+                  for case in cases}
+        with engine.begin() as connection:
+            for index in InterviewSession.__table__.indexes:
+                if index.name in HISTORY_INDEXES:
+                    index.create(connection)
+        for status, offset in cases:
+            indexed = timed(lambda: history_offset(session, 1, status, offset, args.limit), args.repeat)
+            keyset = timed(lambda: history_keyset(session, 1, status, cursors.get((status, offset)), args.limit),
+                           args.repeat)
+            label = f"history status={status or 'any'} rows {offset}-{offset + args.limit}"
+            print(f"{label:<42} offset, no index: {before[status, offset]:7.2f}ms  "
+                  f"offset + index: {indexed:6.2f}ms  keyset + index: {keyset:5.2f}ms  "
+                  f"({before[status, offset] / keyset:.0f}x)")
+
+        ids = [rng.randint(1, args.sessions) for _ in range(2000)]
+
+        def load_all(options):
+            for session_id in ids:
+                session.get(InterviewSession, session_id, options=options)
+                session.expunge_all()
+
+        def owner_only():
+            for session_id in ids:
+                session.scalar(select(InterviewSession.user_id).where(InterviewSession.id == session_id))
+
+        full = timed(lambda: load_all([undefer_group('content')]), 3) / len(ids) * 1000
+        lean = timed(lambda: load_all([]), 3) / len(ids) * 1000
+        owner = timed(owner_only, 3) / len(ids) * 1000
+        print(f"ownership check per audio file: whole row {full:.0f}us  JSON deferred {lean:.0f}us  "
+              f"user_id only {owner:.0f}us")
+        session.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
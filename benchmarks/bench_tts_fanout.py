@@ -0,0 +1,75 @@
+# benchmarks/bench_tts_fanout.py - Sequential vs concurrent question TTS
+#
+# Uses a local fake TTS client with injected latency, so no API key or network
+# is needed. Run from the repository root:
+#
+#     python benchmarks/bench_tts_fanout.py --questions 5 --latency 1.0
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from app.main.routes import generate_audio_for_questions
+
+
+class FakeTTSClient:
+    """Mimics genai.Client().models.generate_content for audio responses"""
+
+    def __init__(self, latency, jitter=0.0, seconds_of_audio=2):
+        self.latency = latency
+        self.jitter = jitter
+        self.pcm = b'\x00\x00' * 24000 * seconds_of_audio
+        self.calls = 0
+        self.models = self
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=self.pcm))
+        candidate = SimpleNamespace(content=SimpleNamespace(parts=[part]))
+        return SimpleNamespace(candidates=[candidate])
+
+
+def run(app, questions, latency, jitter, workers):
+    client = FakeTTSClient(latency, jitter)
+    app.config['TTS_MAX_WORKERS'] = workers
+    with app.app_context():
+        start = time.perf_counter()
+        audio_files = generate_audio_for_questions(1, questions, client=client)
+        elapsed = time.perf_counter() - start
+    assert sorted(audio_files) == [str(i) for i in range(len(questions))], audio_files
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sequential vs concurrent question TTS')
+    parser.add_argument('--questions', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=1.0, help='Base latency per TTS call (seconds)')
+    parser.add_argument('--jitter', type=float, default=0.2, help='Extra random latency per call (seconds)')
+    parser.add_argument('--workers', type=int, default=5)
+    args = parser.parse_args()
+
+    questions = [f"Benchmark question number {i + 1}?" for i in range(args.questions)]
+    app = Flask(__name__)
+    app.config['TTS_CALL_TIMEOUT'] = (args.latency + args.jitter) * 5
+
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        sequential = run(app, questions, args.latency, args.jitter, workers=1)
+        concurrent = run(app, questions, args.latency, args.jitter, workers=args.workers)
+
+    slowest_call = args.latency + args.jitter
+    print(f"questions={args.questions} latency={args.latency}s jitter<={args.jitter}s")
+    print(f"sequential (1 worker):   {sequential:.2f}s")
+    print(f"concurrent ({args.workers} workers): {concurrent:.2f}s")
+    print(f"speedup: {sequential / concurrent:.1f}x (slowest single call <= {slowest_call:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -14,6 +14,17 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Server-side sessions: "database", "sqlite" (local file) or "cookie" (Flask's signed cookie)
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND') or 'database'
+    SESSION_SQLITE_PATH = os.getenv('SESSION_SQLITE_PATH') or 'sessions.sqlite3'
+    SESSION_SWEEP_SECONDS = int(os.getenv('SESSION_SWEEP_SECONDS') or 3600)
+
+    # Users loaded for a request are reused by this process for this many seconds (0: per request only)
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL') or 60)
+    USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES') or 10000)
+    # A login moves users.last_login only once it is this many seconds old
+    LAST_LOGIN_GRANULARITY_SECONDS = int(os.getenv('LAST_LOGIN_GRANULARITY_SECONDS') or 3600)
+
     # Auth0 Configuration
     AUTH0_DOMAIN = os.getenv('AUTH0_DOMAIN')
     AUTH0_CLIENT_ID = os.getenv('AUTH0_CLIENT_ID')
@@ -23,14 +34,97 @@ class Config:
     # Gemini API Configuration
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 
+    # Shared Gemini HTTP connection pool (per worker process)
+    GEMINI_HTTP_POOL_SIZE = int(os.getenv('GEMINI_HTTP_POOL_SIZE') or 10)
+    GEMINI_HTTP_KEEPALIVE = float(os.getenv('GEMINI_HTTP_KEEPALIVE') or 60)
+
+    # Text-to-speech fan-out: concurrent requests per interview and per-call timeout (seconds)
+    TTS_MAX_WORKERS = int(os.getenv('TTS_MAX_WORKERS') or 5)
+    TTS_CALL_TIMEOUT = float(os.getenv('TTS_CALL_TIMEOUT') or 30)
+
+    # Shared content-addressed store for synthesized speech
+    AUDIO_CACHE_DIR = os.getenv('AUDIO_CACHE_DIR') or 'audio_cache'
+    AUDIO_CACHE_MAX_BYTES = int(os.getenv('AUDIO_CACHE_MAX_BYTES') or 512 * 1024 * 1024)
+    AUDIO_CACHE_MAX_ENTRIES = int(os.getenv('AUDIO_CACHE_MAX_ENTRIES') or 10000)
+    AUDIO_CACHE_MEMORY_BYTES = int(os.getenv('AUDIO_CACHE_MEMORY_BYTES') or 16 * 1024 * 1024)
+
+    # Compressed copies of synthesized audio, made with ffmpeg ("" = WAV only).
+    # Encoding runs in the thread that stored the WAV (the preparation job,
+    # or the request for chat speech), bounded by AUDIO_ENCODE_TIMEOUT seconds
+    AUDIO_VARIANT_FORMAT = os.getenv('AUDIO_VARIANT_FORMAT', 'opus')
+    AUDIO_VARIANT_BITRATE = int(os.getenv('AUDIO_VARIANT_BITRATE') or 24000)
+    AUDIO_ENCODE_TIMEOUT = float(os.getenv('AUDIO_ENCODE_TIMEOUT') or 30)
+    FFMPEG_PATH = os.getenv('FFMPEG_PATH')
+
+    # Audio responses: lifetime of content-hash URLs, and proxy offload
+    # ("x-sendfile" or "x-accel-redirect"; "" sends files from the worker)
+    AUDIO_MAX_AGE = int(os.getenv('AUDIO_MAX_AGE') or 365 * 24 * 3600)
+    AUDIO_SENDFILE = os.getenv('AUDIO_SENDFILE', '')
+    AUDIO_ACCEL_REDIRECT_ROOT = os.getenv('AUDIO_ACCEL_REDIRECT_ROOT')
+    AUDIO_ACCEL_REDIRECT_PREFIX = os.getenv('AUDIO_ACCEL_REDIRECT_PREFIX') or '/protected-audio/'
+
+    # Interview preparation jobs (processed by `flask interview-worker`)
+    INTERVIEW_JOBS_INLINE = os.getenv('INTERVIEW_JOBS_INLINE', 'false').lower() == 'true'
+    INTERVIEW_JOB_MAX_ATTEMPTS = int(os.getenv('INTERVIEW_JOB_MAX_ATTEMPTS') or 3)
+    # A failed job waits this long before its next attempt, doubling each time up to the maximum
+    INTERVIEW_JOB_RETRY_DELAY = int(os.getenv('INTERVIEW_JOB_RETRY_DELAY') or 30)
+    INTERVIEW_JOB_RETRY_MAX_DELAY = int(os.getenv('INTERVIEW_JOB_RETRY_MAX_DELAY') or 900)
+    INTERVIEW_JOB_STALE_SECONDS = int(os.getenv('INTERVIEW_JOB_STALE_SECONDS') or 600)
+    INTERVIEW_HISTORY_MAX_PER_PAGE = int(os.getenv('INTERVIEW_HISTORY_MAX_PER_PAGE') or 50)
+
+    # Resume uploads are parsed from memory, spilling to an anonymous temp file above the threshold
+    RESUME_MAX_UPLOAD_BYTES = int(os.getenv('RESUME_MAX_UPLOAD_BYTES') or 5 * 1024 * 1024)
+    UPLOAD_SPOOL_THRESHOLD = int(os.getenv('UPLOAD_SPOOL_THRESHOLD') or 1024 * 1024)
+
+    # Recorded answers: uploaded in chunks of this size, streamed to ANSWER_AUDIO_DIR/session_<id>
+    ANSWER_AUDIO_DIR = os.getenv('ANSWER_AUDIO_DIR') or 'answer_audio'
+    ANSWER_UPLOAD_CHUNK_BYTES = int(os.getenv('ANSWER_UPLOAD_CHUNK_BYTES') or 1024 * 1024)
+    ANSWER_AUDIO_MAX_BYTES = int(os.getenv('ANSWER_AUDIO_MAX_BYTES') or 50 * 1024 * 1024)
+    ANSWER_UPLOAD_EXPIRY_SECONDS = int(os.getenv('ANSWER_UPLOAD_EXPIRY_SECONDS') or 24 * 3600)
+
+    # Resume PDF extraction: process pool size (0 = in the request thread), page and time budgets
+    PDF_POOL_WORKERS = int(os.getenv('PDF_POOL_WORKERS') or 2)
+    PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES') or 20)
+    PDF_EXTRACT_TIMEOUT = float(os.getenv('PDF_EXTRACT_TIMEOUT') or 15)
+    PDF_PAGES_PER_TASK = int(os.getenv('PDF_PAGES_PER_TASK') or 8)
+    PDF_POOL_START_METHOD = os.getenv('PDF_POOL_START_METHOD') or 'spawn'
+
+    # Memoized question generation; entries expire after this many seconds (0 = never)
+    QUESTION_CACHE_TTL = int(os.getenv('QUESTION_CACHE_TTL') or 7 * 24 * 3600)
+
+    # Job matching: the skill index follows this process's commits and is fully
+    # rebuilt after this many seconds to pick up writes from other processes
+    JOB_MATCH_REFRESH_SECONDS = int(os.getenv('JOB_MATCH_REFRESH_SECONDS') or 1800)
+    JOB_MATCH_MAX_RESULTS = int(os.getenv('JOB_MATCH_MAX_RESULTS') or 100)
+
+    # Job search: BM25 segments are written here and rebuilt after this many seconds
+    SEARCH_INDEX_DIR = os.getenv('SEARCH_INDEX_DIR') or 'search_index'
+    SEARCH_REFRESH_SECONDS = int(os.getenv('SEARCH_REFRESH_SECONDS') or 1800)
+    SEARCH_REBUILD_DELAY = float(os.getenv('SEARCH_REBUILD_DELAY') or 5)
+    SEARCH_MAX_PER_PAGE = int(os.getenv('SEARCH_MAX_PER_PAGE') or 50)
+
+    # Skill index snapshots written by `flask build-index` and memory-mapped by workers
+    INDEX_SNAPSHOT_DIR = os.getenv('INDEX_SNAPSHOT_DIR') or 'index_snapshots'
+
+    # Semantic matching: hashed embedding size and IVF clusters scanned per query
+    SEMANTIC_DIM = int(os.getenv('SEMANTIC_DIM') or 256)
+    SEMANTIC_NPROBE = int(os.getenv('SEMANTIC_NPROBE') or 8)
+
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class ProductionConfig(Config):
     DEBUG = False
 
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SESSION_BACKEND = 'cookie'
+    INTERVIEW_JOBS_INLINE = False
+
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig 
 }
\ No newline at end of file
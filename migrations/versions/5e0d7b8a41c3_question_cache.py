@@ -0,0 +1,42 @@
+"""Question cache
+
+Revision ID: 5e0d7b8a41c3
+Revises: a3c91f5d2b7e
+Create Date: 2026-10-18 10:03:17.552910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = '5e0d7b8a41c3'
+down_revision = 'a3c91f5d2b7e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('question_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=True),
+    sa.Column('prompt_version', sa.String(length=50), nullable=True),
+    sa.Column('questions', mysql.JSON(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('question_cache', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_question_cache_cache_key'), ['cache_key'], unique=True)
+        batch_op.create_index(batch_op.f('ix_question_cache_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('question_cache', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_question_cache_expires_at'))
+        batch_op.drop_index(batch_op.f('ix_question_cache_cache_key'))
+
+    op.drop_table('question_cache')
@@ -0,0 +1,59 @@
+"""Background interview preparation jobs
+
+Revision ID: a3c91f5d2b7e
+Revises: 889e73c2ff2f
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'a3c91f5d2b7e'
+down_revision = '889e73c2ff2f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('preparation_status', sa.Enum('queued', 'running', 'ready', 'failed', name='preparation_status'), server_default='queued', nullable=False))
+        batch_op.add_column(sa.Column('questions_ready', sa.Boolean(), server_default=sa.false(), nullable=False))
+        batch_op.add_column(sa.Column('audio_files', mysql.JSON(), nullable=True))
+
+    # Sessions that already have questions were prepared in-request
+    op.execute(
+        "UPDATE interview_sessions SET questions_ready = 1, preparation_status = 'ready' "
+        "WHERE questions IS NOT NULL"
+    )
+
+    op.create_table('interview_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'done', 'failed', name='job_status'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('interview_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_interview_jobs_session_id'), ['session_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_interview_jobs_status'), ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('interview_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_interview_jobs_status'))
+        batch_op.drop_index(batch_op.f('ix_interview_jobs_session_id'))
+
+    op.drop_table('interview_jobs')
+
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.drop_column('audio_files')
+        batch_op.drop_column('questions_ready')
+        batch_op.drop_column('preparation_status')
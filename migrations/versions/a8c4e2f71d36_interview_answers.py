@@ -0,0 +1,87 @@
+"""Interview answers table
+
+Revision ID: a8c4e2f71d36
+Revises: f3b8d2a61c74
+Create Date: 2026-10-18 19:12:27.540918
+
+"""
+import json
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'a8c4e2f71d36'
+down_revision = 'f3b8d2a61c74'
+branch_labels = None
+depends_on = None
+
+
+def _parse_time(value):
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+
+
+def upgrade():
+    op.create_table('interview_answers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('question_index', sa.Integer(), nullable=False),
+    sa.Column('answer', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['session_id'], ['interview_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id', 'question_index', name='uq_interview_answers_session_question')
+    )
+
+    # Backfill: one row per non-empty slot of each session's answers array
+    bind = op.get_bind()
+    sessions = sa.table('interview_sessions', sa.column('id', sa.Integer), sa.column('answers', sa.Text))
+    answers = sa.table('interview_answers',
+        sa.column('session_id', sa.Integer), sa.column('question_index', sa.Integer),
+        sa.column('answer', sa.Text), sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime))
+
+    rows = bind.execute(sa.select(sessions.c.id, sessions.c.answers)
+                        .where(sessions.c.answers.isnot(None)).order_by(sessions.c.id)).fetchall()
+    for session_id, stored in rows:
+        slots = json.loads(stored) if isinstance(stored, (str, bytes)) else stored
+        values = []
+        for index, slot in enumerate(slots or []):
+            if slot is None:
+                continue
+            answer = slot.get('answer') if isinstance(slot, dict) else slot
+            answered_at = _parse_time(slot.get('answered_at')) if isinstance(slot, dict) else None
+            values.append({'session_id': session_id, 'question_index': index, 'answer': answer,
+                           'created_at': answered_at, 'updated_at': answered_at})
+        if values:
+            bind.execute(answers.insert(), values)
+
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.drop_column('answers')
+
+
+def downgrade():
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('answers', mysql.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    sessions = sa.table('interview_sessions', sa.column('id', sa.Integer), sa.column('answers', mysql.JSON))
+    answers = sa.table('interview_answers',
+        sa.column('session_id', sa.Integer), sa.column('question_index', sa.Integer),
+        sa.column('answer', sa.Text), sa.column('updated_at', sa.DateTime))
+
+    arrays = {}
+    for session_id, index, answer, updated_at in bind.execute(sa.select(
+            answers.c.session_id, answers.c.question_index, answers.c.answer, answers.c.updated_at)).fetchall():
+        slots = arrays.setdefault(session_id, [])
+        slots.extend([None] * (index + 1 - len(slots)))
+        slots[index] = {'answer': answer, 'answered_at': updated_at.isoformat() if updated_at else None}
+    for session_id, slots in arrays.items():
+        bind.execute(sessions.update().where(sessions.c.id == session_id).values(answers=slots))
+    bind.execute(sessions.update().where(sessions.c.answers.is_(None)).values(answers=[]))
+
+    op.drop_table('interview_answers')
@@ -0,0 +1,39 @@
+"""Alternate files of a resume
+
+Revision ID: b2f7e4c91a58
+Revises: d9a4f1c27b63
+Create Date: 2026-10-19 11:42:08.163520
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2f7e4c91a58'
+down_revision = 'd9a4f1c27b63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('resume_files',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('file_hash', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'file_hash', name='uq_resume_files_user_file_hash')
+    )
+    with op.batch_alter_table('resume_files', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_resume_files_resume_id'), ['resume_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_files', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_files_resume_id'))
+
+    op.drop_table('resume_files')
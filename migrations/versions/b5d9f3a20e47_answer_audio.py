@@ -0,0 +1,30 @@
+"""Answer audio
+
+Revision ID: b5d9f3a20e47
+Revises: a8c4e2f71d36
+Create Date: 2026-10-18 20:31:54.206118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5d9f3a20e47'
+down_revision = 'a8c4e2f71d36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('interview_answers', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('audio_path', sa.String(length=500), nullable=True))
+        batch_op.add_column(sa.Column('audio_content_type', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('audio_size', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('interview_answers', schema=None) as batch_op:
+        batch_op.drop_column('audio_size')
+        batch_op.drop_column('audio_content_type')
+        batch_op.drop_column('audio_path')
@@ -0,0 +1,31 @@
+"""Interview session history indexes
+
+Revision ID: c2e6a9d47f15
+Revises: b5d9f3a20e47
+Create Date: 2026-10-18 21:40:12.873365
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e6a9d47f15'
+down_revision = 'b5d9f3a20e47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.create_index('ix_interview_sessions_user_status_created', ['user_id', 'status', 'created_at'], unique=False)
+        batch_op.create_index('ix_interview_sessions_user_created', ['user_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        if op.get_bind().dialect.name == 'mysql':
+            # MySQL dropped the users foreign key's implicit index when these were added; it needs one back
+            batch_op.create_index('user_id', ['user_id'], unique=False)
+        batch_op.drop_index('ix_interview_sessions_user_created')
+        batch_op.drop_index('ix_interview_sessions_user_status_created')
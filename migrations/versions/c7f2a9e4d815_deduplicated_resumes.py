@@ -0,0 +1,91 @@
+"""Deduplicated resumes
+
+Revision ID: c7f2a9e4d815
+Revises: 5e0d7b8a41c3
+Create Date: 2026-10-18 11:26:02.904733
+
+"""
+import hashlib
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c7f2a9e4d815'
+down_revision = '5e0d7b8a41c3'
+branch_labels = None
+depends_on = None
+
+
+def _text_hash(text):
+    # Same normalization as app.services.resumes.hash_text
+    return hashlib.sha256(' '.join((text or '').split()).encode('utf-8')).hexdigest()
+
+
+def upgrade():
+    op.create_table('resumes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('file_hash', sa.String(length=64), nullable=True),
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'file_hash', name='uq_resumes_user_file_hash')
+    )
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.create_index('ix_resumes_user_text_hash', ['user_id', 'text_hash'], unique=False)
+
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_id', sa.Integer(), nullable=True))
+
+    # Backfill: one resume per (user, normalized text), referenced by every matching session
+    bind = op.get_bind()
+    resumes = sa.Table('resumes', sa.MetaData(),
+        sa.Column('id', sa.Integer, primary_key=True), sa.Column('user_id', sa.Integer),
+        sa.Column('file_hash', sa.String(64)), sa.Column('text_hash', sa.String(64)),
+        sa.Column('text', sa.Text), sa.Column('created_at', sa.DateTime))
+    sessions = sa.table('interview_sessions',
+        sa.column('id', sa.Integer), sa.column('user_id', sa.Integer),
+        sa.column('resume_text_data', sa.Text), sa.column('resume_id', sa.Integer))
+
+    resume_ids = {}
+    rows = bind.execute(sa.select(sessions.c.id, sessions.c.user_id, sessions.c.resume_text_data)
+                        .order_by(sessions.c.id)).fetchall()
+    for session_id, user_id, text in rows:
+        key = (user_id, _text_hash(text))
+        if key not in resume_ids:
+            result = bind.execute(resumes.insert().values(
+                user_id=user_id, file_hash=None, text_hash=key[1], text=text or '', created_at=datetime.utcnow()))
+            resume_ids[key] = result.inserted_primary_key[0]
+        bind.execute(sessions.update().where(sessions.c.id == session_id).values(resume_id=resume_ids[key]))
+
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.alter_column('resume_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_interview_sessions_resume_id'), ['resume_id'], unique=False)
+        batch_op.create_foreign_key('fk_interview_sessions_resume_id', 'resumes', ['resume_id'], ['id'])
+        batch_op.drop_column('resume_text_data')
+
+
+def downgrade():
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_text_data', sa.Text(), nullable=True))
+
+    bind = op.get_bind()
+    resumes = sa.table('resumes', sa.column('id', sa.Integer), sa.column('text', sa.Text))
+    sessions = sa.table('interview_sessions',
+        sa.column('resume_text_data', sa.Text), sa.column('resume_id', sa.Integer))
+    for resume_id, text in bind.execute(sa.select(resumes.c.id, resumes.c.text)).fetchall():
+        bind.execute(sessions.update().where(sessions.c.resume_id == resume_id).values(resume_text_data=text))
+
+    with op.batch_alter_table('interview_sessions', schema=None) as batch_op:
+        batch_op.alter_column('resume_text_data', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_constraint('fk_interview_sessions_resume_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_interview_sessions_resume_id'))
+        batch_op.drop_column('resume_id')
+
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_index('ix_resumes_user_text_hash')
+
+    op.drop_table('resumes')
@@ -0,0 +1,29 @@
+"""Resume skills
+
+Revision ID: d4e8b1c6a927
+Revises: c7f2a9e4d815
+Create Date: 2026-10-18 14:02:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'd4e8b1c6a927'
+down_revision = 'c7f2a9e4d815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing resumes are filled in by `flask extract-resume-skills`
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('skills', mysql.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('skills_extracted_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_column('skills_extracted_at')
+        batch_op.drop_column('skills')
@@ -0,0 +1,26 @@
+"""Interview job retry backoff
+
+Revision ID: d9a4f1c27b63
+Revises: c2e6a9d47f15
+Create Date: 2026-10-19 10:05:31.402817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9a4f1c27b63'
+down_revision = 'c2e6a9d47f15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('interview_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('not_before', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('interview_jobs', schema=None) as batch_op:
+        batch_op.drop_column('not_before')
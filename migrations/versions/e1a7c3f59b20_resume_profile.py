@@ -0,0 +1,29 @@
+"""Parsed resume profile
+
+Revision ID: e1a7c3f59b20
+Revises: d4e8b1c6a927
+Create Date: 2026-10-18 16:25:09.552817
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision = 'e1a7c3f59b20'
+down_revision = 'd4e8b1c6a927'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing resumes are parsed by `flask extract-resume-skills`
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('parsed', mysql.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('parsed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('resumes', schema=None) as batch_op:
+        batch_op.drop_column('parsed_at')
+        batch_op.drop_column('parsed')
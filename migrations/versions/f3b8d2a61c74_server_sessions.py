@@ -0,0 +1,34 @@
+"""Server-side sessions
+
+Revision ID: f3b8d2a61c74
+Revises: e1a7c3f59b20
+Create Date: 2026-10-18 17:48:36.120354
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b8d2a61c74'
+down_revision = 'e1a7c3f59b20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('server_sessions',
+    sa.Column('id', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('server_sessions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_server_sessions_expires_at'), ['expires_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('server_sessions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_server_sessions_expires_at'))
+
+    op.drop_table('server_sessions')
@@ -0,0 +1,61 @@
+import pytest
+
+import app as app_package
+from app import create_app, db
+from app.models import JobPosting, Resume, User
+from config import TestingConfig
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # Audio, upload, index and cache directories are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'app.db'}")
+    # The app's own extensions keep per-process state (caches, indexes, counters); start each test afresh
+    for name, extension in list(vars(app_package).items()):
+        if hasattr(extension, 'init_app') and type(extension).__module__.startswith('app.'):
+            monkeypatch.setattr(app_package, name, type(extension)())
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user(app):
+    user = User(auth0_id='auth0|tester', email='tester@example.com', name='Tester')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def client(app, user):
+    """Test client logged in as user"""
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = {'sub': user.auth0_id, 'email': user.email}
+        session['user_id'] = user.id
+    return client
+
+
+@pytest.fixture
+def resume(user):
+    resume = Resume(user_id=user.id, file_hash='f' * 64, text_hash='t' * 64, text='Python developer')
+    db.session.add(resume)
+    db.session.commit()
+    return resume
+
+
+@pytest.fixture
+def add_posting(user):
+    """Factory for active job postings posted by user"""
+    def add_posting(title, skills=None, requirements=None, **fields):
+        posting = JobPosting(title=title, company='Acme', posted_by=user.id, skills_required=skills,
+                             requirements=requirements, **fields)
+        db.session.add(posting)
+        db.session.commit()
+        return posting
+    return add_posting
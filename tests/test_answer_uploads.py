@@ -0,0 +1,119 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from app import db
+from app.models import InterviewAnswer, InterviewSession
+from app.services.answer_uploads import get_answer_uploads
+
+RECORDING = b'webm recording, twenty-six'  # 26 bytes: three 8-byte chunks and a 2-byte one
+
+
+@pytest.fixture
+def interview_session(user, resume):
+    interview_session = InterviewSession(user_id=user.id, job_title='Backend Engineer', resume_id=resume.id,
+                                         questions=['Tell me about yourself', 'Why this role?'])
+    db.session.add(interview_session)
+    db.session.commit()
+    return interview_session
+
+
+@pytest.fixture
+def upload_id(client, interview_session, monkeypatch):
+    monkeypatch.setattr(get_answer_uploads(), 'chunk_bytes', 8)
+    response = client.post(f'/interview/{interview_session.id}/answers/1/upload',
+                           json={'size': len(RECORDING), 'content_type': 'audio/webm;codecs=opus'})
+    assert response.status_code == 201
+    assert response.json['chunk_size'] == 8
+    return response.json['upload_id']
+
+
+def put(client, upload_id, offset, chunk, checksum=None):
+    return client.put(f'/answer-upload/{upload_id}', data=chunk, headers={
+        'Upload-Offset': str(offset),
+        'Upload-Checksum': checksum or hashlib.sha256(chunk).hexdigest(),
+    })
+
+
+def send_from(client, upload_id, offset):
+    while offset < len(RECORDING):
+        response = put(client, upload_id, offset, RECORDING[offset:offset + 8])
+        assert response.status_code == 200
+        offset = response.json['offset']
+    return response
+
+
+def test_chunks_are_assembled_and_linked_to_the_answer(client, upload_id, interview_session):
+    response = send_from(client, upload_id, 0)
+
+    assert response.json['complete']
+    answer = InterviewAnswer.query.filter_by(session_id=interview_session.id, question_index=1).one()
+    assert answer.audio_content_type == 'audio/webm'
+    with open(answer.audio_path, 'rb') as f:
+        assert f.read() == RECORDING
+    assert client.get(f'/answer-upload/{upload_id}').status_code == 404
+
+
+def test_chunk_for_the_wrong_offset_is_a_conflict(client, upload_id):
+    put(client, upload_id, 0, RECORDING[:8])
+
+    response = put(client, upload_id, 16, RECORDING[16:24])
+
+    assert response.status_code == 409
+    assert response.json['offset'] == 8
+
+
+def test_chunk_with_a_bad_checksum_is_not_kept(client, upload_id):
+    response = put(client, upload_id, 0, RECORDING[:8], checksum='0' * 64)
+
+    assert response.status_code == 400
+    assert client.get(f'/answer-upload/{upload_id}').json['offset'] == 0
+    send_from(client, upload_id, 0)
+
+
+def test_chunk_longer_than_expected_is_rejected(client, upload_id):
+    response = put(client, upload_id, 0, RECORDING[:12])
+
+    assert response.status_code == 400
+    assert client.get(f'/answer-upload/{upload_id}').json['offset'] == 0
+
+
+def test_recording_larger_than_the_limit_is_refused(client, interview_session, monkeypatch):
+    monkeypatch.setattr(get_answer_uploads(), 'max_bytes', 16)
+
+    response = client.post(f'/interview/{interview_session.id}/answers/0/upload',
+                           json={'size': 17, 'content_type': 'audio/webm'})
+
+    assert response.status_code == 400
+
+
+class Disconnecting:
+    """Request stream that drops after a few bytes"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def read(self, size):
+        if self.data is None:
+            raise OSError('Client disconnected')
+        data, self.data = self.data, None
+        return data
+
+
+def test_interrupted_chunk_is_discarded_and_the_upload_resumes(client, upload_id, user, interview_session):
+    uploads = get_answer_uploads()
+    uploads.write_chunk(upload_id, user.id, 0, io.BytesIO(RECORDING[:8]), hashlib.sha256(RECORDING[:8]).hexdigest())
+    with pytest.raises(OSError):
+        uploads.write_chunk(upload_id, user.id, 8, Disconnecting(RECORDING[8:12]), '')
+    assert os.path.getsize(os.path.join(uploads.root, '.uploads', f'{upload_id}.part')) == 12
+
+    offset = client.get(f'/answer-upload/{upload_id}').json['offset']
+    response = send_from(client, upload_id, offset)
+
+    assert offset == 8
+    assert response.json['complete']
+    answer = InterviewAnswer.query.filter_by(session_id=interview_session.id, question_index=1).one()
+    with open(answer.audio_path, 'rb') as f:
+        assert f.read() == RECORDING
@@ -0,0 +1,120 @@
+import os
+from types import SimpleNamespace
+
+from app.main.routes import generate_audio_for_questions
+from app.services.audio_cache import AudioCache, get_audio_cache
+from app.services.audio_delivery import get_audio_delivery
+
+PCM = b'\x00\x01' * 2400
+
+
+def key(text):
+    return AudioCache.make_key(text, 'Kore', 'prompt', 'tts')
+
+
+class CountingTTSClient:
+    def __init__(self):
+        self.models = self
+        self.calls = 0
+
+    def generate_content(self, model, contents, config):
+        self.calls += 1
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=PCM))
+        return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+def test_key_ignores_spacing_but_not_voice():
+    assert key('Tell me  about\nyourself ') == key('Tell me about yourself')
+    assert AudioCache.make_key('Tell me about yourself', 'Puck', 'prompt', 'tts') != key('Tell me about yourself')
+
+
+def test_stored_audio_is_read_back_from_memory_after_the_first_hit(app):
+    cache = get_audio_cache()
+    assert cache.get(key('Why this role?')) is None
+
+    cache.put(key('Why this role?'), PCM)
+    first = cache.get(key('Why this role?'))
+    second = cache.get(key('Why this role?'))
+
+    assert first == second and first.startswith(b'RIFF')
+    stats = cache.stats()
+    assert (stats['misses'], stats['hits'], stats['memory_hits']) == (1, 1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(app, monkeypatch):
+    cache = get_audio_cache()
+    monkeypatch.setattr(cache, 'max_entries', 2)
+    cache.put(key('one'), PCM)
+    cache.put(key('two'), PCM)
+    cache.get_path(key('one'))
+
+    cache.put(key('three'), PCM)
+
+    assert cache.get_path(key('two')) is None
+    assert cache.get_path(key('one')) and cache.get_path(key('three'))
+    assert cache.stats()['evictions'] == 1
+
+
+def test_session_links_survive_eviction(app, monkeypatch):
+    cache = get_audio_cache()
+    monkeypatch.setattr(cache, 'max_entries', 1)
+    cache.put(key('one'), PCM)
+    linked = cache.link_into(key('one'), os.path.join('audio', 'session_1', 'question_1.wav'))
+
+    cache.put(key('two'), PCM)
+
+    assert cache.get_path(key('one')) is None
+    assert os.path.getsize(linked) > len(PCM)
+
+
+def test_repeated_questions_are_not_synthesized_again(app):
+    client = CountingTTSClient()
+    questions = ['Tell me about yourself', 'Why this role?']
+
+    first = generate_audio_for_questions(1, questions, client=client)
+    second = generate_audio_for_questions(2, questions, client=client)
+
+    assert client.calls == 2
+    assert sorted(first) == sorted(second) == ['0', '1']
+
+
+def test_cache_hits_keep_the_content_mtime(app):
+    cache = get_audio_cache()
+    path = cache.put(key('Tell me about yourself'), PCM)
+    written = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(written - 10 ** 9, written))
+
+    assert cache.get_path(key('Tell me about yourself')) == path
+
+    stat = os.stat(path)
+    assert stat.st_mtime_ns == written
+    assert stat.st_atime_ns > written - 10 ** 9
+
+
+def test_validators_are_stable_across_cache_hits(app):
+    cache = get_audio_cache()
+    delivery = get_audio_delivery()
+    cache.put(key('Why this role?'), PCM)
+
+    with app.test_request_context():
+        first = delivery.send(cache.get_path(key('Why this role?')), 'audio/wav')
+        second = delivery.send(cache.get_path(key('Why this role?')), 'audio/wav')
+
+    assert first.get_etag() == second.get_etag()
+    assert first.last_modified == second.last_modified
+    assert len(delivery._digests) == 1
+
+
+def test_serving_audio_is_not_counted_as_a_hit(client, monkeypatch):
+    cache = get_audio_cache()
+    monkeypatch.setattr(cache, 'max_entries', 2)
+    cache.put(key('one'), PCM)
+    cache.put(key('two'), PCM)
+
+    for _ in range(3):
+        assert client.get(f'/api/tts-audio/{key("one")}').status_code == 200
+    cache.put(key('three'), PCM)
+
+    assert cache.stats()['hits'] == 0
+    assert cache.peek(key('one')) is None
+    assert cache.peek(key('two'))
@@ -0,0 +1,88 @@
+import hashlib
+import os
+
+import pytest
+
+from app import db
+from app.models import InterviewSession, User
+from app.services.audio_cache import AudioCache, get_audio_cache
+from app.services.audio_delivery import get_audio_delivery
+
+PCM = b'\x00\x01' * 2400
+KEY = AudioCache.make_key('Tell me about yourself', 'Kore', 'prompt', 'tts')
+
+
+@pytest.fixture
+def wav(app):
+    cache = get_audio_cache()
+    cache.put(KEY, PCM)
+    return cache.get_path(KEY)
+
+
+def test_etag_is_the_content_hash_and_revalidates_to_304(client, wav):
+    with open(wav, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+
+    response = client.get(f'/api/tts-audio/{KEY}')
+    again = client.get(f'/api/tts-audio/{KEY}', headers={'If-None-Match': f'"{digest}"'})
+
+    assert response.headers['ETag'] == f'"{digest}"'
+    assert response.cache_control.no_cache and response.cache_control.private
+    assert again.status_code == 304 and not again.data
+
+
+def test_ranges_are_served_partially(client, wav):
+    partial = client.get(f'/api/tts-audio/{KEY}', headers={'Range': 'bytes=0-3'})
+    outside = client.get(f'/api/tts-audio/{KEY}', headers={'Range': f'bytes={os.path.getsize(wav) + 10}-'})
+
+    assert partial.status_code == 206 and partial.data == b'RIFF'
+    assert outside.status_code == 416
+
+
+def test_matching_version_is_cached_for_good(client, wav):
+    version = get_audio_delivery().version(wav)
+
+    current = client.get(f'/api/tts-audio/{KEY}?v={version}')
+    outdated = client.get(f'/api/tts-audio/{KEY}?v=0000000000000000')
+
+    assert current.cache_control.immutable and current.cache_control.max_age == 365 * 24 * 3600
+    assert not outdated.cache_control.immutable and outdated.cache_control.max_age == 0
+
+
+def test_rewritten_file_is_hashed_again(app, tmp_path):
+    delivery = get_audio_delivery()
+    path = tmp_path / 'clip.wav'
+    path.write_bytes(b'first')
+    first = delivery.digest(str(path))
+
+    path.write_bytes(b'second, longer')
+
+    assert delivery.digest(str(path)) != first
+    assert delivery.digest(str(tmp_path / 'missing.wav')) is None
+
+
+@pytest.mark.parametrize('mode, header, expected', [
+    ('x-sendfile', 'X-Sendfile', lambda wav, root: wav),
+    ('x-accel-redirect', 'X-Accel-Redirect',
+     lambda wav, root: '/protected-audio/' + os.path.relpath(wav, root).replace(os.sep, '/')),
+])
+def test_proxy_offload_sends_only_headers(client, wav, mode, header, expected):
+    delivery = get_audio_delivery()
+    delivery.sendfile = mode
+
+    response = client.get(f'/api/tts-audio/{KEY}')
+
+    assert response.status_code == 200 and not response.data
+    assert response.headers[header] == expected(os.path.abspath(wav), delivery.accel_root)
+    assert response.headers['ETag']
+
+
+def test_question_audio_is_only_served_to_the_owner(client, resume):
+    other = User(auth0_id='auth0|other', email='other@example.com')
+    db.session.add(other)
+    db.session.commit()
+    interview_session = InterviewSession(user_id=other.id, job_title='Backend Engineer', resume_id=resume.id)
+    db.session.add(interview_session)
+    db.session.commit()
+
+    assert client.get(f'/serve-audio/{interview_session.id}/question_0.wav').status_code == 403
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+from werkzeug.datastructures import MIMEAccept
+
+from app.services.audio_cache import AudioCache, get_audio_cache
+from app.services.audio_encoding import get_audio_encoder
+
+PCM = b'\x00\x01' * 2400
+KEY = AudioCache.make_key('Tell me about yourself', 'Kore', 'prompt', 'tts')
+
+# Stands in for ffmpeg: writes an Ogg-looking copy of the input to the output path
+FAKE_FFMPEG = f"""#!{sys.executable}
+import sys
+args = sys.argv[1:]
+with open(args[args.index('-i') + 1], 'rb') as source, open(args[-1], 'wb') as target:
+    target.write(b'OggS' + source.read()[:100])
+"""
+
+
+@pytest.fixture
+def encoder(app, tmp_path):
+    ffmpeg = tmp_path / 'ffmpeg'
+    ffmpeg.write_text(FAKE_FFMPEG)
+    ffmpeg.chmod(0o755)
+    encoder = get_audio_encoder()
+    encoder.ffmpeg = str(ffmpeg)
+    return encoder
+
+
+def test_without_ffmpeg_everything_stays_wav(app, tmp_path):
+    encoder = get_audio_encoder()
+    encoder.ffmpeg = None
+    wav = str(tmp_path / 'question.wav')
+
+    assert not encoder.enabled
+    assert encoder.encode(wav) is None
+    assert encoder.choose(wav, 'opus', MIMEAccept([('audio/ogg', 1)])) == (wav, 'audio/wav')
+
+
+def test_cached_audio_gets_a_variant_linked_and_evicted_with_it(encoder, tmp_path):
+    cache = get_audio_cache()
+    cache.put(KEY, PCM)
+    variant = encoder.variant_path(cache.get_path(KEY))
+    with open(variant, 'rb') as f:
+        assert f.read(4) == b'OggS'
+
+    session_wav = str(tmp_path / 'session_1' / 'question_0.wav')
+    cache.link_into(KEY, session_wav)
+    assert os.path.exists(str(tmp_path / 'session_1' / 'question_0.opus'))
+
+    cache.max_entries = 0
+    cache.put(AudioCache.make_key('Why this role?', 'Kore', 'prompt', 'tts'), PCM)
+    assert not os.path.exists(variant)
+
+
+@pytest.mark.parametrize('requested, accept, served', [
+    ('opus', [('*/*', 1)], 'audio/ogg; codecs=opus'),
+    (None, [('audio/ogg', 1), ('*/*', 0.5)], 'audio/ogg; codecs=opus'),
+    (None, [('*/*', 1)], 'audio/wav'),
+    ('wav', [('audio/ogg', 1)], 'audio/wav'),
+])
+def test_variant_is_served_only_when_asked_for(encoder, tmp_path, requested, accept, served):
+    wav = tmp_path / 'question.wav'
+    wav.write_bytes(b'RIFF')
+    encoder.encode(str(wav))
+
+    path, mimetype = encoder.choose(str(wav), requested, MIMEAccept(accept))
+
+    assert mimetype == served
+    assert path.endswith('.opus' if served != 'audio/wav' else '.wav')
+
+
+def test_tts_audio_serves_the_requested_format(client, encoder):
+    get_audio_cache().put(KEY, PCM)
+
+    opus = client.get(f'/api/tts-audio/{KEY}?format=opus')
+    wav = client.get(f'/api/tts-audio/{KEY}')
+
+    assert opus.mimetype == 'audio/ogg' and opus.data.startswith(b'OggS')
+    assert wav.mimetype == 'audio/wav' and 'Accept' in wav.vary
+    assert client.get('/api/tts-audio/not-a-key').status_code == 404
+
+
+def test_apps_without_an_encoder_serve_wav(app, client):
+    del app.extensions['audio_encoder']
+    cache = get_audio_cache()
+    cache.encoder = None
+    cache.put(KEY, PCM)
+
+    response = client.get(f'/api/tts-audio/{KEY}?format=opus')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'audio/wav'
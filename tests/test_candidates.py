@@ -0,0 +1,111 @@
+import pytest
+
+from app import db
+from app.models import User
+from app.services.candidates import decode_cursor, encode_cursor, get_candidate_matcher
+from app.services import matching
+from app.services.matching import SkillIndex, get_job_matcher
+from app.services.resumes import get_or_create_resume
+
+
+def add_candidate(name, text):
+    user = User(auth0_id=f'auth0|{name}', email=f'{name}@example.com', name=name.title())
+    db.session.add(user)
+    db.session.commit()
+    return get_or_create_resume(user.id, f'%PDF {name} {text}'.encode(), lambda data: text)
+
+
+def test_query_ranking_orders_by_coverage_then_id():
+    index = SkillIndex.build([(1, ['python']), (2, ['python', 'sql']), (3, ['python', 'sql']), (4, ['java'])])
+
+    ranked = index.top_k_for_query(['Python', 'SQL'], 10)
+
+    assert [match['id'] for match in ranked] == [2, 3, 1]
+    assert ranked[0]['score'] == 1.0
+    assert ranked[0]['matched_skills'] == ['python', 'sql']
+
+
+def test_query_pages_continue_after_the_cursor():
+    index = SkillIndex.build([(i, ['python'] if i % 2 else ['python', 'sql']) for i in range(1, 8)])
+    everything = [match['id'] for match in index.top_k_for_query(['python', 'sql'], 10)]
+
+    pages, after = [], None
+    while True:
+        page = index.top_k_for_query(['python', 'sql'], 3, after)
+        if not page:
+            break
+        pages.extend(match['id'] for match in page)
+        after = (page[-1]['score'], page[-1]['id'])
+
+    assert pages == everything
+
+
+def test_cursor_round_trips_and_rejects_garbage():
+    assert decode_cursor(encode_cursor(0.333333, 42)) == (0.333333, 42)
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor')
+
+
+def test_resume_skills_are_extracted_once_at_upload(add_posting):
+    add_posting('Data Engineer', ['Python', 'Spark'])
+
+    resume = add_candidate('ada', 'Ten years of Python and Spark, some Golang. ' * 2)
+
+    assert resume.skills == ['python', 'spark', 'go']
+    assert resume.skills_extracted_at is not None
+
+
+def test_upload_extracts_skills_without_building_the_job_index(app, add_posting, monkeypatch):
+    add_posting('Platform Engineer', ['Nomad'])
+    job_matcher = get_job_matcher()
+    job_matcher.invalidate()
+
+    def build(postings):
+        raise AssertionError('the job index was built in the upload request')
+
+    monkeypatch.setattr(matching.SkillIndex, 'build', build)
+    resume = add_candidate('ada', 'Nomad and Terraform clusters, some Python scripting for tooling.')
+    add_posting('Site Reliability Engineer', ['Consul'])
+    grace = add_candidate('grace', 'Consul service mesh and Nomad job specs for the platform team.')
+
+    assert resume.skills == ['nomad', 'terraform', 'python']
+    assert grace.skills == ['consul', 'nomad']
+    assert job_matcher._index is None
+
+
+def test_candidates_endpoint_ranks_latest_resumes(client, add_posting):
+    posting = add_posting('Data Engineer', ['Python', 'Spark', 'SQL'])
+    add_candidate('ada', 'Python, Spark and SQL pipelines for analytics teams.')
+    grace = add_candidate('grace', 'Python and SQL reporting for the finance department.')
+    add_candidate('linus', 'Java services and Kotlin Android apps for retail clients.')
+
+    first = client.get(f'/api/jobs/{posting.id}/candidates?limit=1').get_json()
+    second = client.get(f"/api/jobs/{posting.id}/candidates?limit=1&cursor={first['next_cursor']}").get_json()
+
+    assert [c['name'] for c in first['candidates']] == ['Ada']
+    assert second['candidates'][0]['resume_id'] == grace.id
+    assert second['candidates'][0]['missing_skills'] == ['spark']
+
+
+def test_new_upload_replaces_the_users_indexed_resume(app, add_posting):
+    add_posting('Data Engineer', ['Python', 'Spark'])
+    old = add_candidate('ada', 'Python scripting for laboratory data and weekly reports.')
+    matcher = get_candidate_matcher()
+    assert [match['id'] for match in matcher.rank(['python'])] == [old.id]
+
+    text = 'Spark jobs on large clusters, tuned and monitored daily.'
+    new = get_or_create_resume(old.user_id, b'%PDF new', lambda data: text)
+
+    assert [match['id'] for match in matcher.rank(['python', 'spark'])] == [new.id]
+
+
+def test_only_the_poster_sees_candidates(app, client, add_posting):
+    posting = add_posting('Data Engineer', ['Python'])
+    other = User(auth0_id='auth0|other', email='other@example.com', name='Other')
+    db.session.add(other)
+    db.session.commit()
+    posting.posted_by = other.id
+    db.session.commit()
+
+    assert client.get(f'/api/jobs/{posting.id}/candidates').status_code == 403
+    assert client.get('/api/jobs/999/candidates').status_code == 404
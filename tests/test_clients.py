@@ -0,0 +1,44 @@
+import pytest
+
+from app.services.clients import get_gemini_clients
+
+
+@pytest.fixture
+def clients(app):
+    clients = get_gemini_clients()
+    clients.api_key = 'test-key'
+    return clients
+
+
+def test_clients_need_an_api_key(app):
+    clients = get_gemini_clients()
+    clients.api_key = None
+
+    with pytest.raises(ValueError):
+        clients.tts_client()
+
+
+def test_clients_are_built_once_and_reused(clients):
+    assert clients.tts_client() is clients.tts_client()
+    assert clients.text_model() is clients.text_model()
+    assert clients.text_model('gemini-2.0-flash') is not clients.text_model('gemini-1.5-pro')
+
+    stats = clients.stats()
+    assert (stats['tts_clients_created'], stats['text_clients_created']) == (1, 2)
+    assert stats['client_reuse_rate'] == pytest.approx(1 - 3 / 6)
+
+
+def test_clients_are_rebuilt_in_a_forked_process(clients):
+    tts_client = clients.tts_client()
+
+    clients._pid = -1  # As seen from a child process
+    assert clients.tts_client() is not tts_client
+    assert clients.stats()['tts_clients_created'] == 1
+
+
+def test_stats_are_served_per_worker(client, clients):
+    clients.tts_client()
+
+    response = client.get('/api/gemini-clients/stats')
+
+    assert response.json['stats']['tts_checkouts'] == 1
@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.services.matching import SkillIndex, get_job_matcher
+from app.services.snapshot import Snapshot, open_current_snapshot, publish_snapshot, write_snapshot
+
+POSTINGS = [(1, ['Python', 'Flask']), (2, ['Python', 'Spark', 'SQL']), (3, ['Java'])]
+
+
+def ranked(index, skills):
+    return [(m['job_id'], round(m['score'], 6)) for m in index.top_k(skills, 10)]
+
+
+def test_snapshot_round_trips_aligned_arrays(tmp_path):
+    path = str(tmp_path / 'test.snap')
+    arrays = {'small': np.arange(3, dtype=np.int8), 'wide': np.arange(6, dtype=np.float64).reshape(2, 3),
+              'empty': np.zeros(0, dtype=np.int32)}
+
+    write_snapshot(path, 'test', arrays, {'note': 'hi'})
+    snapshot = Snapshot(path)
+
+    assert snapshot.kind == 'test' and snapshot.meta == {'note': 'hi'}
+    for name, value in arrays.items():
+        np.testing.assert_array_equal(snapshot.arrays[name], value)
+    assert not snapshot.arrays['wide'].flags.writeable
+    assert snapshot.arrays['wide'].ctypes.data % 64 == 0
+
+
+def test_not_a_snapshot_is_rejected(tmp_path):
+    path = tmp_path / 'bogus.snap'
+    path.write_bytes(b'not a snapshot at all')
+
+    with pytest.raises(ValueError):
+        Snapshot(str(path))
+
+
+def test_publish_moves_current_and_keeps_newest_versions(tmp_path):
+    root = str(tmp_path)
+    assert open_current_snapshot(root, 'test') is None
+
+    paths = [publish_snapshot(root, 'test', {'value': np.array([i])}, {}, keep=2) for i in range(3)]
+
+    assert open_current_snapshot(root, 'test').path == paths[-1]
+    assert sorted(name for name in os.listdir(root) if name.endswith('.snap')) == \
+        sorted(os.path.basename(path) for path in paths[1:])
+
+
+def test_index_from_snapshot_matches_built_index(tmp_path):
+    built = SkillIndex.build(POSTINGS)
+    path = str(tmp_path / 'index.snap')
+    arrays, meta = built.to_snapshot()
+    write_snapshot(path, SkillIndex.SNAPSHOT_KIND, arrays, meta)
+    snapshot = Snapshot(path)
+
+    opened = SkillIndex.from_snapshot(snapshot.arrays, snapshot.meta)
+
+    for skills in (['python'], ['python', 'sql'], ['java', 'flask']):
+        assert ranked(opened, skills) == ranked(built, skills)
+
+
+def test_changes_after_the_snapshot_are_applied_over_the_base():
+    arrays, meta = SkillIndex.build(POSTINGS).to_snapshot()
+    index = SkillIndex.from_snapshot(arrays, meta)
+
+    index.add(2, ['Go'])
+    index.add(4, ['Python', 'Kafka'])
+    index.remove(3)
+
+    expected = SkillIndex.build([(1, ['Python', 'Flask']), (2, ['Go']), (4, ['Python', 'Kafka'])])
+    for skills in (['python'], ['spark'], ['go', 'kafka'], ['java']):
+        assert ranked(index, skills) == ranked(expected, skills)
+
+
+def test_matcher_opens_the_published_snapshot(app, add_posting):
+    posting = add_posting('Backend Engineer', ['Python', 'Flask'])
+    matcher = get_job_matcher()
+    path = matcher.write_snapshot()
+
+    matcher.invalidate()
+    index = matcher.index()
+
+    assert index._base is not None
+    assert os.path.dirname(path) == matcher.snapshot_dir
+    assert [m['job_id'] for m in matcher.match(['python', 'flask'])] == [posting.id]
+
+
+def test_build_index_command_writes_snapshot(app, add_posting):
+    add_posting('Backend Engineer', ['Python'])
+
+    result = app.test_cli_runner().invoke(args=['build-index', '--skip-search'])
+
+    assert result.exit_code == 0, result.output
+    assert open_current_snapshot(get_job_matcher().snapshot_dir, SkillIndex.SNAPSHOT_KIND) is not None
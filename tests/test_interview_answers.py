@@ -0,0 +1,43 @@
+import pytest
+
+from app import db
+from app.models import InterviewAnswer, InterviewSession
+
+
+@pytest.fixture
+def interview_session(user, resume):
+    interview_session = InterviewSession(user_id=user.id, job_title='Backend Engineer', resume_id=resume.id,
+                                         questions=['Q1', 'Q2', 'Q3'])
+    db.session.add(interview_session)
+    db.session.commit()
+    return interview_session
+
+
+def test_answers_are_rows_in_question_order(interview_session):
+    interview_session.add_answer(2, 'Third')
+    interview_session.add_answer(0, 'First')
+
+    assert [(a.question_index, a.answer) for a in interview_session.answers] == [(0, 'First'), (2, 'Third')]
+    assert interview_session.get_answered_count() == 2
+
+
+def test_saving_again_replaces_the_answer(interview_session):
+    interview_session.add_answer(1, 'Draft')
+    created_at = InterviewAnswer.query.one().created_at
+
+    interview_session.add_answer(1, 'Final')
+
+    answer = InterviewAnswer.query.one()
+    db.session.refresh(answer)
+    assert answer.answer == 'Final'
+    assert answer.created_at == created_at
+    assert answer.updated_at >= created_at
+
+
+def test_deleting_the_session_deletes_its_answers(interview_session):
+    interview_session.add_answer(0, 'Answer')
+
+    db.session.delete(interview_session)
+    db.session.commit()
+
+    assert InterviewAnswer.query.count() == 0
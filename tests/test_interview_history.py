@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect
+
+from app import db
+from app.main.routes import encode_history_cursor
+from app.models import InterviewSession, User
+
+
+def add_sessions(user, resume, count):
+    start = datetime(2026, 1, 1)
+    sessions = [InterviewSession(user_id=user.id, job_title=f'Role {i}', resume_id=resume.id,
+                                 created_at=start + timedelta(days=i)) for i in range(count)]
+    db.session.add_all(sessions)
+    db.session.commit()
+    return sessions
+
+
+def test_pages_follow_the_cursor(client, user, resume):
+    add_sessions(user, resume, 5)
+
+    first = client.get('/interview-history?limit=2').json
+    second = client.get(f"/interview-history?limit=2&cursor={first['next_cursor']}").json
+    third = client.get(f"/interview-history?limit=2&cursor={second['next_cursor']}").json
+
+    titles = [s['job_title'] for page in (first, second, third) for s in page['sessions']]
+    assert titles == ['Role 4', 'Role 3', 'Role 2', 'Role 1', 'Role 0']
+    assert third['next_cursor'] is None
+
+
+def test_invalid_cursor_is_a_bad_request(client, user, resume):
+    add_sessions(user, resume, 1)
+
+    for cursor in ('not-a-cursor', encode_history_cursor(datetime(2026, 1, 1), 1)[:-3], 'MjAyNi0wMS0wMXx4'):
+        response = client.get(f'/interview-history?cursor={cursor}')
+        assert response.status_code == 400
+        assert not response.json['success']
+
+
+def test_cursor_of_a_deleted_session_still_pages_on(client, user, resume):
+    sessions = add_sessions(user, resume, 4)
+    cursor = client.get('/interview-history?limit=2').json['next_cursor']
+
+    # The page boundary itself is gone by the time the next page is asked for
+    db.session.delete(sessions[2])
+    db.session.commit()
+    page = client.get(f'/interview-history?limit=2&cursor={cursor}').json
+
+    assert [s['job_title'] for s in page['sessions']] == ['Role 1', 'Role 0']
+    assert page['next_cursor'] is None
+
+
+def test_status_filter_and_answer_counts(client, user, resume):
+    sessions = add_sessions(user, resume, 3)
+    sessions[1].status = 'completed'
+    db.session.commit()
+    sessions[1].add_answer(0, 'First')
+    sessions[1].add_answer(1, 'Second')
+
+    page = client.get('/interview-history?status=completed').json
+
+    assert [(s['job_title'], s['answered']) for s in page['sessions']] == [('Role 1', 2)]
+    assert client.get('/interview-history?status=bogus').status_code == 400
+
+
+def test_other_users_sessions_are_not_listed(client, user, resume):
+    other = User(auth0_id='auth0|other', email='other@example.com')
+    db.session.add(other)
+    db.session.commit()
+    add_sessions(other, resume, 2)
+
+    assert client.get('/interview-history').json['sessions'] == []
+
+
+def test_session_json_is_loaded_only_on_request(app, user, resume):
+    session_id, user_id = add_sessions(user, resume, 1)[0].id, user.id
+    db.session.expunge_all()
+
+    plain = db.session.get(InterviewSession, session_id)
+    assert {'questions', 'audio_files'} <= inspect(plain).unloaded
+    db.session.expunge_all()
+
+    loaded = InterviewSession.get_with_content(session_id)
+    assert not {'questions', 'audio_files'} & inspect(loaded).unloaded
+    assert InterviewSession.owner_id(session_id) == user_id
+    assert InterviewSession.owner_id(404) is None
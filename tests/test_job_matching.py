@@ -0,0 +1,59 @@
+import pytest
+
+from app.services.matching import normalize_skill
+
+
+@pytest.fixture
+def postings(add_posting):
+    return {
+        'backend': add_posting('Backend Engineer', ['Python', 'Flask', 'PostgreSQL']),
+        'data': add_posting('Data Engineer', ['python', 'Spark', 'Airflow', 'SQL']),
+        'frontend': add_posting('Frontend Engineer', ['JavaScript', 'React', 'CSS']),
+        'closed': add_posting('Flask Developer', ['Python', 'Flask'], is_active=False),
+    }
+
+
+def match(client, **body):
+    response = client.post('/api/jobs/match', json=body)
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_skills_are_normalized_through_aliases():
+    assert normalize_skill('  JS ') == 'javascript'
+    assert normalize_skill('K8s') == 'kubernetes'
+    assert normalize_skill('Postgres') == 'postgresql'
+
+
+def test_postings_are_ranked_by_weighted_skill_overlap(client, postings):
+    result = match(client, skills=['python', 'flask', 'postgres'])
+
+    ids = [m['job_id'] for m in result['matches']]
+    assert ids == [postings['backend'].id, postings['data'].id]
+    best = result['matches'][0]
+    assert best['score'] == pytest.approx(1.0)
+    assert best['title'] == 'Backend Engineer'
+    assert best['missing_skills'] == []
+    assert result['matches'][1]['missing_skills'] == ['spark', 'airflow', 'sql']
+
+
+def test_results_are_limited_to_k(client, postings):
+    assert len(match(client, skills=['python'], k=1)['matches']) == 1
+
+
+def test_skills_are_found_in_resume_text(client, postings):
+    result = match(client, resume_text='Built React and CSS frontends in JavaScript for five years.')
+
+    assert set(result['skills']) == {'react', 'css', 'javascript'}
+    assert result['matches'][0]['job_id'] == postings['frontend'].id
+
+
+def test_latest_resume_is_used_by_default(client, postings, resume):
+    result = match(client)
+
+    assert 'python' in result['skills']
+    assert {m['job_id'] for m in result['matches']} == {postings['backend'].id, postings['data'].id}
+
+
+def test_invalid_k_is_a_bad_request(client, postings):
+    assert client.post('/api/jobs/match', json={'skills': ['python'], 'k': 'many'}).status_code == 400
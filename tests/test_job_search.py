@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+
+import pytest
+
+from app import db
+from app.services.search import JobSearch, Segment, analyze, get_job_search
+
+DOCUMENTS = [
+    {'id': 1, 'title': 'Python Developer', 'text': 'Acme\nDjango services', 'location': 'Berlin',
+     'experience_level': 'Senior', 'employment_type': 'full-time'},
+    {'id': 2, 'title': 'Data Engineer', 'text': 'Acme\nPython pipelines with Spark', 'location': 'Remote',
+     'experience_level': 'Mid', 'employment_type': 'contract'},
+    {'id': 3, 'title': 'C++ Engineer', 'text': 'Acme\nLow-latency trading', 'location': 'berlin',
+     'experience_level': 'Senior', 'employment_type': 'full-time'},
+]
+
+
+def test_analyze_folds_accents_aliases_and_stopwords():
+    assert analyze('The Café team uses JS and C++') == ['cafe', 'team', 'uses', 'javascript', 'c++']
+
+
+def test_title_matches_outrank_body_matches():
+    total, hits = Segment.build(DOCUMENTS).search('python')
+
+    assert total == 2
+    assert [job_id for job_id, _ in hits] == [1, 2]
+
+
+def test_filters_accept_several_values_case_insensitively():
+    segment = Segment.build(DOCUMENTS)
+
+    assert segment.search('engineer developer', {'location': ['BERLIN']})[0] == 2
+    assert segment.search('engineer developer', {'employment_type': ['contract', 'part-time']})[1][0][0] == 2
+    assert segment.search('engineer', {'location': ['Paris']}) == (0, [])
+
+
+def test_pages_do_not_overlap():
+    segment = Segment.build(DOCUMENTS)
+
+    first = segment.search('acme', limit=2)
+    second = segment.search('acme', offset=2, limit=2)
+
+    assert first[0] == second[0] == 3
+    assert sorted(job_id for job_id, _ in first[1] + second[1]) == [1, 2, 3]
+
+
+def test_saved_segment_is_memory_mapped_with_the_same_results(tmp_path):
+    segment = Segment.build(DOCUMENTS)
+    segment.save(str(tmp_path / 'seg-1'))
+
+    loaded = Segment.load(str(tmp_path / 'seg-1'))
+
+    assert loaded.search('python spark') == segment.search('python spark')
+    assert loaded.postings_doc.filename is not None
+
+
+@pytest.fixture
+def postings(add_posting):
+    return [add_posting('Python Developer', ['Python', 'Django'], location='Berlin'),
+            add_posting('Data Engineer', ['Python', 'Spark'], location='Remote')]
+
+
+def search(client, query, **params):
+    response = client.get('/api/jobs/search', query_string=dict(params, q=query))
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def test_search_endpoint_pages_and_filters(client, postings):
+    result = search(client, 'python', location='berlin,paris', per_page=1)
+
+    assert (result['total'], result['pages']) == (1, 1)
+    assert result['results'][0]['title'] == 'Python Developer'
+    assert client.get('/api/jobs/search').status_code == 400
+
+
+def test_deactivated_posting_disappears_at_once(client, postings):
+    search(client, 'python')
+    postings[0].is_active = False
+    db.session.commit()
+
+    assert [r['title'] for r in search(client, 'python')['results']] == ['Data Engineer']
+
+
+def test_workers_rebuilding_at_once_leave_a_loadable_current(app, postings, monkeypatch):
+    # Another worker's JobSearch on the same directory builds while this one is publishing
+    other = JobSearch(app)
+    save = Segment.save
+    racing = []
+
+    def build_elsewhere():
+        with app.app_context():
+            other.build()
+
+    def save_then_race(segment, path):
+        save(segment, path)
+        if not racing:
+            racing.append(threading.Thread(target=build_elsewhere))
+            racing[0].start()
+            racing[0].join(timeout=0.5)
+
+    monkeypatch.setattr(Segment, 'save', save_then_race)
+    get_job_search().build()
+    racing[0].join()
+
+    assert len([name for name in os.listdir(other.root) if name.startswith('seg-')]) == 1
+    assert JobSearch(app)._load_current().search('python')[0] == 2
+
+
+def wait_for_rebuilds(job_search, timeout=10):
+    deadline = time.monotonic() + timeout
+    while job_search._rebuilding and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_new_posting_is_indexed_in_the_background(client, postings, add_posting):
+    get_job_search().rebuild_delay = 0.05
+    search(client, 'python')
+    add_posting('Rust Engineer', ['Rust'])
+
+    deadline = time.monotonic() + 10
+    while not search(client, 'rust')['total'] and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert search(client, 'rust')['results'][0]['title'] == 'Rust Engineer'
+    segments = [name for name in os.listdir(get_job_search().root) if name.startswith('seg-')]
+    assert len(segments) == 1
+
+
+def test_a_burst_of_edits_is_rebuilt_once(client, postings, add_posting, monkeypatch):
+    job_search = get_job_search()
+    job_search.rebuild_delay = 0.5
+    search(client, 'python')
+    builds = []
+    build = job_search.build
+    monkeypatch.setattr(job_search, 'build', lambda: builds.append(1) or build())
+
+    for language in ('Rust', 'Go', 'Zig'):
+        add_posting(f'{language} Engineer', [language])
+    wait_for_rebuilds(job_search)
+
+    assert len(builds) == 1
+    assert search(client, 'zig')['results'][0]['title'] == 'Zig Engineer'
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import InterviewJob, InterviewSession, User
+from app.services import jobs
+
+
+@pytest.fixture
+def interview_session(user, resume):
+    interview_session = InterviewSession(user_id=user.id, job_title='Backend Engineer', resume_id=resume.id)
+    db.session.add(interview_session)
+    db.session.commit()
+    return interview_session
+
+
+def test_pending_job_is_not_queued_twice(app, interview_session):
+    first = jobs.enqueue_preparation(interview_session)
+    second = jobs.enqueue_preparation(interview_session)
+
+    assert first.id == second.id
+    assert InterviewJob.query.count() == 1
+
+
+def test_a_job_is_claimed_once(app, interview_session):
+    jobs.enqueue_preparation(interview_session)
+
+    job = InterviewJob.claim_next()
+
+    assert job.status == 'running' and job.attempts == 1
+    assert InterviewJob.claim_next() is None
+
+
+def test_finished_job_marks_the_session_ready(app, interview_session, monkeypatch):
+    monkeypatch.setattr(jobs, 'prepare_interview', lambda interview_session, force_fresh=False: {'0': 'audio/question_1.wav'})
+    interview_session.questions = ['Tell me about yourself']
+    jobs.enqueue_preparation(interview_session)
+
+    assert jobs.run_job(InterviewJob.claim_next())
+
+    assert interview_session.preparation_status == 'ready'
+    assert InterviewJob.query.one().status == 'done'
+
+
+def test_failing_job_is_retried_until_its_attempts_run_out(app, interview_session, monkeypatch):
+    app.config.update(INTERVIEW_JOB_MAX_ATTEMPTS=2, INTERVIEW_JOB_RETRY_DELAY=0)
+
+    def outage(interview_session, force_fresh=False):
+        raise RuntimeError('Gemini unavailable')
+
+    monkeypatch.setattr(jobs, 'prepare_interview', outage)
+    jobs.enqueue_preparation(interview_session)
+
+    assert not jobs.run_job(InterviewJob.claim_next())
+    assert interview_session.preparation_status == 'queued'
+    assert not jobs.run_job(InterviewJob.claim_next())
+
+    job = InterviewJob.query.one()
+    assert (job.status, job.error) == ('failed', 'Gemini unavailable')
+    assert interview_session.preparation_status == 'failed'
+
+
+def test_failed_job_waits_before_it_is_claimed_again(app, interview_session, monkeypatch):
+    app.config.update(INTERVIEW_JOB_MAX_ATTEMPTS=3, INTERVIEW_JOB_RETRY_DELAY=30)
+
+    def outage(interview_session, force_fresh=False):
+        raise RuntimeError('Gemini unavailable')
+
+    monkeypatch.setattr(jobs, 'prepare_interview', outage)
+    jobs.enqueue_preparation(interview_session)
+
+    job = InterviewJob.claim_next()
+    assert not jobs.run_job(job)
+    assert job.status == 'queued'
+    assert job.not_before - job.finished_at == timedelta(seconds=30)
+    assert InterviewJob.claim_next() is None
+
+    job.not_before = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+    job = InterviewJob.claim_next()
+    assert not jobs.run_job(job)
+    assert job.not_before - job.finished_at == timedelta(seconds=60)
+
+
+def test_retry_delay_is_capped(app):
+    app.config.update(INTERVIEW_JOB_RETRY_DELAY=30, INTERVIEW_JOB_RETRY_MAX_DELAY=100)
+    assert [jobs.retry_delay(attempts) for attempts in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+def test_job_left_running_by_a_dead_worker_is_requeued(app, interview_session):
+    jobs.enqueue_preparation(interview_session)
+    job = InterviewJob.claim_next()
+    job.started_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    assert InterviewJob.requeue_stale(600) == 1
+    assert InterviewJob.claim_next().id == job.id
+
+
+def test_running_worker_requeues_jobs_of_workers_that_died(app, interview_session, resume, monkeypatch):
+    app.config['INTERVIEW_JOB_STALE_SECONDS'] = 0
+    other_session = InterviewSession(user_id=interview_session.user_id, job_title='Data Engineer',
+                                     resume_id=resume.id)
+    db.session.add(other_session)
+    db.session.commit()
+    jobs.enqueue_preparation(interview_session)
+    ran = []
+
+    def run_job(job):
+        ran.append(job.session_id)
+        job.status = 'done'
+        if len(ran) == 1:
+            # Meanwhile another worker claims a job and dies
+            jobs.enqueue_preparation(other_session)
+            dead = InterviewJob.claim_next()
+            dead.started_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+    monkeypatch.setattr(jobs, 'run_job', run_job)
+
+    assert jobs.run_worker(once=True) == 2
+    assert ran == [interview_session.id, other_session.id]
+
+
+def test_status_is_only_shown_to_the_owner(client, interview_session):
+    response = client.get(f'/interview-status/{interview_session.id}')
+
+    assert response.json['preparation_status'] == 'queued'
+    assert response.json['questions'] == []
+    assert client.get(f'/interview-status/{interview_session.id + 1}').status_code == 404
+
+
+def test_regenerate_questions_always_bypasses_the_question_cache(client, interview_session, monkeypatch):
+    interview_session.questions = ['Tell me about yourself']
+    interview_session.questions_ready = True
+    db.session.commit()
+    runs = []
+    monkeypatch.setattr(jobs, 'prepare_interview',
+                        lambda interview_session, force_fresh=False: runs.append(force_fresh) or {})
+
+    response = client.post('/regenerate-questions', json={'session_id': interview_session.id})
+
+    assert response.json['success']
+    job = db.session.get(InterviewJob, response.json['job_id'])
+    assert (job.kind, job.status) == ('regenerate_questions', 'queued')
+    assert not db.session.get(InterviewSession, interview_session.id).questions_ready
+    assert jobs.run_job(InterviewJob.claim_next())
+    assert runs == [True]
+
+
+def test_regenerate_questions_is_refused_for_another_users_session(client, interview_session):
+    other = User(auth0_id='auth0|other', email='other@example.com')
+    db.session.add(other)
+    db.session.commit()
+    interview_session.user_id = other.id
+    db.session.commit()
+
+    response = client.post('/regenerate-questions', json={'session_id': interview_session.id})
+
+    assert response.status_code == 404
+    assert InterviewJob.query.count() == 0
+    assert client.post('/regenerate-questions', json={'session_id': 12345}).status_code == 404
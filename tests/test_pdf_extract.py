@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.services.pdf_extract import PdfExtractionTimeout, _get_pool, extract_text, shutdown_pool
+
+
+def make_pdf(pages):
+    """Minimal PDF with one line of Helvetica text per page"""
+    objects = {1: '<< /Type /Catalog /Pages 2 0 R >>', 3: '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>'}
+    kids = []
+    for i, text in enumerate(pages):
+        stream = f'BT /F1 12 Tf 50 780 Td ({text}) Tj ET'
+        objects[4 + 2 * i] = f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream'
+        objects[5 + 2 * i] = ('<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+                              f'/Resources << /Font << /F1 3 0 R >> >> /Contents {4 + 2 * i} 0 R >>')
+        kids.append(f'{5 + 2 * i} 0 R')
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = b'%PDF-1.4\n', []
+    for obj_id in sorted(objects):
+        offsets.append(len(out))
+        out += f'{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n'.encode('latin-1')
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += b''.join(f'{offset:010d} 00000 n \n'.encode() for offset in offsets)
+    return out + f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+
+
+PAGES = [f'Page {i} of the resume: senior Python engineer building Flask services' for i in range(1, 7)]
+PDF = make_pdf(PAGES)
+
+# Forked workers start far faster than spawned ones
+START_METHOD = 'fork'
+
+
+@pytest.fixture
+def pool():
+    yield
+    shutdown_pool()
+
+
+def test_text_is_extracted_in_thread_up_to_max_pages():
+    assert extract_text(PDF, max_pages=2).splitlines() == PAGES[:2]
+
+
+def test_long_documents_are_split_across_pool_workers_in_order(pool):
+    text = extract_text(PDF, workers=2, pages_per_task=2, timeout=60, start_method=START_METHOD)
+
+    assert text.splitlines() == PAGES
+
+
+def test_slow_extraction_times_out_and_the_pool_recovers(pool):
+    with pytest.raises(PdfExtractionTimeout):
+        extract_text(PDF, workers=1, timeout=1e-6, start_method=START_METHOD)
+
+    assert extract_text(PDF, workers=1, max_pages=1, timeout=60, start_method=START_METHOD) == PAGES[0]
+
+
+def test_a_timeout_leaves_other_extractions_in_the_shared_pool_running(pool):
+    shared = _get_pool(2, START_METHOD)
+    with ThreadPoolExecutor(2) as threads:
+        other = threads.submit(extract_text, PDF, workers=2, pages_per_task=2, timeout=60,
+                               start_method=START_METHOD)
+        with pytest.raises(PdfExtractionTimeout):
+            extract_text(PDF, workers=2, timeout=1e-6, start_method=START_METHOD)
+
+        assert other.result().splitlines() == PAGES
+    assert _get_pool(2, START_METHOD) is shared
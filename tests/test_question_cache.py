@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import QuestionCacheEntry
+from app.services import question_cache
+
+QUESTIONS = ['Walk me through a service you scaled.', 'How do you test Flask views?']
+
+
+@pytest.fixture
+def generator(app, monkeypatch):
+    monkeypatch.setattr(question_cache, '_stats', {'hits': 0, 'misses': 0, 'bypasses': 0})
+    calls = []
+
+    def generate(force_fresh=False, resume_text='Python  developer\n', job_title='Backend Engineer'):
+        def request_questions():
+            calls.append(job_title)
+            return [f'{q} ({len(calls)})' for q in QUESTIONS]
+        return question_cache.get_or_generate_questions(request_questions, resume_text, job_title, 'medium',
+                                                        model='gemini-2.0-flash', prompt_version='v1',
+                                                        force_fresh=force_fresh)
+
+    generate.calls = calls
+    return generate
+
+
+def test_key_ignores_whitespace_and_title_case():
+    key = question_cache.make_cache_key('Python  developer\n', 'Backend  Engineer', 'medium', 'v1', 'm')
+
+    assert key == question_cache.make_cache_key('Python developer', 'backend engineer', 'medium', 'v1', 'm')
+    assert key != question_cache.make_cache_key('Python developer', 'backend engineer', 'hard', 'v1', 'm')
+    assert key != question_cache.make_cache_key('Python developer', 'backend engineer', 'medium', 'v2', 'm')
+
+
+def test_identical_inputs_are_answered_from_the_cache(generator):
+    first = generator()
+    second = generator(resume_text='Python developer')
+
+    assert first == second
+    assert len(generator.calls) == 1
+    assert QuestionCacheEntry.query.one().hit_count == 1
+    stats = question_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 1, 1)
+
+
+def test_expired_entry_is_generated_again(generator):
+    generator()
+    QuestionCacheEntry.query.one().expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+    generator()
+
+    assert len(generator.calls) == 2
+
+
+def test_force_fresh_skips_and_replaces_the_entry(generator):
+    generator()
+
+    fresh = generator(force_fresh=True)
+
+    assert len(generator.calls) == 2
+    assert generator() == fresh
+    assert question_cache.stats()['bypasses'] == 1
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from app.services.resume_parser import (PARSER_VERSION, format_profile, parse_resume, resume_prompt_text,
+                                        split_sections, years_of_experience)
+from app.services.resumes import get_or_create_resume
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 0100
+
+Summary
+Backend engineer focused on data platforms.
+
+Experience
+Senior Data Engineer at Acme | 2019 - Present
+• Built streaming pipelines in Spark processing ten billion events per day
+Software Developer, Initech (2015 - 2020)
+- Maintained the billing service and its PostgreSQL schema for five years
+
+Education:
+BSc Computer Science, State University
+Chess club captain
+
+Skills
+Python, Spark, SQL
+"""
+
+TODAY = datetime(2024, 6, 1)
+
+
+def test_sections_are_split_on_known_headings():
+    sections = split_sections(RESUME)
+
+    assert list(sections) == ['header', 'summary', 'experience', 'education', 'skills']
+    assert sections['header'] == ['Jane Doe', 'jane@example.com | +1 555 0100']
+    assert sections['skills'] == ['Python, Spark, SQL']
+
+
+def test_overlapping_jobs_are_counted_once():
+    lines = ['Engineer 2019 - present', 'Developer 2015 - 2020']
+
+    assert years_of_experience(lines, today=TODAY) == 9.0
+    assert years_of_experience(['Over 7+ years building APIs, 3 years of Go']) == 7.0
+    assert years_of_experience(['No dates here']) is None
+
+
+def test_profile_keeps_titles_degrees_and_highlights_but_no_contact_details():
+    profile = parse_resume(RESUME, ['python', 'spark', 'sql'])
+
+    assert profile['version'] == PARSER_VERSION
+    assert profile['titles'] == ['Senior Data Engineer', 'Software Developer']
+    assert profile['education'] == ['BSc Computer Science, State University']
+    assert profile['summary'] == 'Backend engineer focused on data platforms.'
+    assert profile['highlights'][0].startswith('Built streaming pipelines')
+    assert 'jane@example.com' not in str(profile)
+
+
+def test_formatted_profile_fits_the_budget():
+    profile = parse_resume(RESUME, ['python'])
+    profile['highlights'] = [f'Highlight number {i} with enough words to count' for i in range(50)]
+
+    text = format_profile(profile, max_chars=300)
+
+    assert len(text) <= 300
+    assert text.startswith('Roles: Senior Data Engineer; Software Developer')
+    assert '\nExperience highlights:\n- Highlight number 0' in text
+
+
+def test_upload_stores_the_profile_once(user):
+    resume = get_or_create_resume(user.id, b'%PDF jane', lambda data: RESUME)
+    parsed_at = resume.parsed_at
+
+    again = get_or_create_resume(user.id, b'%PDF jane', lambda data: RESUME)
+
+    assert resume.parsed['titles'][0] == 'Senior Data Engineer'
+    assert again.parsed_at == parsed_at
+    assert resume_prompt_text(resume).startswith('Roles: ')
+
+
+def test_unparsed_resume_prompts_with_the_start_of_its_text(resume):
+    assert resume.parsed is None
+    assert resume_prompt_text(resume, max_chars=6) == 'Python'
+    assert resume_prompt_text(None) is None
@@ -0,0 +1,104 @@
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import InterviewSession, Resume, ResumeFile, User
+from app.services.resumes import get_or_create_resume, hash_bytes, hash_text
+
+TEXT = 'Senior Python developer with ten years of Flask, SQLAlchemy and PostgreSQL experience.'
+
+
+def recording(text=TEXT):
+    def extract(data):
+        extract.calls.append(data)
+        return text
+    extract.calls = []
+    return extract
+
+
+def test_same_file_skips_extraction(user):
+    extract = recording()
+
+    first = get_or_create_resume(user.id, b'%PDF resume', extract)
+    second = get_or_create_resume(user.id, b'%PDF resume', extract)
+
+    assert first.id == second.id
+    assert extract.calls == [b'%PDF resume']
+
+
+def test_reexported_file_with_the_same_text_reuses_the_row(user):
+    first = get_or_create_resume(user.id, b'%PDF export one', recording())
+    second = get_or_create_resume(user.id, b'%PDF export two', recording('  ' + TEXT.replace(' ', '\n', 3)))
+
+    assert first.id == second.id
+    assert second.text_hash == hash_text(TEXT)
+    assert Resume.query.count() == 1
+
+
+def test_reexported_file_is_matched_by_text_and_remembered(user):
+    extract = recording()
+
+    first = get_or_create_resume(user.id, b'%PDF export one', extract)
+    second = get_or_create_resume(user.id, b'%PDF export two', extract)
+    again = get_or_create_resume(user.id, b'%PDF export two', extract)
+
+    assert first.id == second.id == again.id
+    assert extract.calls == [b'%PDF export one', b'%PDF export two']
+    assert again.file_hash == hash_bytes(b'%PDF export one')
+    assert [f.file_hash for f in again.files] == [hash_bytes(b'%PDF export two')]
+    assert Resume.query.count() == 1
+
+
+def test_alternating_exports_both_skip_extraction(user):
+    extract = recording()
+    get_or_create_resume(user.id, b'%PDF export one', extract)
+    get_or_create_resume(user.id, b'%PDF export two', extract)
+
+    for _ in range(2):
+        get_or_create_resume(user.id, b'%PDF export one', extract)
+        get_or_create_resume(user.id, b'%PDF export two', extract)
+
+    assert extract.calls == [b'%PDF export one', b'%PDF export two']
+    assert ResumeFile.query.count() == 1
+
+
+def test_concurrent_upload_of_the_same_file_returns_its_row(user):
+    pdf_bytes = b'%PDF uploaded twice at once'
+
+    def extract(data):
+        # The other request stores the same file while this one extracts
+        with Session(db.engine) as other:
+            other.add(Resume(user_id=user.id, file_hash=hash_bytes(data), text_hash=hash_text(TEXT), text=TEXT))
+            other.commit()
+        # ...with a different text hash, so the text lookup misses too
+        return TEXT + ' Also Go.'
+
+    resume = get_or_create_resume(user.id, pdf_bytes, extract)
+
+    assert resume.file_hash == hash_bytes(pdf_bytes)
+    assert resume.text == TEXT
+    assert Resume.query.count() == 1
+
+
+def test_unreadable_file_stores_nothing(user):
+    assert get_or_create_resume(user.id, b'%PDF scanned', recording('')) is None
+    assert Resume.query.count() == 0
+
+
+def test_resumes_are_kept_per_user(user):
+    other = User(auth0_id='auth0|other', email='other@example.com')
+    db.session.add(other)
+    db.session.commit()
+
+    mine = get_or_create_resume(user.id, b'%PDF resume', recording())
+    theirs = get_or_create_resume(other.id, b'%PDF resume', recording())
+
+    assert mine.id != theirs.id
+
+
+def test_sessions_read_the_text_from_their_resume(user):
+    resume = get_or_create_resume(user.id, b'%PDF resume', recording())
+    interview_session = InterviewSession(user_id=user.id, job_title='Backend Engineer', resume_id=resume.id)
+    db.session.add(interview_session)
+    db.session.commit()
+
+    assert interview_session.resume_text_data == TEXT
@@ -0,0 +1,112 @@
+import numpy as np
+
+from app.services.semantic import HashingEmbedder, VectorIndex, get_semantic_matcher
+from app.services.snapshot import Snapshot, write_snapshot
+
+
+def unit_vectors(count, dim=32, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_embeddings_are_deterministic_unit_vectors():
+    first, second = HashingEmbedder(dim=64), HashingEmbedder(dim=64)
+
+    vector = first.embed('Senior PostgreSQL engineer')
+
+    np.testing.assert_array_equal(vector, second.embed('Senior PostgreSQL engineer'))
+    assert abs(np.linalg.norm(vector) - 1) < 1e-5
+    assert not first.embed('').any()
+
+
+def test_related_spellings_are_closer_than_unrelated_words():
+    embedder = HashingEmbedder()
+    postgres, postgresql, kotlin = embedder.embed_many(['postgres', 'postgresql', 'kotlin'])
+
+    assert postgres @ postgresql > 0.5
+    assert postgres @ postgresql > postgres @ kotlin
+
+
+def test_probing_every_cluster_is_exact():
+    vectors = unit_vectors(500)
+    index = VectorIndex.build(range(500), vectors, nlist=10)
+    query = unit_vectors(1, seed=1)[0]
+
+    assert index.nlist == 10
+    assert index.search(query, k=5, nprobe=10) == index.search_exact(query, k=5)
+    assert index.search_exact(query, k=1)[0][0] == int(np.argmax(vectors @ query))
+
+
+def test_added_and_removed_vectors_are_searched():
+    vectors = unit_vectors(50)
+    index = VectorIndex.build(range(50), vectors)
+
+    index.add(100, vectors[7])
+    index.remove(7)
+
+    assert index.search(vectors[7], k=1) == [(100, 1.0)]
+    assert 7 not in index and 100 in index
+    assert len(index) == 50
+
+
+def test_large_delta_is_merged_into_the_clusters():
+    vectors = unit_vectors(2100)
+    index = VectorIndex.build(range(1000), vectors[:1000], nlist=8)
+
+    for job_id in range(1000, 2100):
+        index.add(job_id, vectors[job_id])
+    query = vectors[1500]
+    assert index.search(query, k=1, nprobe=8) == [(1500, 1.0)]
+
+    assert len(index._delta) == 0
+    assert len(index.ids) == 2100
+
+
+def test_single_list_index_keeps_its_delta_bounded():
+    vectors = unit_vectors(3400)
+    index = VectorIndex.build(range(100), vectors[:100])
+    assert index.nlist == 1
+
+    for job_id in range(100, 3400):
+        index.add(job_id, vectors[job_id])
+        if job_id % 100 == 0:
+            assert index.search(vectors[job_id], k=1) == [(job_id, 1.0)]
+            assert len(index._delta) <= 1024
+
+    assert len(index) == 3400
+    assert index.search(vectors[3399], k=1) == [(3399, 1.0)]
+
+
+def test_snapshot_round_trip_keeps_results(tmp_path):
+    vectors = unit_vectors(300)
+    index = VectorIndex.build(range(300), vectors, nlist=6)
+    index.add(999, vectors[0])
+    path = str(tmp_path / 'semantic.snap')
+    write_snapshot(path, VectorIndex.SNAPSHOT_KIND, *index.to_snapshot())
+
+    snapshot = Snapshot(path)
+    opened = VectorIndex.from_snapshot(snapshot.arrays, snapshot.meta)
+
+    query = unit_vectors(1, seed=2)[0]
+    assert opened.search(query, k=10, nprobe=6) == index.search(query, k=10, nprobe=6)
+    assert 999 in opened
+
+
+def test_semantic_mode_matches_related_wording(client, add_posting):
+    add_posting('Database Administrator', ['PostgreSQL', 'Backups'])
+    add_posting('Android Developer', ['Kotlin', 'Jetpack'])
+
+    response = client.post('/api/jobs/match', json={'mode': 'semantic', 'skills': ['postgres']})
+
+    body = response.get_json()
+    assert body['mode'] == 'semantic'
+    assert [match['title'] for match in body['matches']][:1] == ['Database Administrator']
+
+
+def test_committed_postings_reach_the_semantic_index(app, add_posting):
+    matcher = get_semantic_matcher()
+    matcher.index()
+
+    posting = add_posting('Machine Learning Engineer', ['PyTorch'])
+
+    assert [match['job_id'] for match in matcher.match_text('pytorch')] == [posting.id]
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+from flask import session
+
+from app import db
+from app.auth.routes import init_oauth, oauth
+from app.models import ServerSession, User
+from app.services.sessions import DatabaseSessionStore, SQLiteSessionStore, _storage_key
+from config import TestingConfig
+
+PROFILE = {'sub': 'auth0|tester', 'email': 'tester@example.com', 'name': 'Tester', 'nickname': 'tester'}
+
+
+@pytest.fixture(autouse=True)
+def database_sessions(monkeypatch):
+    # Before the app fixture builds the app
+    monkeypatch.setattr(TestingConfig, 'SESSION_BACKEND', 'database')
+
+
+@pytest.fixture
+def counter(app):
+    @app.route('/_count')
+    def count():
+        session['count'] = session.get('count', 0) + 1
+        return str(session['count'])
+
+    @app.route('/_peek')
+    def peek():
+        return str(session.get('count'))
+
+    return app.test_client()
+
+
+@pytest.fixture
+def auth0(app, monkeypatch):
+    app.config.update(AUTH0_DOMAIN='tenant.example.com', AUTH0_CLIENT_ID='client', AUTH0_CLIENT_SECRET='secret')
+    init_oauth(app)
+    monkeypatch.setattr(oauth.auth0, 'authorize_access_token', lambda: {'userinfo': dict(PROFILE)})
+
+
+def test_cookie_holds_only_an_id_for_server_side_data(counter):
+    assert counter.get('/_count').text == '1'
+    assert counter.get('/_count').text == '2'
+
+    sid = counter.get_cookie('session').value
+    row = ServerSession.query.one()
+    assert len(sid) == 43 and 'count' not in sid
+    assert row.id == _storage_key(sid)
+
+
+def test_unchanged_sessions_are_not_written_back(counter, monkeypatch):
+    counter.get('/_count')
+    saves = []
+    interface = counter.application.session_interface
+    monkeypatch.setattr(interface.store, 'save', lambda *args: saves.append(args))
+
+    assert counter.get('/_peek').text == '1'
+    assert saves == []
+
+
+def test_expired_sessions_are_not_loaded_and_are_swept(app, counter):
+    counter.get('/_count')
+    app.permanent_session_lifetime = 0
+    counter.get('/_count')
+
+    assert counter.get('/_peek').text == 'None'
+    assert app.extensions['server_sessions'].sweep() == 1
+    assert ServerSession.query.count() == 0
+
+
+@pytest.mark.parametrize('make_store', [
+    lambda tmp_path: DatabaseSessionStore(),
+    lambda tmp_path: SQLiteSessionStore(str(tmp_path / 'sessions' / 'store.sqlite3')),
+], ids=['database', 'sqlite'])
+def test_stores_save_load_and_delete(app, tmp_path, make_store):
+    store = make_store(tmp_path)
+    expires_at = time.time() + 60
+
+    store.save('key', '{"a": 1}', expires_at)
+    store.save('key', '{"a": 2}', expires_at)
+    store.save('old', '{}', time.time() - 60)
+
+    data, loaded_expiry = store.load('key')
+    assert data == '{"a": 2}' and abs(loaded_expiry - expires_at) < 1
+    assert store.sweep() == 1
+    store.delete('key')
+    assert store.load('key') is None
+
+
+def test_login_moves_the_session_to_a_new_id(app, auth0):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['next'] = '/dashboard'
+    anonymous_id = client.get_cookie('session').value
+
+    response = client.get('/auth/callback')
+
+    assert response.status_code == 302
+    logged_in_id = client.get_cookie('session').value
+    assert logged_in_id != anonymous_id
+    # Only the new session is stored: the pre-login ID can't be replayed
+    assert ServerSession.query.count() == 1
+    with client.session_transaction() as session:
+        assert session['user_id'] == User.query.filter_by(auth0_id=PROFILE['sub']).one().id
+        assert session['user'] == {'sub': PROFILE['sub'], 'name': 'Tester', 'email': PROFILE['email'],
+                                   'picture': None, 'updated_at': None}
+        assert 'next' not in session
+
+
+def test_login_with_a_taken_email_keeps_the_visitor_logged_out(app, auth0):
+    db.session.add(User(auth0_id='auth0|other', email=PROFILE['email']))
+    db.session.commit()
+    client = app.test_client()
+
+    response = client.get('/auth/callback')
+
+    assert response.status_code == 302
+    with client.session_transaction() as session:
+        assert 'user_id' not in session
@@ -0,0 +1,83 @@
+import pytest
+
+from app import db
+from app.services.matching import SkillIndex, get_job_matcher
+
+
+def ranked(index, skills):
+    return [(m['job_id'], m['score']) for m in index.top_k(skills, 10)]
+
+
+def test_update_replaces_the_posting_row():
+    index = SkillIndex.build([(1, ['Python', 'Flask']), (2, ['Java', 'Spring'])])
+
+    index.add(1, ['Java', 'Kotlin'])
+
+    assert len(index) == 2
+    assert ranked(index, ['flask']) == []
+    assert [job_id for job_id, _ in ranked(index, ['java'])] == [1, 2]
+
+
+def test_compaction_keeps_results_and_drops_retired_rows():
+    index = SkillIndex.build([(i, ['python', f'skill{i}']) for i in range(8)])
+    before = ranked(index, ['python', 'skill3'])
+
+    for i in range(4):
+        index.remove(i + 4)
+        index.add(i + 4, ['python', f'skill{i + 4}'])
+
+    assert index._retired * 4 <= len(index._row_job_id)
+    assert ranked(index, ['python', 'skill3']) == before
+
+
+def test_removed_posting_no_longer_matches():
+    index = SkillIndex.build([(1, ['python']), (2, ['python', 'sql'])])
+
+    index.remove(2)
+
+    assert ranked(index, ['sql']) == []
+    assert 2 not in index and 1 in index
+
+
+@pytest.fixture
+def matcher(app, add_posting):
+    add_posting('Backend Engineer', ['Python', 'Flask'])
+    matcher = get_job_matcher()
+    matcher.index()
+    return matcher
+
+
+def matching_titles(matcher, skills):
+    from app.models import JobPosting
+    return {JobPosting.query.get(m['job_id']).title for m in matcher.match(skills)}
+
+
+def test_committed_postings_are_applied_in_place(matcher, add_posting):
+    index = matcher.index()
+
+    posting = add_posting('Data Engineer', ['Python', 'Spark'])
+    assert matching_titles(matcher, ['spark']) == {'Data Engineer'}
+
+    posting.skills_required = ['Python', 'Airflow']
+    db.session.commit()
+    assert matching_titles(matcher, ['spark']) == set()
+    assert matching_titles(matcher, ['airflow']) == {'Data Engineer'}
+
+    posting.is_active = False
+    db.session.commit()
+    assert matching_titles(matcher, ['python']) == {'Backend Engineer'}
+    assert matcher.index() is index
+
+
+def test_deleted_and_rolled_back_postings_are_not_applied(matcher, add_posting):
+    posting = add_posting('Data Engineer', ['Spark'])
+    db.session.delete(posting)
+    db.session.commit()
+    assert matching_titles(matcher, ['spark']) == set()
+
+    posting = add_posting('ML Engineer', ['PyTorch'])
+    posting.skills_required = ['TensorFlow']
+    db.session.flush()
+    db.session.rollback()
+    assert matching_titles(matcher, ['tensorflow']) == set()
+    assert matching_titles(matcher, ['pytorch']) == {'ML Engineer'}
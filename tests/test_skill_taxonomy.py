@@ -0,0 +1,90 @@
+import pytest
+
+from app.services.skill_taxonomy import TAXONOMY, SkillMatcher, SkillTaxonomy, tokenize
+
+
+def test_tokens_keep_skill_punctuation():
+    assert tokenize('C++, C# and Node.js.') == ['c++', 'c#', 'and', 'node.js']
+
+
+def test_phrases_match_on_word_boundaries_in_one_pass():
+    matcher = SkillMatcher()
+    for phrase in ('machine learning', 'learning', 'java', 'deep machine learning models'):
+        matcher.add(phrase)
+
+    assert matcher.find('Deep machine learning, not javascript; Java too') == ['machine learning', 'learning', 'java']
+
+
+def test_aliases_report_their_canonical_skill():
+    matcher = SkillMatcher()
+    matcher.add('k8s', 'kubernetes')
+    matcher.add('kubernetes')
+
+    assert matcher.find('k8s clusters and Kubernetes operators') == ['kubernetes']
+
+
+def test_phrases_added_after_a_search_are_found():
+    matcher = SkillMatcher()
+    matcher.add('python')
+    assert matcher.find('python and rust') == ['python']
+
+    matcher.add('rust')
+
+    assert matcher.find('python and rust') == ['python', 'rust']
+    assert len(matcher) == 2
+
+
+def test_taxonomy_loads_skills_and_aliases(tmp_path):
+    path = tmp_path / 'skills.txt'
+    path.write_text('# comment\n\nPostgreSQL | postgres | psql\nC#\n', encoding='utf-8')
+
+    taxonomy = SkillTaxonomy.load(str(path))
+
+    assert taxonomy.skills == ['postgresql', 'c#']
+    assert taxonomy.normalize(' Postgres. ') == 'postgresql'
+    assert taxonomy.matcher(['airflow']).find('psql and Airflow in C#') == ['postgresql', 'airflow', 'c#']
+
+
+@pytest.mark.parametrize('alias, skill', [('js', 'javascript'), ('ML', 'machine learning'), ('py', 'python')])
+def test_shipped_taxonomy_folds_aliases(alias, skill):
+    assert TAXONOMY.normalize(alias) == skill
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    # Posting vocabulary arrives normalized, so ambiguous names come in too
+    return TAXONOMY.matcher(['go', 'swift', 'node.js', 'spring', 'python'])
+
+
+@pytest.mark.parametrize('text', [
+    "I'm ready to go whenever you are",
+    'Summer internship, Spring 2021',
+    'Each node in the graph keeps its neighbours',
+    'Known for swift turnaround on support tickets',
+])
+def test_everyday_words_are_not_skills(matcher, text):
+    assert matcher.find(text) == []
+
+
+@pytest.mark.parametrize('text, skills', [
+    ('Backend services in Golang', ['go']),
+    ('APIs on Node.js and NodeJS', ['node.js']),
+    ('Services written with Spring Boot', ['spring boot']),
+    ('Built on the Spring Framework', ['spring']),
+    ('iOS apps in SwiftUI', ['swift']),
+])
+def test_unambiguous_forms_still_match(matcher, text, skills):
+    assert matcher.find(text) == skills
+
+
+def test_ambiguous_names_still_normalize():
+    assert TAXONOMY.normalize('Go') == 'go'
+    assert TAXONOMY.normalize('Node') == 'node.js'
+    assert TAXONOMY.normalize(' Spring ') == 'spring'
+
+
+def test_marker_applies_to_skills_and_aliases():
+    taxonomy = SkillTaxonomy({'~rust': ['rustlang'], 'kubernetes': ['~kube', 'k8s']})
+    assert taxonomy.skills == ['rust', 'kubernetes']
+    assert taxonomy.normalize('kube') == 'kubernetes'
+    assert taxonomy.matcher().find('rust on kube, rustlang on k8s') == ['rust', 'kubernetes']
@@ -0,0 +1,71 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import gemini
+
+
+class NoText:
+    @property
+    def text(self):
+        raise ValueError('No text parts')
+
+
+class FakeModel:
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    def generate_content(self, prompt, stream=False):
+        if not stream:
+            return SimpleNamespace(text=''.join(c.text for c in self.chunks if not isinstance(c, NoText)))
+        return self._stream()
+
+    def _stream(self):
+        for i, chunk in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise RuntimeError('Connection reset')
+            yield chunk
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = FakeModel([SimpleNamespace(text='Hello'), NoText(), SimpleNamespace(text=' there')])
+    monkeypatch.setattr(gemini, 'configure_gemini', lambda: model)
+    return model
+
+
+def test_chat_streams_newline_delimited_json(client, model):
+    response = client.post('/api/chat', json={'message': 'Hi', 'stream': True})
+
+    assert response.mimetype == 'application/x-ndjson'
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert events == [{'type': 'chunk', 'text': 'Hello'}, {'type': 'chunk', 'text': ' there'},
+                      {'type': 'done', 'status': 'success'}]
+
+
+def test_generate_streams_server_sent_events_when_asked(client, model):
+    response = client.post('/api/generate?stream=1', json={'prompt': 'Hi'},
+                           headers={'Accept': 'text/event-stream'})
+
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['X-Accel-Buffering'] == 'no'
+    messages = response.get_data(as_text=True).split('\n\n')
+    assert messages[0] == 'data: {"type": "chunk", "text": "Hello"}'
+
+
+def test_failure_mid_stream_ends_with_an_error_event(client, model):
+    model.fail_after = 1
+
+    response = client.post('/api/chat', json={'message': 'Hi', 'stream': True})
+
+    events = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert events[0] == {'type': 'chunk', 'text': 'Hello'}
+    assert events[-1]['type'] == 'error' and events[-1]['error'] == 'Connection reset'
+
+
+def test_unstreamed_chat_still_answers_in_one_piece(client, model):
+    response = client.post('/api/chat', json={'message': 'Hi'})
+
+    assert response.json == {'response': 'Hello there', 'status': 'success'}
@@ -0,0 +1,65 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+
+from app.main.routes import generate_audio_for_questions
+from app.services.tts import synthesize_many
+
+PCM = b'\x00\x01' * 2400
+
+
+class FakeTTSClient:
+    """Answers generate_content like Gemini TTS; texts starting with 'fail' raise, 'slow' ones sleep"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.models = self
+        self.active = 0
+        self.most_active = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, model, contents, config):
+        with self._lock:
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        try:
+            text = contents.rsplit(': ', 1)[-1]
+            time.sleep(self.delay * (20 if text.startswith('slow') else 1))
+            if text.startswith('fail'):
+                raise RuntimeError('TTS unavailable')
+            part = SimpleNamespace(inline_data=SimpleNamespace(data=PCM))
+            return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def test_calls_run_concurrently_up_to_max_workers(app):
+    client = FakeTTSClient(delay=0.05)
+
+    results = synthesize_many(client, [f'Question {i}' for i in range(6)], max_workers=3)
+
+    assert sorted(results) == list(range(6))
+    assert client.most_active == 3
+
+
+def test_a_failed_question_is_only_missing_from_the_result(app):
+    results = synthesize_many(FakeTTSClient(), ['Question one', 'fail two', 'Question three'], max_workers=3)
+
+    assert sorted(results) == [0, 2]
+
+
+def test_calls_past_the_timeout_are_dropped(app):
+    results = synthesize_many(FakeTTSClient(delay=0.02), ['Question one', 'slow two'], max_workers=2, timeout=0.2)
+
+    assert sorted(results) == [0]
+
+
+def test_question_audio_is_written_per_index(app):
+    audio_files = generate_audio_for_questions(7, ['Tell me about yourself', 'fail', 'Why this role?'],
+                                               client=FakeTTSClient())
+
+    assert sorted(audio_files) == ['0', '2']
+    assert audio_files['2'].endswith('session_7/question_3.wav')
+    assert os.path.getsize(audio_files['0']) > len(PCM)
@@ -0,0 +1,85 @@
+import io
+import os
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from flask import request
+from werkzeug.datastructures import FileStorage
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app.main import routes
+from app.models import InterviewSession
+from app.services.uploads import read_upload
+
+BOUNDARY = 'boundary'
+RESUME_TEXT = 'Senior Python developer with ten years of Flask, SQLAlchemy and PostgreSQL experience.'
+
+
+def multipart(pdf: bytes) -> bytes:
+    return (f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="job_title"\r\n\r\nEngineer\r\n'
+            f'--{BOUNDARY}\r\nContent-Disposition: form-data; name="resume"; filename="cv.pdf"\r\n'
+            f'Content-Type: application/pdf\r\n\r\n').encode() + pdf + f'\r\n--{BOUNDARY}--\r\n'.encode()
+
+
+def post(client, body, **kwargs):
+    return client.post('/upload-resume', data=body, content_type=f'multipart/form-data; boundary={BOUNDARY}',
+                       **kwargs)
+
+
+def test_read_upload_returns_the_bytes_and_closes_the_file():
+    file = FileStorage(io.BytesIO(b'%PDF resume'), 'cv.pdf')
+
+    assert read_upload(file, 1024) == b'%PDF resume'
+    assert file.stream.closed
+
+
+def test_uploads_are_spooled_in_memory_up_to_the_threshold(app):
+    app.config['UPLOAD_SPOOL_THRESHOLD'] = 64
+    for size, rolled in ((32, False), (256, True)):
+        with app.test_request_context('/upload-resume', method='POST', data=multipart(b'x' * size),
+                                      content_type=f'multipart/form-data; boundary={BOUNDARY}'):
+            stream = request.files['resume'].stream
+            assert isinstance(stream, SpooledTemporaryFile)
+            assert stream._rolled is rolled
+
+
+def test_declared_oversized_upload_is_refused_before_reading(client, app):
+    app.config['RESUME_MAX_UPLOAD_BYTES'] = 1024
+
+    response = post(client, multipart(b'%PDF' + b'x' * 4096))
+
+    assert response.status_code == 413
+
+
+def test_resume_is_parsed_from_memory(client, monkeypatch):
+    extracted = []
+    monkeypatch.setattr(routes, 'extract_text_from_pdf', lambda data: extracted.append(data) or RESUME_TEXT)
+
+    response = post(client, multipart(b'%PDF resume bytes'))
+
+    assert response.json['success']
+    assert extracted == [b'%PDF resume bytes']
+    assert InterviewSession.query.get(response.json['session_id']).job_title == 'Engineer'
+    assert not os.path.exists('uploads') or not os.listdir('uploads')
+
+
+def test_read_upload_rejects_oversized_file_as_too_large():
+    with pytest.raises(RequestEntityTooLarge):
+        read_upload(FileStorage(io.BytesIO(b'x' * 2048), 'cv.pdf'), 1024)
+
+
+def test_oversized_chunked_upload_is_413(client, app):
+    # No Content-Length, so the limit is only hit while reading the body
+    app.config['RESUME_MAX_UPLOAD_BYTES'] = 1024
+    response = post(client, multipart(b'%PDF' + b'x' * 4096), headers={'Transfer-Encoding': 'chunked'},
+                    environ_overrides={'wsgi.input_terminated': True})
+
+    assert response.status_code == 413
+
+
+def test_truncated_upload_is_400(client):
+    body = multipart(b'%PDF' + b'x' * 100)
+    response = post(client, body[:-40], headers={'Content-Length': str(len(body))})
+
+    assert response.status_code == 400
+    assert not response.json['success']
@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import User
+from app.services.user_cache import get_user_cache
+
+
+@pytest.fixture
+def selects(app):
+    """Statements sent to the database, as they are executed"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+
+@contextmanager
+def request_context(app):
+    """A request with its own g and database session, as a served request has"""
+    with app.app_context(), app.test_request_context():
+        yield
+
+
+def test_a_request_looks_a_user_up_once(app, user, selects):
+    cache = get_user_cache()
+    user_id, auth0_id = user.id, user.auth0_id
+    selects.clear()
+    with request_context(app):
+        first = cache.get(user_id=user_id)
+        again = cache.get(user_id=user_id)
+        by_auth0 = cache.get(auth0_id=auth0_id)
+
+    assert first is again is by_auth0
+    assert len(selects) == 1
+
+
+def test_later_requests_reuse_the_row_without_a_query(app, user, selects):
+    cache = get_user_cache()
+    user_id, auth0_id = user.id, user.auth0_id
+    with request_context(app):
+        cache.get(user_id=user_id)
+    selects.clear()
+
+    with request_context(app):
+        cached = cache.get(auth0_id=auth0_id)
+        assert cached.email == 'tester@example.com'
+        assert cached in db.session
+
+    assert selects == []
+    assert (cache.misses, cache.hits) == (1, 1)
+
+
+def test_login_update_invalidates_the_cached_user(app, user):
+    cache = get_user_cache()
+    with request_context(app):
+        cache.get(user_id=user.id)
+        User.get_or_create_user({'sub': user.auth0_id, 'email': user.email, 'name': 'Renamed'})
+        assert cache.get(user_id=user.id).name == 'Renamed'
+
+    with request_context(app):
+        assert cache.get(user_id=user.id).name == 'Renamed'
+
+
+def test_zero_ttl_only_memoizes_per_request(app, user, selects):
+    cache = get_user_cache()
+    cache.ttl = 0
+    user_id = user.id
+    selects.clear()
+    for _ in range(2):
+        with request_context(app):
+            cache.get(user_id=user_id)
+            cache.get(user_id=user_id)
+
+    assert len(selects) == 2
+    assert cache.hits == 0
+
+
+def test_missing_users_are_remembered_for_the_request(app, selects):
+    cache = get_user_cache()
+    with request_context(app):
+        assert cache.get(user_id=404) is None
+        assert cache.get(user_id=404) is None
+
+    assert len(selects) == 1
+
+
+def test_oldest_entries_are_evicted(app):
+    cache = get_user_cache()
+    cache.max_entries = 4
+    users = [User(auth0_id=f'auth0|{i}', email=f'{i}@example.com') for i in range(3)]
+    db.session.add_all(users)
+    db.session.commit()
+    user_ids = [user.id for user in users]
+
+    with request_context(app):
+        for user_id in user_ids:
+            cache.get(user_id=user_id)
+
+    assert len(cache._entries) == 4
+    assert ('id', user_ids[0]) not in cache._entries
+    assert ('id', user_ids[2]) in cache._entries
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import InterviewAnswer, InterviewSession, User
+from app.models import user as user_module
+
+PROFILE = {'sub': 'auth0|tester', 'email': 'tester@example.com', 'name': 'Tester', 'nickname': 'tester'}
+
+
+def _login(**changes):
+    return User.get_or_create_user(dict(PROFILE, **changes))
+
+
+def test_first_login_creates_the_user(app):
+    user = _login()
+
+    assert user.id is not None
+    assert user.email == 'tester@example.com'
+    assert user.last_login is not None
+    assert User.query.count() == 1
+
+
+def test_repeat_login_within_granularity_writes_nothing(app):
+    last_login = _login().last_login
+    statements = []
+    db.event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+
+    user = _login()
+
+    assert user.last_login == last_login
+    assert not [sql for sql in statements if not sql.lstrip().upper().startswith('SELECT')]
+
+
+def test_login_updates_changed_profile_and_stale_last_login(app):
+    user = _login()
+    stale = datetime.utcnow() - timedelta(days=2)
+    user.last_login = stale
+    db.session.commit()
+
+    user = _login(name='Renamed Tester')
+
+    assert user.name == 'Renamed Tester'
+    assert user.last_login > stale
+    assert User.query.count() == 1
+
+
+def test_login_only_updates_the_fields_auth0_sent(app):
+    _login(picture='https://example.com/me.png')
+
+    user = User.get_or_create_user({'sub': PROFILE['sub'], 'email': PROFILE['email'], 'name': 'Renamed Tester'})
+
+    assert (user.name, user.email, user.picture) == ('Renamed Tester', 'tester@example.com',
+                                                     'https://example.com/me.png')
+
+
+def test_login_with_an_email_owned_by_another_user_is_refused(app):
+    db.session.add(User(auth0_id='auth0|other', email='tester@example.com'))
+    db.session.commit()
+
+    with pytest.raises(ValueError):
+        _login()
+
+    # The failed upsert was rolled back, so the session is still usable
+    assert User.query.count() == 1
+
+
+@pytest.mark.parametrize('stale', [False, True])
+def test_login_without_an_upsert_inserts_then_updates(app, monkeypatch, stale):
+    monkeypatch.setattr(user_module, '_upsert', lambda *args, **kwargs: None)
+    user = _login()
+    if stale:
+        user.last_login = datetime.utcnow() - timedelta(days=2)
+        db.session.commit()
+    last_login = user.last_login
+
+    user = _login(name='Renamed Tester')
+
+    assert user.name == 'Renamed Tester'
+    assert (user.last_login > last_login) if stale else (user.last_login == last_login)
+    assert User.query.count() == 1
+
+
+@pytest.mark.parametrize('upsert', [True, False])
+def test_saving_an_answer_twice_updates_its_row(user, resume, monkeypatch, upsert):
+    if not upsert:
+        monkeypatch.setattr(user_module, '_upsert', lambda *args, **kwargs: None)
+    interview_session = InterviewSession(user_id=user.id, job_title='Backend Engineer', resume_id=resume.id)
+    db.session.add(interview_session)
+    db.session.commit()
+
+    interview_session.add_answer(0, 'First draft')
+    interview_session.set_answer_audio(0, '/tmp/answer_0.webm', 'audio/webm', 1024)
+    interview_session.add_answer(0, 'Final answer')
+
+    answer = InterviewAnswer.query.one()
+    assert (answer.answer, answer.audio_path, answer.audio_size) == ('Final answer', '/tmp/answer_0.webm', 1024)